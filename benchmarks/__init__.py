@@ -0,0 +1,4 @@
+# benchmarks/__init__.py
+"""
+Performance benchmarks for Sentiment Bot
+"""
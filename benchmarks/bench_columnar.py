@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: aggregating a large run from JSONL vs the columnar store
+Usage: python -m benchmarks.bench_columnar [--rows 1000000] [--dir /tmp/bench_columnar] [--json results.json]
+
+Writes the same synthetic batch records as JSONL (the batch pipeline's default
+output) and as a columnar store, then computes the mood summary and a score
+histogram from each. The JSONL path parses every record; the columnar path
+memory-maps the score and mood columns and never reads the text heap. Reports
+file sizes, wall time and the peak Python heap (tracemalloc) of each aggregation.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from typing import Any, Dict, Iterator
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_parallel_local import SAMPLE_TEXTS
+
+def synthetic_records(rows: int, seed: int = 5) -> Iterator[Dict[str, Any]]:
+    """Batch records shaped like batch_process_texts(use_gpt=False) output"""
+    from config import Config
+    from sentiment.analyzer import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer(client=None, memo_size=0)
+    rng = random.Random(seed)
+    local = [(text, analyzer.analyze_textblob(text), analyzer.analyze_vader(text)) for text in SAMPLE_TEXTS]
+    for index in range(1, rows + 1):
+        text, textblob_result, vader_result = local[rng.randrange(len(local))]
+        jitter = rng.uniform(-0.2, 0.2)
+        textblob_result = {**textblob_result, 'polarity': max(-1.0, min(1.0, textblob_result['polarity'] + jitter))}
+        sentiment = analyzer._build_result(f"{text} #{index}", textblob_result, vader_result, None)
+        mood = Config.MOOD_LABELS[sentiment['mood_category']]
+        yield {
+            'index': index,
+            'text': sentiment['text'],
+            'sentiment': sentiment,
+            'sass_quote': {'sass_quote': f"{mood['vibe']} energy, bestie", 'mood_category': sentiment['mood_category']}
+        }
+
+def _dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+def _measure(fn):
+    """(result, seconds, peak heap MB); the heap is traced in a second run so tracing doesn't skew the time"""
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, round(elapsed, 3), round(peak / 1e6, 2)
+
+def jsonl_summary(path: str) -> Dict[str, Any]:
+    """create_mood_summary-style aggregation streaming over a JSONL file"""
+    mood_counts: Dict[str, int] = {}
+    total, valid, rows = 0.0, 0, 0
+    histogram = [0] * 20
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            rows += 1
+            sentiment = record.get('sentiment')
+            if sentiment is None:
+                continue
+            mood_counts[sentiment['mood_category']] = mood_counts.get(sentiment['mood_category'], 0) + 1
+            total += sentiment['combined_score']
+            valid += 1
+            histogram[min(19, max(0, int((sentiment['combined_score'] + 1.0) * 10)))] += 1
+    return {'total_texts': rows, 'valid_analyses': valid, 'average_score': round(total / valid, 3),
+            'mood_distribution': mood_counts}
+
+def columnar_summary(path: str) -> Dict[str, Any]:
+    from utils.columnar import ColumnarResults
+
+    store = ColumnarResults(path)
+    store.score_histogram(bins=20)
+    summary = store.summary()
+    summary.pop('dominant_mood')
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--rows', type=int, default=1000000, help='Records to write and aggregate')
+    parser.add_argument('--dir', default='/tmp/bench_columnar', help='Directory for the output files')
+    parser.add_argument('--json', dest='json_out', default=None, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    from utils.columnar import ColumnarResultWriter
+
+    os.makedirs(args.dir, exist_ok=True)
+    jsonl_path = os.path.join(args.dir, 'results.jsonl')
+    columnar_path = os.path.join(args.dir, 'results.moodcol')
+
+    started = time.perf_counter()
+    with open(jsonl_path, 'w', encoding='utf-8') as f, ColumnarResultWriter(columnar_path) as writer:
+        for record in synthetic_records(args.rows):
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            writer.write(record)
+    print(f"Wrote {args.rows} records in {time.perf_counter() - started:.1f}s")
+
+    jsonl_result, jsonl_seconds, jsonl_peak = _measure(lambda: jsonl_summary(jsonl_path))
+    columnar_result, columnar_seconds, columnar_peak = _measure(lambda: columnar_summary(columnar_path))
+    if jsonl_result['mood_distribution'] != columnar_result['mood_distribution']:
+        print("WARNING: mood distributions differ")
+
+    report = {
+        'rows': args.rows,
+        'jsonl': {'mb': round(os.path.getsize(jsonl_path) / 1e6, 2), 'seconds': jsonl_seconds, 'peak_mb': jsonl_peak},
+        'columnar': {'mb': round(_dir_size(columnar_path) / 1e6, 2), 'seconds': columnar_seconds,
+                     'peak_mb': columnar_peak},
+    }
+    print(f"{'format':>10} {'size MB':>9} {'summary s':>10} {'peak heap MB':>13}")
+    for name in ('jsonl', 'columnar'):
+        row = report[name]
+        print(f"{name:>10} {row['mb']:>9} {row['seconds']:>10} {row['peak_mb']:>13}")
+    print(f"Speedup: {jsonl_seconds / max(columnar_seconds, 1e-9):.0f}x")
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
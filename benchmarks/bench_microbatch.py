@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent single-text analyses with and without the micro-batching dispatcher
+Usage: python -m benchmarks.bench_microbatch [--requests 256] [--concurrency 64] [--gpt-latency 0.3] [--rpm 600]
+
+Runs against the local fake OpenAI server. With an RPM quota set, per-text calls
+hit the quota while coalesced calls stay under it.
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_parallel_local import make_corpus
+
+def run(texts, concurrency, base_url, microbatch, max_wait_ms, rpm):
+    from sentiment.analyzer import SentimentAnalyzer
+    from sentiment.dispatcher import MicroBatchDispatcher
+    from utils.gpt_client import GPTClient
+    from utils.rate_limiter import AdaptiveRateLimiter
+    from utils.circuit_breaker import CircuitBreaker
+
+    client = GPTClient(api_key='fake-key', base_url=base_url, pool_size=concurrency,
+                       rate_limiter=AdaptiveRateLimiter(rpm=rpm),
+                       circuit_breaker=CircuitBreaker())
+    analyzer = SentimentAnalyzer(client=client, memo_size=0)
+    if microbatch:
+        analyzer.dispatcher = MicroBatchDispatcher(analyzer, max_wait_ms=max_wait_ms,
+                                                   max_concurrent_batches=concurrency)
+    analyzer.analyze_local("warm up")
+    client.sync_client
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda text: analyzer.analyze_comprehensive(text, cascade=False), texts))
+    elapsed = time.perf_counter() - start
+    analyzer.close()
+    client.close()
+    return elapsed, results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--requests', type=int, default=256, help='Texts analyzed')
+    parser.add_argument('--concurrency', type=int, default=64, help='Concurrent callers')
+    parser.add_argument('--gpt-latency', type=float, default=0.3, help='Fake OpenAI latency in seconds')
+    parser.add_argument('--rpm', type=int, default=None, help='Requests-per-minute quota on both sides')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help='Dispatcher window')
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+    from benchmarks.fake_openai import FakeOpenAIServer
+
+    texts = make_corpus(args.requests, seed=3)
+    print(f"{'mode':>12} {'seconds':>8} {'texts/s':>8} {'GPT calls':>10} {'429s':>6}")
+    for microbatch in (False, True):
+        with FakeOpenAIServer(latency=args.gpt_latency, rpm=args.rpm) as server:
+            elapsed, _ = run(texts, args.concurrency, server.base_url, microbatch, args.max_wait_ms,
+                             args.rpm or 100000)
+            stats = server.stats()
+        mode = 'microbatch' if microbatch else 'per-text'
+        print(f"{mode:>12} {elapsed:8.2f} {len(texts) / elapsed:8.1f} {stats['completed']:>10} {stats['rate_limited']:>6}")
+
+if __name__ == "__main__":
+    main()
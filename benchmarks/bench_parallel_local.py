@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark: process-pool scaling of the local TextBlob/VADER scorers
+Usage: python -m benchmarks.bench_parallel_local --texts 20000 --workers 1 2 4 8
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentiment.parallel import score_local_parallel
+
+SAMPLE_TEXTS = [
+    "I'm having the best day ever! Everything is going perfectly!",
+    "Today was okay, nothing special happened.",
+    "I'm feeling really down and everything seems to be going wrong.",
+    "Just got promoted at work! I can't believe it!",
+    "I hate Mondays so much, everything is terrible.",
+    "The coffee was fine but the service was REALLY slow :(",
+    "Not bad at all, kind of enjoyed the movie tbh",
+    "Worst. Experience. Ever. Never going back!!!",
+]
+
+def make_corpus(count: int, seed: int = 42) -> list:
+    """Synthetic corpus built by shuffling and joining sample sentences"""
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(SAMPLE_TEXTS, rng.randint(1, 3))) for _ in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--texts', type=int, default=20000, help='Number of texts to score')
+    parser.add_argument('--workers', type=int, nargs='+', default=None, help='Worker counts to compare')
+    parser.add_argument('--chunk-size', type=int, default=None, help='Texts per worker task')
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    cpu_count = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, 2, 4, cpu_count})
+    texts = make_corpus(args.texts)
+    
+    print(f"Scoring {len(texts)} texts locally ({cpu_count} CPUs available)")
+    print(f"{'workers':>8} {'seconds':>9} {'texts/s':>10} {'speedup':>8} {'efficiency':>10}")
+    
+    # Warm up lexicons in this process so the 1-worker run doesn't pay for them
+    score_local_parallel(texts[:10], workers=1)
+    
+    baseline = None
+    reference = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = score_local_parallel(texts, workers=workers, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        
+        if reference is None:
+            reference = results
+            baseline = elapsed
+        elif results != reference:
+            raise AssertionError(f"Results with {workers} workers differ from the 1-worker run")
+        
+        speedup = baseline / elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {len(texts) / elapsed:>10.0f} {speedup:>7.2f}x {speedup / workers:>9.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: original (v1) vs compact (v2) GPT prompts
+Usage: python -m benchmarks.bench_prompts [--texts 100] [--concurrency 8] [--gpt-latency 0.05]
+       [--prompt-token-latency 0.0005] [--tpm 20000] [--fused] [--json results.json]
+
+Sends the same texts through sentiment scoring and sass quote generation with
+every prompt stage pinned to one version, against the local fake OpenAI server.
+The fake server charges latency per prompt token, and the rate limiter reserves
+prompt tokens plus max_tokens against the TPM quota, so both prompt length and
+the completion budget show up in latency and throughput.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_parallel_local import make_corpus
+
+def _percentiles(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    percentile = lambda pct: ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000
+    return {'p50_ms': round(percentile(50), 2), 'p95_ms': round(percentile(95), 2)}
+
+def run_version(version: str, texts: List[str], args) -> Dict[str, Any]:
+    """Score and quote every text with all prompt stages pinned to version"""
+    from config import Config
+    from benchmarks.fake_openai import FakeOpenAIServer
+    from sentiment.analyzer import SentimentAnalyzer
+    from sass_quotes.sass_gen import SassQuoteGenerator
+    from utils.gpt_client import GPTClient
+    from utils.rate_limiter import AdaptiveRateLimiter
+    from utils.circuit_breaker import CircuitBreaker
+    from utils.prompts import LATEST_VERSIONS, get_prompt
+
+    Config.GPT_PROMPT_VERSIONS = {stage: version for stage in LATEST_VERSIONS}
+    latencies: Dict[str, List[float]] = {}
+
+    def timed(stage, fn, *fn_args):
+        started = time.perf_counter()
+        result = fn(*fn_args)
+        latencies.setdefault(stage, []).append(time.perf_counter() - started)
+        return result
+
+    with FakeOpenAIServer(latency=args.gpt_latency, prompt_token_latency=args.prompt_token_latency) as fake:
+        client = GPTClient(api_key='fake-key', base_url=fake.base_url, pool_size=args.concurrency,
+                           rate_limiter=AdaptiveRateLimiter(tpm=args.tpm, max_concurrency=args.concurrency),
+                           circuit_breaker=CircuitBreaker())
+        analyzer = SentimentAnalyzer(client=client, memo_size=0)
+        generator = SassQuoteGenerator(client=client)
+        client.sync_client
+
+        def one(text):
+            if args.fused:
+                gpt = timed('sentiment_fused', analyzer.analyze_gpt_fused, text)
+            else:
+                gpt = timed('sentiment', analyzer.analyze_gpt, text)
+                timed('sass', generator.generate_gpt_sass_quote, 'positive', 'Good Vibes', gpt['score'])
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(one, texts))
+        elapsed = time.perf_counter() - started
+        usage = client.usage.stats()
+        analyzer.close()
+        client.close()
+
+    stages = {}
+    for stage, totals in usage.items():
+        prompt = get_prompt(stage, version)
+        stages[stage] = {
+            'calls': totals['calls'],
+            'prompt_tokens_per_call': round(totals['prompt_tokens'] / totals['calls'], 1),
+            'max_tokens': prompt.budget(),
+            **_percentiles(latencies.get(stage, [0.0]))
+        }
+    total_tokens = sum(totals['total_tokens'] for totals in usage.values())
+    return {
+        'version': version,
+        'seconds': round(elapsed, 3),
+        'texts_per_second': round(len(texts) / elapsed, 2),
+        'tokens_per_second': round(total_tokens / elapsed, 1),
+        'total_tokens': total_tokens,
+        'stages': stages
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--texts', type=int, default=100, help='Texts to process per prompt version')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent callers')
+    parser.add_argument('--gpt-latency', type=float, default=0.05, help='Fixed fake OpenAI latency in seconds')
+    parser.add_argument('--prompt-token-latency', type=float, default=0.0005, help='Extra seconds per prompt token')
+    parser.add_argument('--tpm', type=int, default=None, help='Tokens-per-minute quota on the client side')
+    parser.add_argument('--fused', action='store_true', help='Compare the fused sentiment + sass prompt instead')
+    parser.add_argument('--json', dest='json_out', default=None, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    texts = make_corpus(args.texts, seed=11)
+    reports = [run_version(version, texts, args) for version in ('v1', 'v2')]
+
+    print(f"{'version':>8} {'stage':>16} {'calls':>6} {'prompt tok':>10} {'max_tokens':>10} {'p50 ms':>8} {'p95 ms':>8}")
+    for report in reports:
+        for stage, row in report['stages'].items():
+            print(f"{report['version']:>8} {stage:>16} {row['calls']:>6} {row['prompt_tokens_per_call']:>10} "
+                  f"{row['max_tokens']:>10} {row['p50_ms']:>8} {row['p95_ms']:>8}")
+    print()
+    print(f"{'version':>8} {'seconds':>8} {'texts/s':>8} {'tokens':>8} {'tokens/s':>9}")
+    for report in reports:
+        print(f"{report['version']:>8} {report['seconds']:>8} {report['texts_per_second']:>8} "
+              f"{report['total_tokens']:>8} {report['tokens_per_second']:>9}")
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory held per batch result, dicts vs compact result objects
+Usage: python -m benchmarks.bench_result_memory [--texts 20000] [--local-only] [--json results.json]
+
+Builds one result per text through SentimentAnalyzer._build_result with the local
+scores precomputed and a synthetic GPT result (raw reply and fused sass quotes
+included, as a fused GPT call returns), then measures the heap each layout keeps
+alive with tracemalloc. --local-only builds GPT-skipped results instead, as
+batch_process_texts(use_gpt=False) does. No network calls are made.
+"""
+
+import os
+import sys
+import json
+import argparse
+import tracemalloc
+from typing import Any, Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_parallel_local import make_corpus
+
+EMOTIONS = ('joy', 'excited', 'calm', 'frustrated', 'sad', 'neutral')
+
+def synthetic_gpt_result(i: int, score: float) -> Dict[str, Any]:
+    emotion = EMOTIONS[i % len(EMOTIONS)]
+    quotes = {mood: f"Quote {i} for {mood}, bestie, you got this" for mood in
+              ('very_positive', 'positive', 'neutral', 'negative', 'very_negative')}
+    raw = json.dumps({'score': score, 'emotion': emotion, 'quotes': quotes})
+    return {'score': score, 'emotion': emotion, 'raw_response': raw, 'sass_quotes': quotes}
+
+def measure(texts: List[str], local_results, compact: bool, keep_raw: bool, local_only: bool) -> Dict[str, Any]:
+    """Bytes per result kept alive by one layout"""
+    from sentiment.analyzer import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer(client=None, memo_size=0)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = []
+    for i, (text, (textblob_result, vader_result)) in enumerate(zip(texts, local_results)):
+        gpt_result = None if local_only else synthetic_gpt_result(i, round(vader_result['compound'], 2))
+        results.append(analyzer._build_result(text, textblob_result, vader_result, gpt_result, compact, keep_raw))
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    analyzer.close()
+    return {'bytes_per_result': round(retained / len(results), 1), 'total_mb': round(retained / 1e6, 2)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--texts', type=int, default=20000, help='Results to build per layout')
+    parser.add_argument('--local-only', action='store_true', help='Measure GPT-skipped results')
+    parser.add_argument('--json', dest='json_out', default=None, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    from sentiment.analyzer import SentimentAnalyzer
+    texts = make_corpus(args.texts, seed=3)
+    scorer = SentimentAnalyzer(client=None, memo_size=0)
+    local_results = [(scorer.analyze_textblob(text), scorer.analyze_vader(text)) for text in texts]
+    scorer.close()
+
+    layouts = {
+        'dict': measure(texts, local_results, compact=False, keep_raw=True, local_only=args.local_only),
+        'compact': measure(texts, local_results, compact=True, keep_raw=True, local_only=args.local_only),
+        'compact_no_raw': measure(texts, local_results, compact=True, keep_raw=False, local_only=args.local_only),
+    }
+    baseline = layouts['dict']['bytes_per_result']
+    print(f"{'layout':>16} {'bytes/result':>13} {'total MB':>9} {'vs dict':>8}")
+    for name, row in layouts.items():
+        row['ratio'] = round(row['bytes_per_result'] / baseline, 3)
+        print(f"{name:>16} {row['bytes_per_result']:>13} {row['total_mb']:>9} {row['ratio']:>8}")
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(layouts, f, indent=2)
+
+if __name__ == "__main__":
+    main()
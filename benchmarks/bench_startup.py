@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start import time and time-to-first-prompt
+Usage: python -m benchmarks.bench_startup [--repeat 5] [--max-import-ms 150] [--max-first-prompt-ms 600]
+Exits non-zero when a measurement exceeds its regression threshold.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry-point modules measured on their own
+MODULES = ['config', 'utils.helpers', 'sentiment.analyzer', 'sass_quotes.sass_gen', 'main']
+
+# Modules that must not be imported until a scorer or GPT call actually needs them
+HEAVY_MODULES = ['textblob', 'vaderSentiment', 'openai', 'nltk']
+
+# Entry points and the prompt text that marks them ready for input
+PROMPT_ENTRY_POINTS = {
+    'sentiment-bot': (['main.py'], 'Enter your text'),
+    'sentiment-interactive': (['-m', 'utils.helpers'], 'Enter text (or command)'),
+}
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault('OPENAI_API_KEY', 'startup-benchmark')
+    env['PYTHONPATH'] = ROOT
+    return env
+
+def measure_import_ms(module: str) -> float:
+    """Cumulative import time of one module in a fresh interpreter, via -X importtime"""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=_env(), capture_output=True, text=True, check=True
+    )
+    for line in reversed(proc.stderr.splitlines()):
+        parts = [part.strip() for part in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"No importtime entry for {module}")
+
+def loaded_heavy_modules(code: str) -> List[str]:
+    """Heavy modules present in sys.modules after running code in a fresh interpreter"""
+    probe = f"{code}\nimport sys, json\nprint(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    proc = subprocess.run(
+        [sys.executable, '-c', probe], cwd=ROOT, env=_env(), capture_output=True, text=True, check=True
+    )
+    loaded = set(json.loads(proc.stdout.strip().splitlines()[-1]))
+    return [module for module in HEAVY_MODULES if module in loaded]
+
+def measure_first_prompt_ms(args: List[str], prompt: str, timeout: float = 30.0) -> float:
+    """Wall time from process spawn until the entry point prints its input prompt"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-u'] + args, cwd=ROOT, env=_env(),
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    output = b''
+    try:
+        while prompt.encode('utf-8') not in output:
+            chunk = proc.stdout.read1(4096)
+            if not chunk or time.perf_counter() - start > timeout:
+                raise RuntimeError(f"Prompt {prompt!r} never appeared for {args}")
+            output += chunk
+        return (time.perf_counter() - start) * 1000
+    finally:
+        proc.kill()
+        proc.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (median is reported)')
+    parser.add_argument('--max-import-ms', type=float, default=150.0, help='Regression threshold per module import')
+    parser.add_argument('--max-first-prompt-ms', type=float, default=600.0, help='Regression threshold for time-to-first-prompt')
+    parser.add_argument('--json', dest='json_out', default=None, help='Write results to this JSON file')
+    args = parser.parse_args()
+    
+    report = {'import_ms': {}, 'first_prompt_ms': {}, 'heavy_modules_at_startup': [], 'failures': []}
+    
+    print(f"{'module':<24} {'import ms':>10}")
+    for module in MODULES:
+        value = statistics.median(measure_import_ms(module) for _ in range(args.repeat))
+        report['import_ms'][module] = round(value, 2)
+        print(f"{module:<24} {value:>10.1f}")
+        if value > args.max_import_ms:
+            report['failures'].append(f"import {module}: {value:.1f}ms > {args.max_import_ms}ms")
+    
+    print(f"\n{'entry point':<24} {'first prompt ms':>16}")
+    for name, (entry_args, prompt) in PROMPT_ENTRY_POINTS.items():
+        value = statistics.median(measure_first_prompt_ms(entry_args, prompt) for _ in range(args.repeat))
+        report['first_prompt_ms'][name] = round(value, 2)
+        print(f"{name:<24} {value:>16.1f}")
+        if value > args.max_first_prompt_ms:
+            report['failures'].append(f"{name} first prompt: {value:.1f}ms > {args.max_first_prompt_ms}ms")
+    
+    heavy = loaded_heavy_modules(
+        "import main\n"
+        "from sentiment.analyzer import SentimentAnalyzer\n"
+        "from sass_quotes.sass_gen import SassQuoteGenerator\n"
+        "SentimentAnalyzer()\n"
+        "SassQuoteGenerator().get_fallback_quote('neutral')"
+    )
+    report['heavy_modules_at_startup'] = heavy
+    if heavy:
+        report['failures'].append(f"heavy modules imported at startup: {', '.join(heavy)}")
+    
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    
+    for failure in report['failures']:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if report['failures'] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized batch VADER vs per-text polarity_scores
+Usage: python -m benchmarks.bench_vader_batch --sizes 1000 10000 50000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_parallel_local import make_corpus
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000], help='Batch sizes to compare')
+    args = parser.parse_args()
+    
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    from sentiment.vader_batch import VaderBatchScorer
+    
+    reference = SentimentIntensityAnalyzer()
+    scorer = VaderBatchScorer(reference)
+    scorer.polarity_scores_batch(make_corpus(100, seed=1))  # Warm up the token cache
+    
+    print(f"{'texts':>8} {'reference us/text':>18} {'batch us/text':>14} {'speedup':>8} {'max |diff|':>11}")
+    for size in args.sizes:
+        texts = make_corpus(size)
+        
+        start = time.perf_counter()
+        expected = [reference.polarity_scores(text) for text in texts]
+        reference_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        actual = scorer.polarity_scores_batch(texts)
+        batch_time = time.perf_counter() - start
+        
+        max_diff = max(abs(e[key] - a[key]) for e, a in zip(expected, actual) for key in e)
+        print(f"{size:>8} {reference_time / size * 1e6:>18.1f} {batch_time / size * 1e6:>14.1f} "
+              f"{reference_time / batch_time:>7.1f}x {max_diff:>11.2g}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Local fake of the OpenAI chat completions endpoint for tests and benchmarks
+Usage: python -m benchmarks.fake_openai --port 8001 --latency 0.2 [--latency-sigma 0.5] [--error-rate 0.02] [--rpm 600]
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8001/v1. Replies follow
+the formats our prompts ask for, and it can inject latency, an RPM quota, a
+concurrency cap, forced 429s (with Retry-After) and random 500s to exercise the
+rate limiter, circuit breaker and benchmarks.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+NUMBERED_TEXT_PATTERN = re.compile(r'^\s*(\d+)\. "', re.MULTILINE)
+QUOTE_COUNT_PATTERN = re.compile(r'Generate (\d+) DIFFERENT')
+TEXT_PATTERN = re.compile(r'Text: "(.*)"', re.DOTALL)
+
+def fake_score(text: str) -> float:
+    """Deterministic pseudo-sentiment in [-1, 1] for a text"""
+    return round((zlib.crc32(text.encode('utf-8')) % 201 - 100) / 100, 2)
+
+def default_reply(prompt: str) -> str:
+    """Answer in whichever format the prompt asks for"""
+    text_match = TEXT_PATTERN.search(prompt)
+    text = text_match.group(1) if text_match else prompt
+
+    if '"quotes"' in prompt:
+        from config import Config
+        return json.dumps({
+            'score': fake_score(text),
+            'emotion': 'fake feelings',
+            'quotes': {mood: f"Fake {label['vibe']} energy, bestie ✨" for mood, label in Config.MOOD_LABELS.items()}
+        })
+    count_match = QUOTE_COUNT_PATTERN.search(prompt)
+    if count_match:
+        return "\n".join(f"{i}. Fake sass take number {i} 💅" for i in range(1, int(count_match.group(1)) + 1))
+    numbered = NUMBERED_TEXT_PATTERN.findall(prompt)
+    if numbered:
+        return "\n".join(f"{i} | Score: {fake_score(prompt + i)} | Emotion: fake feelings" for i in numbered)
+    if 'Score:' in prompt:
+        return f"Score: {fake_score(text)}\nEmotion: fake feelings"
+    return "You're serving fake-server realness today ✨"
+
+def lognormal_latency(median: float, sigma: float = 0.5, seed: int = 0) -> Callable[[int], float]:
+    """Latency function with a long right tail, like real API response times"""
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def latency(number: int) -> float:
+        with lock:
+            return rng.lognormvariate(0, sigma) * median
+    return latency
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-reply (timeouts, cancelled hedges) are expected here
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+class FakeOpenAIServer:
+    """Threaded HTTP server speaking just enough of /v1/chat/completions
+
+    latency is either fixed seconds or a function of the 1-based request number;
+    prompt_token_latency adds seconds per prompt token (longer prompts answer slower).
+    error_rate is the fraction of admitted requests answered with a 500.
+    """
+
+    def __init__(self, latency: Union[float, Callable[[int], float]] = 0.0, rpm: Optional[int] = None, max_concurrency: Optional[int] = None,
+                 fail_first: int = 0, retry_after: Optional[float] = None, error_rate: float = 0.0, seed: int = 0,
+                 prompt_token_latency: float = 0.0,
+                 reply: Callable[[str], str] = default_reply, host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.rpm = rpm
+        self.max_concurrency = max_concurrency
+        self.fail_first = fail_first
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.prompt_token_latency = prompt_token_latency
+        self.reply = reply
+        self._rng = random.Random(seed)
+
+        self._lock = threading.Lock()
+        self._window = deque()
+        self.in_flight = 0
+        self.peak_concurrency = 0
+        self.requests = 0
+        self.completed = 0
+        self.rate_limited = 0
+        self.server_errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+        self.httpd = _QuietHTTPServer((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'FakeOpenAIServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='fake-openai', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> 'FakeOpenAIServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _admit(self) -> Tuple[Optional[float], int]:
+        """Count a request in, returning (Retry-After delay if it should get a 429, request number)"""
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            number = self.requests
+            if number <= self.fail_first:
+                self.rate_limited += 1
+                return (self.retry_after if self.retry_after is not None else 0.1), number
+            if self.max_concurrency is not None and self.in_flight >= self.max_concurrency:
+                self.rate_limited += 1
+                return (self.retry_after if self.retry_after is not None else 0.1), number
+            if self.rpm is not None:
+                while self._window and now - self._window[0] >= 60.0:
+                    self._window.popleft()
+                if len(self._window) >= self.rpm:
+                    self.rate_limited += 1
+                    return 60.0 - (now - self._window[0]), number
+                self._window.append(now)
+            self.in_flight += 1
+            self.peak_concurrency = max(self.peak_concurrency, self.in_flight)
+            return None, number
+
+    def _injected_error(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.server_errors += 1
+            return failed
+
+    def _completion(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        prompt = body['messages'][-1]['content']
+        content = self.reply(prompt)
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        return {
+            'id': f"chatcmpl-fake-{self.requests}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'fake'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens
+            }
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'completed': self.completed,
+                'rate_limited': self.rate_limited,
+                'server_errors': self.server_errors,
+                'peak_concurrency': self.peak_concurrency,
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens
+            }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; with Nagle on, delayed ACK adds ~40 ms per reply
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if not self.path.endswith('/chat/completions'):
+                    self._send_json(404, {'error': {'message': 'not found'}})
+                    return
+
+                retry_after, number = server._admit()
+                if retry_after is not None:
+                    self._send_json(429, {'error': {'message': 'Rate limit reached', 'type': 'requests'}},
+                                    {'Retry-After': f"{retry_after:.3f}"})
+                    return
+
+                try:
+                    latency = server.latency(number) if callable(server.latency) else server.latency
+                    if server.prompt_token_latency:
+                        latency += server.prompt_token_latency * (len(body['messages'][-1]['content']) // 4)
+                    if latency:
+                        time.sleep(latency)
+                    if server._injected_error():
+                        self._send_json(500, {'error': {'message': 'Injected server error', 'type': 'server_error'}})
+                        return
+                    self._send_json(200, server._completion(body))
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+                        server.completed += 1
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.2, help='Median seconds added to every completion')
+    parser.add_argument('--latency-sigma', type=float, default=0.0, help='Lognormal spread of the latency (0 = fixed)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with a 500')
+    parser.add_argument('--rpm', type=int, help='Requests-per-minute quota (429 beyond it)')
+    parser.add_argument('--max-concurrency', type=int, help='Concurrent requests allowed (429 beyond it)')
+    args = parser.parse_args()
+
+    latency = lognormal_latency(args.latency, args.latency_sigma) if args.latency_sigma else args.latency
+    server = FakeOpenAIServer(latency=latency, rpm=args.rpm, max_concurrency=args.max_concurrency,
+                              error_rate=args.error_rate, host=args.host, port=args.port)
+    print(f"Fake OpenAI API listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.stats()))
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
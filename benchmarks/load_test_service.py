@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Load test: drive the HTTP service with concurrent keep-alive clients
+Usage: python -m benchmarks.load_test_service [--connections 32] [--requests 2000] [--endpoint sass]
+       [--gpt-latency 0.3] [--url http://127.0.0.1:8080] [--json results.json]
+
+Without --url an in-process service is started against the local fake OpenAI
+server (benchmarks.fake_openai), so no API key or network access is needed.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_parallel_local import make_corpus
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Server closed the connection")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if not line.strip():
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value.strip())
+    return status, await reader.readexactly(length)
+
+async def _client(host: str, port: int, path: str, bodies: List[bytes],
+                  latencies: List[float], statuses: Dict[int, int]) -> None:
+    """One keep-alive connection sending its share of requests back to back"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in bodies:
+            request = (
+                f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode('latin-1') + body
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, _ = await _read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+async def run_load(host: str, port: int, endpoint: str, connections: int, requests: int,
+                   use_gpt: bool) -> Dict[str, Any]:
+    texts = make_corpus(requests, seed=7)
+    bodies = [json.dumps({'text': text, 'use_gpt': use_gpt}).encode('utf-8') for text in texts]
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, f"/{endpoint}", bodies[i::connections], latencies, statuses)
+        for i in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    percentile = lambda pct: ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000
+    return {
+        'endpoint': endpoint,
+        'connections': connections,
+        'requests': len(latencies),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'latency_ms': {
+            'mean': round(statistics.mean(ordered) * 1000, 2),
+            'p50': round(percentile(50), 2),
+            'p95': round(percentile(95), 2),
+            'p99': round(percentile(99), 2),
+            'max': round(ordered[-1] * 1000, 2)
+        },
+        'statuses': statuses
+    }
+
+async def run_in_process(args) -> Dict[str, Any]:
+    """Start the fake OpenAI server and a warm service, then load it"""
+    from benchmarks.fake_openai import FakeOpenAIServer
+    from utils.gpt_client import GPTClient, set_default_client
+    from service.server import SentimentService
+
+    with FakeOpenAIServer(latency=args.gpt_latency) as fake:
+        set_default_client(GPTClient(api_key='fake-key', base_url=fake.base_url))
+        service = SentimentService()
+        service.warm_up()
+        await service.start('127.0.0.1', 0)
+        try:
+            report = await run_load('127.0.0.1', service.port, args.endpoint, args.connections,
+                                    args.requests, not args.no_gpt)
+        finally:
+            await service.stop()
+            set_default_client(None)
+        report['fake_openai'] = fake.stats()
+        report['service'] = service.stats()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--connections', type=int, default=32, help='Concurrent keep-alive connections')
+    parser.add_argument('--requests', type=int, default=2000, help='Total requests')
+    parser.add_argument('--endpoint', choices=['analyze', 'sass'], default='sass')
+    parser.add_argument('--gpt-latency', type=float, default=0.3, help='Fake OpenAI latency in seconds')
+    parser.add_argument('--no-gpt', action='store_true', help='Send use_gpt=false (local scorers only)')
+    parser.add_argument('--url', default=None, help='Load an already running service instead')
+    parser.add_argument('--json', dest='json_out', default=None, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    if args.url:
+        parts = urlsplit(args.url)
+        report = asyncio.run(run_load(parts.hostname, parts.port or 80, args.endpoint,
+                                      args.connections, args.requests, not args.no_gpt))
+    else:
+        report = asyncio.run(run_in_process(args))
+
+    latency = report['latency_ms']
+    print(f"{report['requests']} requests to /{report['endpoint']} over {report['connections']} connections "
+          f"in {report['seconds']}s: {report['requests_per_second']} req/s")
+    print(f"latency ms: p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    print(f"statuses: {report['statuses']}")
+
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
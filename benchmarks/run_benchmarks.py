@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: throughput, latency percentiles and memory for the core entry points
+Usage: python -m benchmarks.run_benchmarks [--out results.json] [--baseline baseline.json] [--tolerance 0.25]
+       [--sizes 10 100 1000] [--concurrency 1 8] [--iterations 100] [--quick]
+       [--gpt-latency 0.05] [--gpt-latency-sigma 0.5] [--gpt-error-rate 0.0] [--targets textblob vader]
+
+GPT calls go to the local fake OpenAI server (benchmarks.fake_openai) with a seeded
+lognormal latency distribution and optional injected 500s, so runs are repeatable
+and need no API key. Results are written as JSON; with --baseline each case is
+compared against an earlier run and the exit status is 1 on a regression.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tracemalloc
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_parallel_local import SAMPLE_TEXTS
+
+TARGETS = ['clean_text', 'textblob', 'vader', 'comprehensive', 'sass_quote', 'batch']
+GPT_TARGETS = {'comprehensive', 'sass_quote', 'batch'}
+
+def make_texts(count: int, words: int, seed: int = 42) -> List[str]:
+    """Seeded texts of roughly `words` words, built from the sample sentences"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        parts = []
+        while sum(len(part.split()) for part in parts) < words:
+            parts.append(rng.choice(SAMPLE_TEXTS))
+        texts.append(" ".join(" ".join(parts).split()[:words]))
+    return texts
+
+def summarize(latencies: List[float], items: int, elapsed: float) -> Dict[str, float]:
+    """Throughput and latency percentiles (ms) for one case"""
+    ordered = sorted(latencies)
+    percentile = lambda pct: ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000
+    return {
+        'calls': len(ordered),
+        'seconds': round(elapsed, 4),
+        'throughput': round(items / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(50), 3),
+        'p95_ms': round(percentile(95), 3),
+        'p99_ms': round(percentile(99), 3),
+        'max_ms': round(ordered[-1] * 1000, 3)
+    }
+
+def run_case(fn: Callable[[Any], Any], inputs: List[Any], concurrency: int) -> tuple:
+    """Call fn on every input from `concurrency` threads, timing each call"""
+    latencies: List[float] = []
+
+    def timed(arg):
+        started = time.perf_counter()
+        fn(arg)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    if concurrency <= 1:
+        for arg in inputs:
+            timed(arg)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(timed, inputs))
+    return latencies, time.perf_counter() - started
+
+def peak_memory_kb(fn: Callable[[Any], Any], inputs: List[Any], concurrency: int) -> float:
+    """Peak traced allocation while running the case (a separate, untimed pass)"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        run_case(fn, inputs, concurrency)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round((peak - baseline) / 1024, 1)
+
+def build_cases(targets: List[str], sizes: List[int], concurrency_levels: List[int],
+                iterations: int, batch_sizes: List[int]) -> List[Dict[str, Any]]:
+    """Expand targets x input sizes x concurrency into benchmark cases"""
+    from sentiment.analyzer import SentimentAnalyzer
+    from sass_quotes.sass_gen import SassQuoteGenerator
+    from utils.helpers import clean_text, batch_process_texts
+
+    analyzer = SentimentAnalyzer(memo_size=0)
+    generator = SassQuoteGenerator()
+    functions = {
+        'clean_text': clean_text,
+        'textblob': analyzer.analyze_textblob,
+        'vader': analyzer.analyze_vader,
+        'comprehensive': lambda text: analyzer.analyze_comprehensive(text, cascade=False),
+        'sass_quote': generator.generate_sass_quote,
+    }
+
+    cases = []
+    for target in targets:
+        if target == 'batch':
+            # Input size is the number of texts per batch_process_texts call
+            for size in batch_sizes:
+                batches = [make_texts(size, 20, seed=i) for i in range(max(1, iterations // 20))]
+                cases.append({'name': f"batch/size={size}/c=1", 'target': target, 'size': size,
+                              'concurrency': 1, 'fn': batch_process_texts, 'inputs': batches,
+                              'items': size * len(batches)})
+            continue
+        for size in sizes:
+            texts = make_texts(iterations, size, seed=size)
+            inputs = texts
+            if target == 'sass_quote':
+                inputs = [analyzer.analyze_local_only(text) for text in texts]
+            for concurrency in concurrency_levels:
+                cases.append({'name': f"{target}/size={size}/c={concurrency}", 'target': target,
+                              'size': size, 'concurrency': concurrency, 'fn': functions[target],
+                              'inputs': inputs, 'items': len(inputs)})
+    return cases
+
+def run_suite(args) -> Dict[str, Any]:
+    """Run every case against a fresh fake OpenAI server and collect the report"""
+    from benchmarks.fake_openai import FakeOpenAIServer, lognormal_latency
+    from utils.gpt_client import GPTClient, set_default_client
+    from utils.rate_limiter import AdaptiveRateLimiter
+    from utils.circuit_breaker import CircuitBreaker
+
+    latency = lognormal_latency(args.gpt_latency, args.gpt_latency_sigma, seed=args.seed) \
+        if args.gpt_latency_sigma else args.gpt_latency
+    needs_gpt = bool(GPT_TARGETS.intersection(args.targets))
+    results = []
+
+    with FakeOpenAIServer(latency=latency, error_rate=args.gpt_error_rate, seed=args.seed) as fake:
+        max_concurrency = max(args.concurrency)
+        client = GPTClient(api_key='fake-key', base_url=fake.base_url, pool_size=max_concurrency,
+                           rate_limiter=AdaptiveRateLimiter(max_concurrency=max_concurrency),
+                           circuit_breaker=CircuitBreaker())
+        set_default_client(client)
+        try:
+            cases = build_cases(args.targets, args.sizes, args.concurrency, args.iterations, args.batch_sizes)
+            if needs_gpt:
+                client.sync_client
+            for case in cases:
+                # One warm-up call so lazy imports and lexicon loads stay out of the numbers
+                case['fn'](case['inputs'][0])
+                latencies, elapsed = run_case(case['fn'], case['inputs'], case['concurrency'])
+                entry = {key: case[key] for key in ('name', 'target', 'size', 'concurrency')}
+                entry.update(summarize(latencies, case['items'], elapsed))
+                if not args.no_memory:
+                    entry['peak_memory_kb'] = peak_memory_kb(case['fn'], case['inputs'][:args.memory_iterations],
+                                                             case['concurrency'])
+                results.append(entry)
+                print(f"{entry['name']:<32} {entry['throughput']:>10.1f}/s  p50 {entry['p50_ms']:>9.2f}  "
+                      f"p95 {entry['p95_ms']:>9.2f}  p99 {entry['p99_ms']:>9.2f} ms"
+                      + (f"  peak {entry['peak_memory_kb']:>9.1f} KiB" if 'peak_memory_kb' in entry else ''))
+        finally:
+            set_default_client(None)
+            client.close()
+        fake_stats = fake.stats()
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'params': {
+                'iterations': args.iterations,
+                'sizes': args.sizes,
+                'batch_sizes': args.batch_sizes,
+                'concurrency': args.concurrency,
+                'gpt_latency': args.gpt_latency,
+                'gpt_latency_sigma': args.gpt_latency_sigma,
+                'gpt_error_rate': args.gpt_error_rate,
+                'seed': args.seed
+            },
+            'fake_openai': fake_stats
+        },
+        'results': results
+    }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25) -> List[str]:
+    """Regressions of current against baseline, matched by case name
+
+    A case regresses when throughput drops, or p95 latency or peak memory grows,
+    by more than `tolerance` (a fraction of the baseline value).
+    """
+    previous = {entry['name']: entry for entry in baseline.get('results', [])}
+    regressions = []
+    for entry in current.get('results', []):
+        before = previous.get(entry['name'])
+        if before is None:
+            continue
+        if before.get('throughput') and entry['throughput'] < before['throughput'] * (1 - tolerance):
+            regressions.append(f"{entry['name']}: throughput {before['throughput']} -> {entry['throughput']}/s")
+        for metric in ('p95_ms', 'peak_memory_kb'):
+            if before.get(metric) and metric in entry and entry[metric] > before[metric] * (1 + tolerance):
+                regressions.append(f"{entry['name']}: {metric} {before[metric]} -> {entry[metric]}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=TARGETS, help='Entry points to measure')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000], help='Words per input text')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[10, 50], help='Texts per batch_process_texts call')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8], help='Concurrent callers')
+    parser.add_argument('--iterations', type=int, default=100, help='Calls per case')
+    parser.add_argument('--memory-iterations', type=int, default=20, help='Calls traced for peak memory')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--gpt-latency', type=float, default=0.05, help='Median fake OpenAI latency in seconds')
+    parser.add_argument('--gpt-latency-sigma', type=float, default=0.5, help='Lognormal latency spread (0 = fixed)')
+    parser.add_argument('--gpt-error-rate', type=float, default=0.0, help='Fraction of fake OpenAI calls answered with a 500')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--quick', action='store_true', help='Small sizes and few iterations (CI smoke run)')
+    parser.add_argument('--out', default=None, help='Write results to this JSON file')
+    parser.add_argument('--baseline', default=None, help='Compare against this earlier results file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression against the baseline')
+    args = parser.parse_args()
+
+    if args.quick:
+        args.sizes, args.batch_sizes, args.iterations = [10, 100], [10], 20
+
+    import logging
+    logging.disable(logging.WARNING)
+
+    report = run_suite(args)
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
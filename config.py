@@ -1,4 +1,5 @@
 import os
+import math
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -12,18 +13,132 @@ class Config:
     SENTIMENT_THRESHOLD_POSITIVE = 0.1
     SENTIMENT_THRESHOLD_NEGATIVE = -0.1
     
+    # Weights used to combine the individual scores
+    SCORE_WEIGHTS = {'textblob': 0.3, 'vader': 0.3, 'gpt': 0.4}
+    
+    # Cascade Settings (skip GPT when the local scorers already decide the mood)
+    GPT_CASCADE_ENABLED = os.getenv('GPT_CASCADE_ENABLED', 'false').lower() == 'true'
+    GPT_CASCADE_MARGIN = 0.5  # Assumed max distance of the GPT score from the local consensus (2.0 = any score)
+    GPT_CASCADE_MAX_DISAGREEMENT = 0.5  # Max |TextBlob - VADER| for the local scorers to count as agreeing
+    
     # GPT Settings
     GPT_MODEL = "gpt-3.5-turbo"
-    GPT_MAX_TOKENS = 150
+    GPT_MAX_TOKENS = 150  # Completion budget of the original (v1) single-text prompts
     GPT_TEMPERATURE = 0.8
+    GPT_SENTIMENT_MAX_TOKENS = 16  # "Score: x / Emotion: y" reply
+    GPT_SASS_MAX_TOKENS = 40  # One quote of under 15 words plus emojis
+    GPT_PROMPT_VERSIONS = {}  # Pin a prompt stage to an older version, e.g. {'sass': 'v1'} (see utils/prompts.py)
+    
+    # OpenAI Client Settings
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL')  # None = default OpenAI endpoint
+    GPT_POOL_SIZE = int(os.getenv('GPT_POOL_SIZE', '0')) or None  # Max pooled (keep-alive) connections (None = GPT_CONCURRENCY_MAX)
+    GPT_TIMEOUT = 20.0  # Per-request timeout in seconds
+    GPT_CONNECT_TIMEOUT = 5.0
+    GPT_KEEPALIVE_EXPIRY = 30.0
+    GPT_MAX_RETRIES = 2  # openai-level retries, only used when the rate limiter is off
+    
+    # Rate Limiter Settings (shared by every OpenAI call)
+    GPT_RATE_LIMIT_ENABLED = os.getenv('GPT_RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    GPT_RPM_LIMIT = int(os.getenv('GPT_RPM_LIMIT', '3500'))  # Requests per minute quota
+    GPT_TPM_LIMIT = int(os.getenv('GPT_TPM_LIMIT', '90000'))  # Tokens per minute quota
+    GPT_CONCURRENCY_INITIAL = 4  # Starting in-flight request limit (AIMD adjusts it)
+    GPT_EXPECTED_LATENCY_SECONDS = float(os.getenv('GPT_EXPECTED_LATENCY_SECONDS', '1.0'))  # Typical GPT call latency
+    # In-flight ceiling; the default is what it takes to use the whole RPM quota at the expected latency
+    GPT_CONCURRENCY_MAX = int(os.getenv('GPT_CONCURRENCY_MAX', '0')) or math.ceil(GPT_RPM_LIMIT / 60 * GPT_EXPECTED_LATENCY_SECONDS)
+    GPT_RETRY_ATTEMPTS = 5  # Total attempts per call, including the first
+    GPT_RETRY_BASE_DELAY = 0.5  # Seconds, doubled per attempt (full jitter)
+    GPT_RETRY_MAX_DELAY = 20.0
+    
+    # Circuit Breaker Settings (fast-fail to local scores while the API is unhealthy)
+    GPT_CIRCUIT_BREAKER_ENABLED = os.getenv('GPT_CIRCUIT_BREAKER_ENABLED', 'true').lower() == 'true'
+    GPT_CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failed calls that open the circuit
+    GPT_CIRCUIT_LATENCY_THRESHOLD = 10.0  # Seconds; slower successful calls count as failures
+    GPT_CIRCUIT_RESET_SECONDS = 30.0  # Time open before a half-open probe is sent
+    
+    # Hedged Request Settings (only for calls made with a deadline)
+    GPT_HEDGE_ENABLED = os.getenv('GPT_HEDGE_ENABLED', 'true').lower() == 'true'
+    GPT_HEDGE_PERCENTILE = 95  # Send a duplicate once a call is slower than this latency percentile
+    GPT_HEDGE_MIN_SAMPLES = 20  # Observed latencies needed before the percentile is trusted
+    GPT_HEDGE_DEFAULT_DELAY = 2.0  # Hedge delay in seconds until then
+    GPT_LATENCY_WINDOW = 200  # Recent call latencies kept for the percentile
+    REQUEST_DEADLINE_SECONDS = float(os.getenv('REQUEST_DEADLINE_SECONDS', '0')) or None  # Per-message budget (None = no deadline)
+    
+    # Concurrency Settings
+    GPT_THREAD_WORKERS = 4  # Threads used to overlap GPT calls with local scoring
+    
+    # Batch Settings
+    GPT_BATCH_SIZE = 20  # Texts packed into one GPT scoring request (1 = one request per text)
+    GPT_BATCH_TOKENS_PER_TEXT = 20  # Completion token allowance per text in a batched request
+    
+    # Micro-batching Settings (coalesce concurrent single-text GPT calls)
+    GPT_MICROBATCH_ENABLED = os.getenv('GPT_MICROBATCH_ENABLED', 'false').lower() == 'true'
+    GPT_MICROBATCH_MAX_WAIT_MS = 5.0  # How long the first request waits for company
+    GPT_MICROBATCH_MAX_SIZE = 16  # Texts per coalesced GPT call
+    GPT_MICROBATCH_CONCURRENCY = 4  # Coalesced calls in flight at once
+    
+    # Fused Mode Settings (one GPT call returns the score and sass quotes)
+    GPT_FUSED_MODE = os.getenv('GPT_FUSED_MODE', 'true').lower() == 'true'  # Used by the interactive CLIs
+    GPT_FUSED_MAX_TOKENS = 240  # Score, emotion and a quote with 1-2 emojis (~32 tokens) per mood, plus headroom
+    GPT_FUSED_TEMPERATURE = 0.6
+    
+    # Alternative Quote Settings (generate_multiple_quotes)
+    GPT_MULTI_QUOTES = os.getenv('GPT_MULTI_QUOTES', 'true').lower() == 'true'  # All alternatives from one GPT call
+    GPT_TOKENS_PER_QUOTE = 40  # Completion token allowance per requested quote
+    
+    # Quote Pool Settings (pre-generated GPT sass quotes, refilled in the background)
+    QUOTE_POOL_ENABLED = os.getenv('QUOTE_POOL_ENABLED', 'false').lower() == 'true'
+    QUOTE_POOL_SIZE = 5  # Quotes kept per (mood, score bucket)
+    QUOTE_POOL_LOW_WATERMARK = 2  # Refill a bucket once it drops below this
+    QUOTE_POOL_BUCKET_WIDTH = 0.25  # Score bucket width
+    QUOTE_POOL_MAX_AGE_SECONDS = 3600  # Pooled quotes older than this are discarded
+    
+    # Cache Settings
+    GPT_CACHE_ENABLED = os.getenv('GPT_CACHE_ENABLED', 'false').lower() == 'true'
+    CACHE_DIR = os.getenv('CACHE_DIR', 'cache')
+    GPT_CACHE_TTL_SECONDS = 7 * 24 * 3600
+    GPT_CACHE_MAX_ENTRIES = 100000
+    ANALYSIS_MEMO_SIZE = 0  # In-process LRU of full analysis results (0 = disabled)
+    
+    # Parallel Local Scoring Settings
+    LOCAL_WORKERS = None  # Worker processes for local-only batch scoring (None = CPU count)
+    LOCAL_CHUNK_SIZE = 500  # Texts sent to a worker per task
+    
+    # Streaming Pipeline Settings
+    STREAM_WINDOW = 32  # Maximum texts in flight in the streaming batch pipeline
+    
+    # Mood Summary Settings (utils/mood_stats.py)
+    MOOD_SUMMARY_SKETCH_BINS = 200  # Score histogram bins over [-1, 1] used for quantiles
+    
+    # Mood Window Settings (live mood time series, see utils/mood_windows.py)
+    MOOD_WINDOW_SIZES = {'1m': 60, '5m': 300, '1h': 3600}  # Window name -> length in seconds
+    MOOD_WINDOW_BUCKETS = 60  # Slots per sliding window (it slides in length / buckets steps)
+    MOOD_WINDOW_HISTORY = 60  # Completed tumbling windows kept per size
+    
+    # Metrics Settings (per-stage timings and counters, see utils/metrics.py)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_RESULT_TIMINGS = os.getenv('METRICS_RESULT_TIMINGS', 'false').lower() == 'true'  # Add a 'timings' block to results
+    METRICS_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Histogram bounds in seconds
+    
+    # HTTP Service Settings (python main.py serve)
+    SERVICE_HOST = os.getenv('SERVICE_HOST', '127.0.0.1')
+    SERVICE_PORT = int(os.getenv('SERVICE_PORT', '8080'))
+    SERVICE_MAX_INFLIGHT = 16  # Requests processed at once (worker threads)
+    SERVICE_MAX_QUEUE = 64  # Requests allowed to wait for a worker before answering 503
+    SERVICE_KEEPALIVE_TIMEOUT = 15.0  # Idle seconds before a keep-alive connection is closed
+    SERVICE_MAX_BODY_BYTES = 1024 * 1024  # Largest /analyze or /sass request body, or /batch line
     
     # Mood Labels with Emojis
     MOOD_LABELS = {
-        'very_positive': {'emoji': '🔥', 'vibe': 'On Fire', 'intensity': 0.5},
-        'positive': {'emoji': '😊', 'vibe': 'Good Vibes', 'intensity': 0.25},
-        'neutral': {'emoji': '😐', 'vibe': 'Meh Energy', 'intensity': 0.0},
-        'negative': {'emoji': '😞', 'vibe': 'Down Bad', 'intensity': -0.25},
-        'very_negative': {'emoji': '💀', 'vibe': 'Big Oof', 'intensity': -0.5}
+        'very_positive': {'emoji': '🔥', 'vibe': 'On Fire', 'intensity': 0.5,
+                          'description': "extremely happy, energetic, over-the-top positive"},
+        'positive': {'emoji': '😊', 'vibe': 'Good Vibes', 'intensity': 0.25,
+                     'description': "happy, upbeat, optimistic"},
+        'neutral': {'emoji': '😐', 'vibe': 'Meh Energy', 'intensity': 0.0,
+                    'description': "indifferent, meh, neither good nor bad"},
+        'negative': {'emoji': '😞', 'vibe': 'Down Bad', 'intensity': -0.25,
+                     'description': "sad, disappointed, down"},
+        'very_negative': {'emoji': '💀', 'vibe': 'Big Oof', 'intensity': -0.5,
+                          'description': "very upset, angry, devastated"}
     }
     
     @classmethod
@@ -9,6 +9,7 @@ import json
 from config import Config
 from sentiment.analyzer import SentimentAnalyzer
 from sass_quotes.sass_gen import SassQuoteGenerator
+from utils.deadline import Deadline
 import logging
 
 # Setup logging
@@ -48,11 +49,16 @@ def main():
             
             print("\n🔍 ANALYZING...")
             
+            # One latency budget shared by both steps
+            deadline = Deadline.coerce(Config.REQUEST_DEADLINE_SECONDS)
+            
             # Step 1: Analyze sentiment
-            sentiment_result = sentiment_analyzer.analyze_comprehensive(user_input)
+            sentiment_result = sentiment_analyzer.analyze_comprehensive(
+                user_input, fused=Config.GPT_FUSED_MODE, deadline=deadline
+            )
             
             # Step 2: Generate sass quote
-            sass_result = sass_generator.generate_sass_quote(sentiment_result)
+            sass_result = sass_generator.generate_sass_quote(sentiment_result, deadline=deadline)
             
             # Display results
             print("\n" + "="*50)
@@ -65,7 +71,12 @@ def main():
             print(f"\n📈 Detailed Scores:")
             print(f"  • TextBlob: {sentiment_result['individual_scores']['textblob']['polarity']:.3f}")
             print(f"  • VADER: {sentiment_result['individual_scores']['vader']['compound']:.3f}")
-            print(f"  • GPT: {sentiment_result['individual_scores']['gpt']['score']:.3f}")
+            if 'gpt' in sentiment_result.get('degraded', []):
+                print("  • GPT: timed out")
+            elif sentiment_result.get('gpt_skipped'):
+                print("  • GPT: skipped")
+            else:
+                print(f"  • GPT: {sentiment_result['individual_scores']['gpt']['score']:.3f}")
             
             print("\n" + "="*50)
             print("💬 SASS QUOTE")
@@ -77,8 +88,10 @@ def main():
             show_more = input("\n🎲 Want to see more sass quotes? (y/n): ").lower()
             if show_more in ['y', 'yes']:
                 alternative_quotes = sass_generator.generate_multiple_quotes(sentiment_result, count=3)
+                # Skip the quote already shown
+                alternative_quotes = [q for q in alternative_quotes if q['sass_quote'] != sass_result['sass_quote']][:2]
                 print("\n🎭 ALTERNATIVE SASS QUOTES:")
-                for i, quote in enumerate(alternative_quotes[1:], 1):  # Skip the first one (already shown)
+                for i, quote in enumerate(alternative_quotes, 1):
                     print(f"  {i}. {quote['formatted_output']}")
     
     except KeyboardInterrupt:
@@ -107,15 +120,50 @@ def test_mode():
         print(f"\n{i}. Testing: '{text}'")
         
         # Analyze
-        sentiment_result = sentiment_analyzer.analyze_comprehensive(text)
+        sentiment_result = sentiment_analyzer.analyze_comprehensive(text, fused=Config.GPT_FUSED_MODE)
         sass_result = sass_generator.generate_sass_quote(sentiment_result)
         
         # Display
         print(f"   📊 {sentiment_result['analysis_summary']}")
         print(f"   💬 {sass_result['formatted_output']}")
 
+def batch_mode(argv=None):
+    """Batch mode: stream texts from a file or stdin into JSONL/CSV/columnar results"""
+    import argparse
+    from utils.pipeline import run_batch_pipeline
+    
+    parser = argparse.ArgumentParser(prog="main.py batch", description="Stream texts through the sentiment bot")
+    parser.add_argument("input", help="Input file (one text per line, or .jsonl with a 'text' field); '-' for stdin")
+    parser.add_argument("--out", default="-", help="Output file (.jsonl or .csv) or columnar store directory (.moodcol); '-' for stdout")
+    parser.add_argument("--format", choices=["jsonl", "csv", "columnar"], default=None, help="Output format (default: from --out)")
+    parser.add_argument("--window", type=int, default=None, help="Maximum texts in flight at once")
+    parser.add_argument("--no-gpt", action="store_true", help="Score with TextBlob/VADER only and use fallback quotes")
+    args = parser.parse_args(argv)
+    
+    if not args.no_gpt:
+        Config.validate_config()
+    
+    count = run_batch_pipeline(args.input, args.out, fmt=args.format, window=args.window, use_gpt=not args.no_gpt)
+    logger.info(f"Processed {count} texts")
+
+def serve_mode(argv=None):
+    """Service mode: keep warm analyzers behind an HTTP server"""
+    import argparse
+    from service.server import run_server
+    
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Serve the sentiment bot over HTTP")
+    parser.add_argument("--host", default=None, help=f"Bind address (default: {Config.SERVICE_HOST})")
+    parser.add_argument("--port", type=int, default=None, help=f"Port (default: {Config.SERVICE_PORT})")
+    args = parser.parse_args(argv)
+    
+    run_server(args.host, args.port)
+
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "test":
         test_mode()
+    elif len(sys.argv) > 1 and sys.argv[1] == "batch":
+        batch_mode(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve_mode(sys.argv[2:])
     else:
         main()
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+Pre-generated sass quote pool
+Sass quotes only depend on the mood and a coarse score, so a background worker
+keeps a few fresh GPT quotes per (mood, score bucket) ready to hand out instantly
+"""
+
+import time
+import queue
+import threading
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, float]
+
+class SassQuotePool:
+    """Per-(mood, score bucket) deques of GPT quotes, topped up by a daemon thread"""
+
+    def __init__(self, generator, size: Optional[int] = None, low_watermark: Optional[int] = None,
+                 bucket_width: Optional[float] = None, max_age: Optional[float] = None):
+        self.generator = generator
+        self.size = size or Config.QUOTE_POOL_SIZE
+        self.low_watermark = Config.QUOTE_POOL_LOW_WATERMARK if low_watermark is None else low_watermark
+        self.bucket_width = bucket_width or Config.QUOTE_POOL_BUCKET_WIDTH
+        self.max_age = max_age or Config.QUOTE_POOL_MAX_AGE_SECONDS
+
+        self._quotes: Dict[PoolKey, Deque[Tuple[str, float]]] = {}
+        self._lock = threading.Lock()
+        self._refill_queue: "queue.Queue[PoolKey]" = queue.Queue()
+        self._pending: Set[PoolKey] = set()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.refill_failures = 0
+        self.refill_seconds_total = 0.0
+        self.last_refill_ms = 0.0
+
+    def bucket(self, mood_category: str, sentiment_score: float) -> PoolKey:
+        """Pool key for a mood and score (score snapped to the nearest bucket centre)"""
+        return mood_category, round(round(sentiment_score / self.bucket_width) * self.bucket_width, 2)
+
+    def start(self) -> 'SassQuotePool':
+        """Start the background refill worker"""
+        if self._worker is None or not self._worker.is_alive():
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name='sass-quote-pool', daemon=True)
+            self._worker.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the refill worker, letting an in-progress refill finish"""
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+    def warm(self) -> None:
+        """Queue a refill for every mood at its Config intensity score"""
+        for mood_category, label in Config.MOOD_LABELS.items():
+            self._request_refill(self.bucket(mood_category, label['intensity']))
+
+    def pop(self, mood_category: str, sentiment_score: float) -> Optional[str]:
+        """Take a fresh quote for this mood and score, or None if the bucket is empty"""
+        key = self.bucket(mood_category, sentiment_score)
+        now = time.time()
+        quote = None
+
+        with self._lock:
+            bucket = self._quotes.setdefault(key, deque())
+            while bucket:
+                candidate, created = bucket.popleft()
+                if now - created <= self.max_age:
+                    quote = candidate
+                    break
+            remaining = len(bucket)
+            if quote is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if remaining < self.low_watermark:
+            self._request_refill(key)
+        return quote
+
+    def _request_refill(self, key: PoolKey) -> None:
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._refill_queue.put(key)
+
+    def refill(self, key: PoolKey) -> int:
+        """Top one bucket back up to size with a single GPT request, returning quotes added"""
+        mood_category, bucket_score = key
+        with self._lock:
+            needed = self.size - len(self._quotes.get(key, ()))
+        if needed <= 0:
+            return 0
+
+        mood_vibe = Config.MOOD_LABELS.get(mood_category, {}).get('vibe', 'Unknown')
+        started = time.perf_counter()
+        quotes = self.generator.generate_gpt_sass_quotes(mood_category, mood_vibe, bucket_score, needed, use_cache=False)
+        elapsed = time.perf_counter() - started
+
+        now = time.time()
+        with self._lock:
+            self.refills += 1
+            self.refill_seconds_total += elapsed
+            self.last_refill_ms = elapsed * 1000
+            if not quotes:
+                self.refill_failures += 1
+            bucket = self._quotes.setdefault(key, deque())
+            bucket.extend((quote, now) for quote in quotes[:self.size - len(bucket)])
+
+        logger.info(f"Refilled sass quote pool {key} with {len(quotes)} quotes in {elapsed * 1000:.0f}ms")
+        return len(quotes)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                key = self._refill_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                self.refill(key)
+            except Exception as e:
+                logger.error(f"Sass quote pool refill failed for {key}: {e}")
+                with self._lock:
+                    self.refill_failures += 1
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+                self._refill_queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate, refill latency and pooled quote counts"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'refills': self.refills,
+                'refill_failures': self.refill_failures,
+                'avg_refill_ms': self.refill_seconds_total * 1000 / self.refills if self.refills else 0.0,
+                'last_refill_ms': self.last_refill_ms,
+                'pooled_quotes': sum(len(bucket) for bucket in self._quotes.values()),
+                'pending_refills': len(self._pending)
+            }
+
+_default_pool: Optional[SassQuotePool] = None
+_default_pool_lock = threading.Lock()
+
+def get_default_quote_pool() -> SassQuotePool:
+    """Process-wide quote pool, started and warmed on first use, so generators don't each run a refill thread"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            from sass_quotes.sass_gen import SassQuoteGenerator
+            _default_pool = SassQuotePool(SassQuoteGenerator()).start()
+            _default_pool.warm()
+        return _default_pool
+
+def set_default_quote_pool(pool: Optional[SassQuotePool]) -> None:
+    """Replace the shared quote pool, stopping the previous one (None = build a fresh one on next use)"""
+    global _default_pool
+    with _default_pool_lock:
+        previous, _default_pool = _default_pool, pool
+    if previous is not None and previous is not pool:
+        previous.stop()
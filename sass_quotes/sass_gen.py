@@ -1,15 +1,38 @@
-import openai
+import re
 import random
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 from config import Config
+from utils.cache import CacheStore, get_default_cache, make_cache_key
+from utils.gpt_client import GPTClient, get_default_client
+from utils.circuit_breaker import CircuitOpenError
+from utils.deadline import Deadline, DeadlineExceeded
+from utils.metrics import Metrics, get_default_metrics
+from utils.prompts import get_prompt
+from sass_quotes.quote_pool import SassQuotePool, get_default_quote_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Leading list marker of a numbered GPT reply line, e.g. "2. " or "3) "
+QUOTE_NUMBER_PATTERN = re.compile(r'^\s*(?:\d+[.):]|[-*•])\s*')
+
 class SassQuoteGenerator:
-    def __init__(self):
-        openai.api_key = Config.OPENAI_API_KEY
+    def __init__(self, cache: Optional[CacheStore] = None, client: Optional[GPTClient] = None,
+                 pool: Optional['SassQuotePool'] = None, metrics: Optional[Metrics] = None):
+        # Pooled OpenAI client, shared with SentimentAnalyzer unless one is injected
+        self.client = client or get_default_client()
+        
+        # Stage timings and counters (no-ops unless Config.METRICS_ENABLED)
+        self.metrics = metrics or get_default_metrics()
+        
+        # Persistent GPT quote cache (shared on-disk store when enabled in Config)
+        if cache is None and Config.GPT_CACHE_ENABLED:
+            cache = get_default_cache()
+        self.cache = cache
+        
+        # Pre-generated quotes handed out without waiting on the API (see the pool property)
+        self._pool = pool
         
         # Fallback sass quotes for each mood (in case GPT fails)
         self.fallback_quotes = {
@@ -40,68 +63,146 @@ class SassQuoteGenerator:
             ]
         }
     
-    def generate_gpt_sass_quote(self, mood_category: str, mood_vibe: str, sentiment_score: float, original_text: str = "") -> str:
-        """Generate a sassy quote using GPT based on sentiment analysis"""
+    @property
+    def pool(self) -> Optional[SassQuotePool]:
+        """Injected quote pool, else the shared one when enabled (only started once GPT quotes are wanted)"""
+        if self._pool is None and Config.QUOTE_POOL_ENABLED:
+            self._pool = get_default_quote_pool()
+        return self._pool
+    
+    @pool.setter
+    def pool(self, pool: Optional[SassQuotePool]) -> None:
+        self._pool = pool
+    
+    def _quote_cache_key(self, mood_category: str, sentiment_score: float) -> str:
+        """Cache key for a GPT sass quote (the prompt only depends on mood and score)"""
+        return make_cache_key(
+            'sass', f"{mood_category}|{round(sentiment_score, 2)}", self.client.model, get_prompt('sass').version
+        )
+    
+    def generate_gpt_sass_quote(self, mood_category: str, mood_vibe: str, sentiment_score: float, original_text: str = "",
+                                deadline: Optional[Deadline] = None, fallback: bool = True) -> str:
+        """Generate a sassy quote using GPT based on sentiment analysis
+        
+        Failures fall back to a canned quote, except running out of deadline, which
+        raises DeadlineExceeded so the caller can report the quote as degraded.
+        With fallback=False every failure is raised, so the caller can label its own fallback.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self._quote_cache_key(mood_category, sentiment_score))
+            self.metrics.increment('cache_hits' if cached is not None else 'cache_misses')
+            if cached is not None:
+                return cached
+        
         try:
-            # Create a dynamic prompt based on mood
-            mood_descriptions = {
-                'very_positive': "extremely happy, energetic, over-the-top positive",
-                'positive': "happy, upbeat, optimistic",
-                'neutral': "indifferent, meh, neither good nor bad",
-                'negative': "sad, disappointed, down",
-                'very_negative': "very upset, angry, devastated"
-            }
-            
-            prompt = f"""
-            You're a sassy, witty friend giving quotes based on someone's mood. 
-            
-            Their current vibe: {mood_vibe} ({mood_descriptions.get(mood_category, 'unknown')})
-            Sentiment score: {sentiment_score} (where -1 is very negative, +1 is very positive)
+            mood_description = Config.MOOD_LABELS.get(mood_category, {}).get('description', 'unknown')
+            prompt = get_prompt('sass')
             
-            Generate a SHORT (under 15 words), sassy, modern quote that matches their energy.
-            
-            Style guidelines:
-            - Use Gen Z/millennial language 
-            - Include 1-2 relevant emojis
-            - Be supportive but sassy
-            - Match the energy level (don't be too upbeat for negative moods)
-            
-            Examples for reference:
-            Very positive: "You're literally the main character today ✨🔥"
-            Positive: "Someone's radiating good energy and I'm here for it 🌟"
-            Neutral: "Giving off strong 'existing peacefully' vibes 😌"
-            Negative: "Life really tested you today, huh? 💔"
-            Very negative: "Bestie, we're surviving this together 💀🖤"
-            
-            Generate ONE quote:
-            """
-            
-            response = openai.chat.completions.create(
-                model=Config.GPT_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=Config.GPT_MAX_TOKENS,
-                temperature=Config.GPT_TEMPERATURE
-            )
-            
-            quote = response.choices[0].message.content.strip()
+            self.metrics.increment('gpt_calls')
+            with self.metrics.stage('sass_gpt_request'):
+                quote = self.client.complete(
+                    prompt.render(mood_vibe=mood_vibe, mood_description=mood_description, sentiment_score=sentiment_score),
+                    prompt.budget(), prompt.temperature, deadline=deadline, stage=prompt.stage
+                )
             
             # Clean up the quote (remove quotes if GPT added them)
             quote = quote.strip('"').strip("'")
             
             logger.info(f"Generated GPT sass quote: {quote}")
+            if self.cache is not None:
+                self.cache.set(self._quote_cache_key(mood_category, sentiment_score), quote)
             return quote
             
+        except CircuitOpenError:
+            if not fallback:
+                raise
+            return self.get_fallback_quote(mood_category)
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error(f"GPT sass quote generation failed: {e}")
+            if not fallback:
+                raise
             return self.get_fallback_quote(mood_category)
     
+    def _parse_numbered_quotes(self, content: str) -> List[str]:
+        """Pull distinct quotes out of a numbered-list reply, in order"""
+        lines = [line for line in content.split('\n') if line.strip()]
+        # Ignore any preamble when the reply is numbered
+        numbered = [line for line in lines if QUOTE_NUMBER_PATTERN.match(line)]
+        
+        quotes = []
+        seen = set()
+        for line in numbered or lines:
+            quote = QUOTE_NUMBER_PATTERN.sub('', line).strip().strip('"').strip("'").strip()
+            key = re.sub(r'[^\w\s]', '', quote).lower().strip()
+            if key and key not in seen:
+                seen.add(key)
+                quotes.append(quote)
+        return quotes
+    
+    def generate_gpt_sass_quotes(self, mood_category: str, mood_vibe: str, sentiment_score: float,
+                                 count: int, use_cache: bool = True) -> List[str]:
+        """Generate up to count distinct sass quotes in a single GPT request
+        
+        May return fewer than count quotes (or none if the call fails); callers pad as needed.
+        use_cache=False forces fresh quotes (the quote pool wants new ones each refill).
+        """
+        use_cache = use_cache and self.cache is not None
+        prompt = get_prompt('sass_multi')
+        cache_key = make_cache_key(
+            'sass_multi', f"{mood_category}|{round(sentiment_score, 2)}|{count}", self.client.model, prompt.version
+        )
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            self.metrics.increment('cache_hits' if cached is not None else 'cache_misses')
+            if cached is not None:
+                return cached
+        
+        try:
+            mood_description = Config.MOOD_LABELS.get(mood_category, {}).get('description', 'unknown')
+            
+            self.metrics.increment('gpt_calls')
+            with self.metrics.stage('sass_gpt_request'):
+                content = self.client.complete(
+                    prompt.render(mood_vibe=mood_vibe, mood_description=mood_description,
+                                  sentiment_score=sentiment_score, count=count),
+                    prompt.budget(count), prompt.temperature, stage=prompt.stage
+                )
+            with self.metrics.stage('sass_parse'):
+                quotes = self._parse_numbered_quotes(content)[:count]
+            
+            logger.info(f"Generated {len(quotes)} GPT sass quotes in one request")
+            if use_cache and len(quotes) == count:
+                self.cache.set(cache_key, quotes)
+            return quotes
+            
+        except CircuitOpenError:
+            return []
+        except Exception as e:
+            logger.error(f"GPT multi-quote generation failed: {e}")
+            return []
+    
     def get_fallback_quote(self, mood_category: str) -> str:
         """Get a random fallback quote for the mood category"""
         quotes = self.fallback_quotes.get(mood_category, self.fallback_quotes['neutral'])
         return random.choice(quotes)
     
-    def generate_sass_quote(self, sentiment_analysis: Dict[str, Any], use_gpt: bool = True) -> Dict[str, Any]:
-        """Generate a sass quote based on sentiment analysis results"""
+    def generate_sass_quote(self, sentiment_analysis: Dict[str, Any], use_gpt: bool = True,
+                            deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Generate a sass quote based on sentiment analysis results
+        
+        With a deadline (Deadline or seconds) the GPT call only gets the remaining budget;
+        if it runs out a fallback quote is used and 'sass_quote' is listed under 'degraded'.
+        With metrics result timings on, the result carries a 'timings' block (ms per stage).
+        """
+        with self.metrics.trace('sass_quote') as trace:
+            result = self._generate_sass_quote(sentiment_analysis, use_gpt, Deadline.coerce(deadline))
+        return self.metrics.attach_timings(result, trace)
+    
+    def _generate_sass_quote(self, sentiment_analysis: Dict[str, Any], use_gpt: bool,
+                             deadline: Optional[Deadline]) -> Dict[str, Any]:
+        degraded = []
         mood_category = sentiment_analysis['mood_category']
         mood_vibe = sentiment_analysis['mood_vibe']
         sentiment_score = sentiment_analysis['combined_score']
@@ -109,12 +210,38 @@ class SassQuoteGenerator:
         
         logger.info(f"Generating sass quote for {mood_category} mood")
         
-        if use_gpt:
-            sass_quote = self.generate_gpt_sass_quote(
-                mood_category, mood_vibe, sentiment_score, original_text
-            )
+        # Quote already produced by a fused sentiment + sass GPT call for this mood
+        fused_quote = sentiment_analysis.get('individual_scores', {}).get('gpt', {}).get('sass_quotes', {}).get(mood_category)
+        
+        # Skip straight to the fallbacks while the GPT circuit breaker is open
+        if use_gpt and not fused_quote and not self.client.available():
+            use_gpt = False
+        
+        if use_gpt and fused_quote:
+            sass_quote = fused_quote
+            generation_method = 'gpt_fused'
+        elif use_gpt:
+            pooled_quote = self.pool.pop(mood_category, sentiment_score) if self.pool is not None else None
+            if pooled_quote:
+                sass_quote = pooled_quote
+                generation_method = 'gpt_pool'
+            else:
+                try:
+                    sass_quote = self.generate_gpt_sass_quote(
+                        mood_category, mood_vibe, sentiment_score, original_text, deadline=deadline, fallback=False
+                    )
+                    generation_method = 'gpt'
+                except DeadlineExceeded:
+                    sass_quote = self.get_fallback_quote(mood_category)
+                    generation_method = 'fallback'
+                    degraded.append('sass_quote')
+                except Exception:
+                    # Circuit opened mid-call or the request failed (already logged)
+                    sass_quote = self.get_fallback_quote(mood_category)
+                    generation_method = 'fallback'
         else:
             sass_quote = self.get_fallback_quote(mood_category)
+            generation_method = 'fallback'
         
         result = {
             'sass_quote': sass_quote,
@@ -122,32 +249,61 @@ class SassQuoteGenerator:
             'mood_vibe': mood_vibe,
             'mood_emoji': sentiment_analysis['mood_emoji'],
             'sentiment_score': sentiment_score,
-            'generation_method': 'gpt' if use_gpt else 'fallback',
+            'generation_method': generation_method,
             'formatted_output': f"{sentiment_analysis['mood_emoji']} {sass_quote}"
         }
+        if deadline is not None:
+            result['degraded'] = degraded
+        if generation_method == 'fallback':
+            self.metrics.increment('sass_fallbacks')
         
         logger.info(f"Sass quote generated: {result['formatted_output']}")
         return result
     
-    def generate_multiple_quotes(self, sentiment_analysis: Dict[str, Any], count: int = 3) -> List[Dict[str, Any]]:
-        """Generate multiple sass quotes for variety"""
-        quotes = []
+    def _quote_result(self, sentiment_analysis: Dict[str, Any], sass_quote: str, generation_method: str) -> Dict[str, Any]:
+        """Wrap a quote in the same result shape generate_sass_quote returns"""
+        return {
+            'sass_quote': sass_quote,
+            'mood_category': sentiment_analysis['mood_category'],
+            'mood_vibe': sentiment_analysis['mood_vibe'],
+            'mood_emoji': sentiment_analysis['mood_emoji'],
+            'sentiment_score': sentiment_analysis['combined_score'],
+            'generation_method': generation_method,
+            'formatted_output': f"{sentiment_analysis['mood_emoji']} {sass_quote}"
+        }
+    
+    def generate_multiple_quotes(self, sentiment_analysis: Dict[str, Any], count: int = 3,
+                                 gpt_alternatives: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """Generate multiple sass quotes for variety
+        
+        With gpt_alternatives on (default: Config.GPT_MULTI_QUOTES) every quote comes from one
+        GPT request, deduplicated and padded with fallbacks if the reply falls short. A quote
+        from a fused sentiment call is kept first. Otherwise one GPT quote plus fallbacks.
+        """
+        if gpt_alternatives is None:
+            gpt_alternatives = Config.GPT_MULTI_QUOTES
         
-        # Generate one GPT quote
-        quotes.append(self.generate_sass_quote(sentiment_analysis, use_gpt=True))
+        if not gpt_alternatives:
+            quotes = [self.generate_sass_quote(sentiment_analysis, use_gpt=True)]
+        else:
+            mood_category = sentiment_analysis['mood_category']
+            quotes = []
+            fused_quote = sentiment_analysis.get('individual_scores', {}).get('gpt', {}).get('sass_quotes', {}).get(mood_category)
+            if fused_quote:
+                quotes.append(self._quote_result(sentiment_analysis, fused_quote, 'gpt_fused'))
+            
+            seen = {quote['sass_quote'].lower() for quote in quotes}
+            for gpt_quote in self.generate_gpt_sass_quotes(
+                mood_category, sentiment_analysis['mood_vibe'], sentiment_analysis['combined_score'], count
+            ):
+                if len(quotes) < count and gpt_quote.lower() not in seen:
+                    seen.add(gpt_quote.lower())
+                    quotes.append(self._quote_result(sentiment_analysis, gpt_quote, 'gpt'))
         
         # Add fallback quotes for variety
-        for _ in range(count - 1):
+        while len(quotes) < count:
             fallback_quote = self.get_fallback_quote(sentiment_analysis['mood_category'])
-            quotes.append({
-                'sass_quote': fallback_quote,
-                'mood_category': sentiment_analysis['mood_category'],
-                'mood_vibe': sentiment_analysis['mood_vibe'],
-                'mood_emoji': sentiment_analysis['mood_emoji'],
-                'sentiment_score': sentiment_analysis['combined_score'],
-                'generation_method': 'fallback',
-                'formatted_output': f"{sentiment_analysis['mood_emoji']} {fallback_quote}"
-            })
+            quotes.append(self._quote_result(sentiment_analysis, fallback_quote, 'fallback'))
         
         return quotes
 
@@ -1,25 +1,93 @@
-from textblob import TextBlob
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import openai
-from typing import Dict, Any
+import copy
+import json
+import re
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 from config import Config
+from utils.cache import CacheStore, LRUCache, get_default_cache, make_cache_key, normalize_cache_text
+from utils.helpers import clean_text
+from utils.gpt_client import GPTClient, get_default_client
+from utils.circuit_breaker import CircuitOpenError
+from utils.deadline import Deadline, DeadlineExceeded
+from utils.metrics import Metrics, get_default_metrics
+from utils.prompts import get_prompt, mood_lines
+from sentiment.dispatcher import MicroBatchDispatcher
+from sentiment.results import SentimentResult
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# GPT result used while the circuit breaker is open or the deadline ran out; _build_result treats it as skipped
+GPT_UNAVAILABLE_RESULT = {'score': 0.0, 'emotion': 'neutral', 'raw_response': '', 'unavailable': True}
+
+# Fields salvaged from a fused JSON reply that was cut off mid-object
+FUSED_SCORE_PATTERN = re.compile(r'"score"\s*:\s*(-?\d+(?:\.\d+)?)')
+FUSED_EMOTION_PATTERN = re.compile(r'"emotion"\s*:\s*"([^"]*)"')
+FUSED_QUOTE_PATTERN = re.compile(r'"(\w+)"\s*:\s*"([^"]+)"')
+
+# One line of a batched GPT reply, e.g. "3 | Score: -0.4 | Emotion: annoyed"
+BATCH_LINE_PATTERN = re.compile(
+    r'^\s*\[?(\d+)\]?[.):]?\s*\|\s*Score:\s*\[?(-?\d+(?:\.\d+)?)\]?\s*\|\s*Emotion:\s*(.+?)\s*$'
+)
+
 class SentimentAnalyzer:
-    def __init__(self):
-        self.vader_analyzer = SentimentIntensityAnalyzer()
-        openai.api_key = Config.OPENAI_API_KEY
+    def __init__(self, cache: Optional[CacheStore] = None, memo_size: Optional[int] = None,
+                 client: Optional[GPTClient] = None, dispatcher: Optional[MicroBatchDispatcher] = None,
+                 metrics: Optional[Metrics] = None):
+        # TextBlob, VADER and openai are imported on first use to keep startup fast
+        self._vader_analyzer = None
+        self._vader_batch_scorer = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Pooled OpenAI client, shared with SassQuoteGenerator unless one is injected
+        self.client = client or get_default_client()
+        
+        # Stage timings and counters (no-ops unless Config.METRICS_ENABLED)
+        self.metrics = metrics or get_default_metrics()
+        
+        # Persistent GPT score cache (shared on-disk store when enabled in Config)
+        if cache is None and Config.GPT_CACHE_ENABLED:
+            cache = get_default_cache()
+        self.cache = cache
+        
+        # In-process memo of full results keyed on clean_text output (0 disables it)
+        memo_size = Config.ANALYSIS_MEMO_SIZE if memo_size is None else memo_size
+        self.memo: Optional[LRUCache] = LRUCache(memo_size) if memo_size > 0 else None
+        
+        # Coalesces concurrent single-text GPT scoring into batched calls when enabled
+        if dispatcher is None and Config.GPT_MICROBATCH_ENABLED:
+            dispatcher = MicroBatchDispatcher(self)
+        self.dispatcher = dispatcher
+    
+    @property
+    def vader_analyzer(self):
+        """VADER analyzer, loading its lexicon on first use"""
+        if self._vader_analyzer is None:
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+            self._vader_analyzer = SentimentIntensityAnalyzer()
+        return self._vader_analyzer
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the thread pool used to overlap GPT calls with local scoring"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=Config.GPT_THREAD_WORKERS,
+                thread_name_prefix='sentiment-gpt'
+            )
+        return self._executor
         
     def analyze_textblob(self, text: str) -> Dict[str, float]:
         """Analyze sentiment using TextBlob"""
         try:
-            blob = TextBlob(text)
+            from textblob import TextBlob
+            with self.metrics.stage('textblob'):
+                blob = TextBlob(text)
+                sentiment = blob.sentiment
             return {
-                'polarity': blob.sentiment.polarity,  # -1 to 1
-                'subjectivity': blob.sentiment.subjectivity  # 0 to 1
+                'polarity': sentiment.polarity,  # -1 to 1
+                'subjectivity': sentiment.subjectivity  # 0 to 1
             }
         except Exception as e:
             logger.error(f"TextBlob analysis failed: {e}")
@@ -28,63 +96,288 @@ class SentimentAnalyzer:
     def analyze_vader(self, text: str) -> Dict[str, float]:
         """Analyze sentiment using VADER"""
         try:
-            scores = self.vader_analyzer.polarity_scores(text)
+            vader_analyzer = self.vader_analyzer
+            with self.metrics.stage('vader'):
+                scores = vader_analyzer.polarity_scores(text)
             return scores  # Returns: neg, neu, pos, compound
         except Exception as e:
             logger.error(f"VADER analysis failed: {e}")
             return {'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': 0.0}
     
-    def analyze_gpt(self, text: str) -> Dict[str, Any]:
+    def analyze_vader_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Analyze many texts with the vectorized VADER scorer (same output as analyze_vader)"""
+        try:
+            if self._vader_batch_scorer is None:
+                from sentiment.vader_batch import VaderBatchScorer
+                self._vader_batch_scorer = VaderBatchScorer(self.vader_analyzer)
+            return self._vader_batch_scorer.polarity_scores_batch(texts)
+        except Exception as e:
+            logger.error(f"Batch VADER analysis failed, scoring texts one by one: {e}")
+            return [self.analyze_vader(text) for text in texts]
+    
+    def analyze_local_batch(self, texts: List[str]) -> List[Tuple[Dict[str, float], Dict[str, float]]]:
+        """Run the local scorers over many texts, with VADER vectorized across the batch"""
+        vader_results = self.analyze_vader_batch(texts)
+        return [(self.analyze_textblob(text), vader_result) for text, vader_result in zip(texts, vader_results)]
+    
+    def _request_completion(self, prompt: str, max_tokens: int, temperature: float,
+                            deadline: Optional[Deadline] = None, stage: Optional[str] = None) -> str:
+        """Send a single-message chat completion and return the stripped reply"""
+        self.metrics.increment('gpt_calls')
+        with self.metrics.stage('gpt_request'):
+            return self.client.complete(prompt, max_tokens, temperature, deadline=deadline, stage=stage)
+    
+    async def _request_completion_async(self, prompt: str, max_tokens: int, temperature: float,
+                                        deadline: Optional[Deadline] = None, stage: Optional[str] = None) -> str:
+        """Async variant of _request_completion"""
+        self.metrics.increment('gpt_calls')
+        with self.metrics.stage('gpt_request'):
+            return await self.client.acomplete(prompt, max_tokens, temperature, deadline=deadline, stage=stage)
+    
+    def _parse_gpt_response(self, content: str) -> Dict[str, Any]:
+        """Parse a 'Score: / Emotion:' reply into a GPT result dict
+        
+        A reply without a usable score gives the unavailable result, so the text is scored
+        locally and the reply is neither cached nor memoized.
+        """
+        lines = content.split('\n')
+        score = 0.0
+        emotion = "neutral"
+        parsed = False
+        
+        for line in lines:
+            if line.startswith('Score:'):
+                try:
+                    score = float(line.split(':')[1].strip())
+                    parsed = True
+                except:
+                    pass
+            elif line.startswith('Emotion:'):
+                emotion = line.split(':')[1].strip()
+        
+        if not parsed:
+            self.metrics.increment('parse_failures')
+            logger.warning(f"Unparseable GPT reply: {content[:80]!r}")
+            return dict(GPT_UNAVAILABLE_RESULT, raw_response=content)
+        
+        return {
+            'score': max(-1, min(1, score)),  # Clamp between -1 and 1
+            'emotion': emotion,
+            'raw_response': content
+        }
+    
+    def _gpt_cache_key(self, text: str) -> str:
+        """Cache key for a GPT sentiment score (batched and single scores share it)"""
+        return make_cache_key('sentiment', normalize_cache_text(text), self.client.model, get_prompt('sentiment').version)
+    
+    def _cached_gpt_result(self, text: str) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return None
+        cached = self.cache.get(self._gpt_cache_key(text))
+        self.metrics.increment('cache_hits' if cached is not None else 'cache_misses')
+        return cached
+    
+    def _store_gpt_result(self, text: str, result: Dict[str, Any]) -> None:
+        """Cache a GPT score, unless it is a fallback"""
+        if self.cache is not None and not result.get('unavailable'):
+            self.cache.set(self._gpt_cache_key(text), result)
+    
+    def analyze_gpt(self, text: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Analyze sentiment using GPT with a simple prompt"""
+        cached = self._cached_gpt_result(text)
+        if cached is not None:
+            return cached
+        
         try:
-            prompt = f"""
-            Analyze the sentiment of this text on a scale from -1 to 1, where:
-            -1 = Very Negative
-            0 = Neutral  
-            1 = Very Positive
-            
-            Also provide a brief emotional context (1-3 words).
-            
-            Text: "{text}"
-            
-            Respond in this exact format:
-            Score: [number]
-            Emotion: [emotion words]
-            """
-            
-            response = openai.chat.completions.create(
-                model=Config.GPT_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=Config.GPT_MAX_TOKENS,
-                temperature=0.3  # Lower temp for more consistent scoring
+            prompt = get_prompt('sentiment')
+            content = self._request_completion(
+                prompt.render(text=text), prompt.budget(), prompt.temperature, deadline, stage=prompt.stage
             )
+            with self.metrics.stage('gpt_parse'):
+                result = self._parse_gpt_response(content)
+            self._store_gpt_result(text, result)
+            return result
             
-            content = response.choices[0].message.content.strip()
-            
-            # Parse the response
-            lines = content.split('\n')
-            score = 0.0
-            emotion = "neutral"
-            
-            for line in lines:
-                if line.startswith('Score:'):
-                    try:
-                        score = float(line.split(':')[1].strip())
-                    except:
-                        pass
-                elif line.startswith('Emotion:'):
-                    emotion = line.split(':')[1].strip()
-            
-            return {
-                'score': max(-1, min(1, score)),  # Clamp between -1 and 1
-                'emotion': emotion,
-                'raw_response': content
-            }
+        except (CircuitOpenError, DeadlineExceeded):
+            self.metrics.increment('gpt_fallbacks')
+            return dict(GPT_UNAVAILABLE_RESULT)
+        except Exception as e:
+            logger.error(f"GPT analysis failed: {e}")
+            self.metrics.increment('gpt_fallbacks')
+            return {'score': 0.0, 'emotion': 'neutral', 'raw_response': ''}
+    
+    async def analyze_gpt_async(self, text: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Async variant of analyze_gpt using the shared async client"""
+        cached = self._cached_gpt_result(text)
+        if cached is not None:
+            return cached
+        
+        try:
+            prompt = get_prompt('sentiment')
+            content = await self._request_completion_async(
+                prompt.render(text=text), prompt.budget(), prompt.temperature, deadline, stage=prompt.stage
+            )
+            with self.metrics.stage('gpt_parse'):
+                result = self._parse_gpt_response(content)
+            self._store_gpt_result(text, result)
+            return result
             
+        except (CircuitOpenError, DeadlineExceeded):
+            self.metrics.increment('gpt_fallbacks')
+            return dict(GPT_UNAVAILABLE_RESULT)
         except Exception as e:
             logger.error(f"GPT analysis failed: {e}")
+            self.metrics.increment('gpt_fallbacks')
             return {'score': 0.0, 'emotion': 'neutral', 'raw_response': ''}
     
+    def _parse_fused_response(self, content: str) -> Dict[str, Any]:
+        """Parse a fused JSON reply, falling back to the 'Score: / Emotion:' parser
+        
+        A reply cut off at the token budget is salvaged field by field and marked
+        'truncated' (its quote set may be incomplete), so it is not cached.
+        """
+        start, end = content.find('{'), content.rfind('}')
+        try:
+            data = json.loads(content[start:end + 1])
+            if 'score' not in data:
+                raise ValueError("no score")
+            score = float(data['score'])
+            quotes = data.get('quotes') if isinstance(data.get('quotes'), dict) else {}
+            truncated = False
+        except (ValueError, TypeError, AttributeError):
+            score_match = FUSED_SCORE_PATTERN.search(content)
+            if score_match is None:
+                result = self._parse_gpt_response(content)
+                result['sass_quotes'] = {}
+                return result
+            self.metrics.increment('parse_failures')
+            logger.warning("Fused GPT reply is not valid JSON (truncated?), salvaging the score")
+            score = float(score_match.group(1))
+            emotion_match = FUSED_EMOTION_PATTERN.search(content)
+            data = {'emotion': emotion_match.group(1) if emotion_match else None}
+            quotes = dict(FUSED_QUOTE_PATTERN.findall(content))
+            truncated = True
+        
+        result = {
+            'score': max(-1, min(1, score)),
+            'emotion': str(data.get('emotion') or 'neutral').strip(),
+            'raw_response': content,
+            'sass_quotes': {
+                mood: str(quote).strip().strip('"\'')
+                for mood, quote in quotes.items()
+                if mood in Config.MOOD_LABELS and str(quote).strip()
+            }
+        }
+        if truncated:
+            result['truncated'] = True
+        return result
+    
+    def analyze_gpt_fused(self, text: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """GPT sentiment plus ready-made sass quotes for every mood in a single request
+        
+        Returns the analyze_gpt fields plus 'sass_quotes' ({mood_category: quote}), which
+        SassQuoteGenerator uses instead of making its own GPT call.
+        """
+        prompt = get_prompt('sentiment_fused')
+        cache_key = make_cache_key('sentiment_fused', normalize_cache_text(text), self.client.model, prompt.version)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            self.metrics.increment('cache_hits' if cached is not None else 'cache_misses')
+            if cached is not None:
+                return cached
+        
+        try:
+            content = self._request_completion(
+                prompt.render(text=text, moods=mood_lines()), prompt.budget(), prompt.temperature, deadline,
+                stage=prompt.stage
+            )
+            with self.metrics.stage('gpt_parse'):
+                result = self._parse_fused_response(content)
+            if self.cache is not None and not (result.get('unavailable') or result.get('truncated')):
+                self.cache.set(cache_key, result)
+            return result
+            
+        except (CircuitOpenError, DeadlineExceeded):
+            self.metrics.increment('gpt_fallbacks')
+            return dict(GPT_UNAVAILABLE_RESULT, sass_quotes={})
+        except Exception as e:
+            logger.error(f"Fused GPT analysis failed: {e}")
+            self.metrics.increment('gpt_fallbacks')
+            return {'score': 0.0, 'emotion': 'neutral', 'raw_response': '', 'sass_quotes': {}}
+    
+    def _parse_gpt_batch_response(self, content: str, count: int) -> Optional[List[Dict[str, Any]]]:
+        """Parse a numbered batch reply, returning None if it doesn't cover every text exactly once"""
+        parsed = {}
+        for line in content.split('\n'):
+            match = BATCH_LINE_PATTERN.match(line)
+            if not match:
+                continue
+            index = int(match.group(1))
+            if index < 1 or index > count or index in parsed:
+                return None
+            parsed[index] = {
+                'score': max(-1, min(1, float(match.group(2)))),
+                'emotion': match.group(3).strip(),
+                'raw_response': line.strip()
+            }
+        
+        if len(parsed) != count:
+            return None
+        return [parsed[i] for i in range(1, count + 1)]
+    
+    def _analyze_gpt_batch_chunk(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score one chunk in a single request, splitting it in half when the reply is malformed"""
+        if len(texts) == 1:
+            return [self.analyze_gpt(texts[0])]
+        
+        numbered = "\n".join(f"{i}. {json.dumps(text, ensure_ascii=False)}" for i, text in enumerate(texts, 1))
+        prompt = get_prompt('sentiment_batch')
+        
+        try:
+            content = self._request_completion(
+                prompt.render(numbered=numbered), prompt.budget(len(texts)), prompt.temperature, stage=prompt.stage
+            )
+        except CircuitOpenError:
+            self.metrics.increment('gpt_fallbacks', len(texts))
+            return [dict(GPT_UNAVAILABLE_RESULT) for _ in texts]
+        except Exception as e:
+            logger.error(f"GPT batch analysis failed: {e}")
+            self.metrics.increment('gpt_fallbacks', len(texts))
+            return [{'score': 0.0, 'emotion': 'neutral', 'raw_response': ''} for _ in texts]
+        
+        with self.metrics.stage('gpt_parse'):
+            results = self._parse_gpt_batch_response(content, len(texts))
+        if results is not None:
+            for text, result in zip(texts, results):
+                self._store_gpt_result(text, result)
+            return results
+        
+        logger.warning(f"Malformed GPT batch reply for {len(texts)} texts, splitting batch")
+        self.metrics.increment('parse_failures')
+        middle = len(texts) // 2
+        return self._analyze_gpt_batch_chunk(texts[:middle]) + self._analyze_gpt_batch_chunk(texts[middle:])
+    
+    def analyze_gpt_batch(self, texts: List[str], batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Analyze many texts with GPT, packing up to batch_size texts into each request"""
+        batch_size = batch_size or Config.GPT_BATCH_SIZE
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        
+        # Only send cache misses to the API
+        pending = []
+        for i, text in enumerate(texts):
+            cached = self._cached_gpt_result(text)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+        
+        for start in range(0, len(pending), batch_size):
+            indices = pending[start:start + batch_size]
+            chunk_results = self._analyze_gpt_batch_chunk([texts[i] for i in indices])
+            for i, result in zip(indices, chunk_results):
+                results[i] = result
+        return results
+    
     def get_mood_category(self, combined_score: float) -> str:
         """Convert combined score to mood category"""
         if combined_score >= 0.5:
@@ -98,24 +391,77 @@ class SentimentAnalyzer:
         else:
             return 'neutral'
     
-    def analyze_comprehensive(self, text: str) -> Dict[str, Any]:
-        """Run all three sentiment analyses and combine results"""
-        logger.info(f"Analyzing text: {text[:50]}...")
+    def analyze_local(self, text: str) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Run the local TextBlob and VADER scorers"""
+        return self.analyze_textblob(text), self.analyze_vader(text)
+    
+    def _memo_lookup(self, text: str) -> Optional[Dict[str, Any]]:
+        """Return a private copy of a memoized result, re-labelled with the caller's original text"""
+        if self.memo is None:
+            return None
+        cached = self.memo.get(clean_text(text))
+        if cached is None:
+            return None
+        self.metrics.increment('memo_hits')
+        result = copy.deepcopy(cached)
+        result['text'] = text
+        return result
+    
+    def _memo_store(self, text: str, result: Dict[str, Any]) -> None:
+        """Memoize a result unless its GPT stage fell back to the neutral default or was unavailable"""
+        gpt = result['individual_scores']['gpt']
+        gpt_ok = not gpt.get('unavailable') and (result['gpt_skipped'] or gpt.get('raw_response'))
+        if self.memo is not None and gpt_ok:
+            # A copy, so callers mutating their result can't change what later hits return
+            self.memo.set(clean_text(text), copy.deepcopy(result))
+    
+    def memo_stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters of the result memo"""
+        if self.memo is None:
+            return {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'max_size': 0}
+        return self.memo.stats()
+    
+    def combine_scores(self, textblob_polarity: float, vader_compound: float,
+                       gpt_score: Optional[float] = None) -> float:
+        """Weighted average of the scorer outputs, reweighting the local scorers when GPT is missing"""
+        weights = Config.SCORE_WEIGHTS
+        if gpt_score is None:
+            local_weight = weights['textblob'] + weights['vader']
+            return (
+                textblob_polarity * weights['textblob'] +
+                vader_compound * weights['vader']
+            ) / local_weight
+        return (
+            textblob_polarity * weights['textblob'] +
+            vader_compound * weights['vader'] +
+            gpt_score * weights['gpt']
+        )
+    
+    def _build_result(self, text: str, textblob_result: Dict[str, float],
+                      vader_result: Dict[str, float], gpt_result: Optional[Dict[str, Any]],
+                      compact: bool = False, keep_raw: bool = True) -> Dict[str, Any]:
+        """Combine the individual scorer outputs into the final result dict
         
-        # Get all three analyses
-        textblob_result = self.analyze_textblob(text)
-        vader_result = self.analyze_vader(text)
-        gpt_result = self.analyze_gpt(text)
+        A gpt_result of None (or one returned while the GPT circuit is open) builds a
+        local-only result flagged with gpt_skipped. compact builds a SentimentResult
+        instead, without the raw GPT reply unless keep_raw.
+        """
+        gpt_skipped = gpt_result is None or gpt_result.get('unavailable', False)
+        if gpt_result is None:
+            gpt_result = {'score': 0.0, 'emotion': 'neutral', 'raw_response': ''}
         
         # Combine scores (weighted average)
-        combined_score = (
-            textblob_result['polarity'] * 0.3 +
-            vader_result['compound'] * 0.3 +
-            gpt_result['score'] * 0.4
+        combined_score = self.combine_scores(
+            textblob_result['polarity'],
+            vader_result['compound'],
+            None if gpt_skipped else gpt_result['score']
         )
         
         # Get mood category and labels
         mood_category = self.get_mood_category(combined_score)
+        if compact:
+            return SentimentResult(text, combined_score, mood_category, textblob_result, vader_result,
+                                   gpt_result, gpt_skipped, keep_raw=keep_raw)
         mood_info = Config.MOOD_LABELS[mood_category]
         
         result = {
@@ -129,11 +475,231 @@ class SentimentAnalyzer:
                 'vader': vader_result,
                 'gpt': gpt_result
             },
+            'gpt_skipped': gpt_skipped,
             'analysis_summary': f"{mood_info['emoji']} {mood_info['vibe']} (Score: {combined_score:.2f})"
         }
         
+        return result
+    
+    def can_skip_gpt(self, textblob_polarity: float, vader_compound: float) -> bool:
+        """Whether the local scores already pin down the mood category
+        
+        The GPT score is assumed to land within Config.GPT_CASCADE_MARGIN of the local
+        consensus. If the lowest and highest combined score it could then produce fall in
+        the same bucket, calling GPT cannot change get_mood_category and is skipped.
+        """
+        if abs(textblob_polarity - vader_compound) > Config.GPT_CASCADE_MAX_DISAGREEMENT:
+            return False
+        
+        weights = Config.SCORE_WEIGHTS
+        partial = textblob_polarity * weights['textblob'] + vader_compound * weights['vader']
+        consensus = partial / (weights['textblob'] + weights['vader'])
+        gpt_low = max(-1.0, consensus - Config.GPT_CASCADE_MARGIN)
+        gpt_high = min(1.0, consensus + Config.GPT_CASCADE_MARGIN)
+        
+        lowest = partial + gpt_low * weights['gpt']
+        highest = partial + gpt_high * weights['gpt']
+        return self.get_mood_category(lowest) == self.get_mood_category(highest)
+    
+    def _use_cascade(self, cascade: Optional[bool]) -> bool:
+        return Config.GPT_CASCADE_ENABLED if cascade is None else cascade
+    
+    def _score_gpt(self, text: str, fused: bool) -> Dict[str, Any]:
+        """Single-text GPT scoring, through the micro-batching dispatcher when there is one"""
+        if fused:
+            return self.analyze_gpt_fused(text)
+        if self.dispatcher is not None:
+            return self.dispatcher.score(text)
+        return self.analyze_gpt(text)
+    
+    def analyze_comprehensive(self, text: str, gpt_result: Optional[Dict[str, Any]] = None,
+                              cascade: Optional[bool] = None, fused: bool = False,
+                              deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Run all three sentiment analyses and combine results
+        
+        A precomputed gpt_result (e.g. from analyze_gpt_batch) skips the GPT call. With
+        cascade on (default: Config.GPT_CASCADE_ENABLED), GPT is also skipped when the
+        local scorers already decide the mood category; the result is marked gpt_skipped.
+        With fused on, the GPT call also returns the sass quotes (see analyze_gpt_fused).
+        A deadline (Deadline or seconds) bounds the whole analysis, see _analyze_with_deadline.
+        With metrics result timings on, the result carries a 'timings' block (ms per stage).
+        """
+        with self.metrics.trace('analyze') as trace:
+            result = self._analyze_comprehensive(text, gpt_result, cascade, fused, deadline)
+        return self.metrics.attach_timings(result, trace)
+    
+    def _analyze_comprehensive(self, text: str, gpt_result: Optional[Dict[str, Any]], cascade: Optional[bool],
+                               fused: bool, deadline: Optional[Deadline]) -> Dict[str, Any]:
+        if gpt_result is None:
+            memoized = self._memo_lookup(text)
+            if memoized is not None:
+                return memoized
+            if deadline is not None:
+                return self._analyze_with_deadline(text, Deadline.coerce(deadline), cascade, fused)
+        
+        logger.info(f"Analyzing text: {text[:50]}...")
+        
+        # Get all three analyses
+        textblob_result = self.analyze_textblob(text)
+        vader_result = self.analyze_vader(text)
+        if gpt_result is None and not (
+            self._use_cascade(cascade) and
+            self.can_skip_gpt(textblob_result['polarity'], vader_result['compound'])
+        ):
+            gpt_result = self._score_gpt(text, fused)
+        
+        result = self._build_result(text, textblob_result, vader_result, gpt_result)
         logger.info(f"Analysis complete: {result['analysis_summary']}")
+        self._memo_store(text, result)
         return result
+    
+    def _analyze_with_deadline(self, text: str, deadline: Deadline, cascade: Optional[bool],
+                               fused: bool) -> Dict[str, Any]:
+        """Overlap GPT with the local scorers and stop waiting on it when the deadline hits
+        
+        The GPT call gets the remaining budget (and is hedged by the client). If it can't
+        finish in time the result is local-only and lists 'gpt' under 'degraded'.
+        """
+        logger.info(f"Analyzing text ({deadline.budget:.2f}s deadline): {text[:50]}...")
+        analyze_gpt = self.analyze_gpt_fused if fused else self.analyze_gpt
+        
+        if self.dispatcher is not None and not fused:
+            submit_gpt = lambda: self.dispatcher.submit(text)
+        else:
+            # copy_context carries the caller's metrics trace into the worker thread
+            submit_gpt = lambda: self._get_executor().submit(contextvars.copy_context().run, analyze_gpt, text, deadline)
+        
+        gpt_future = None
+        if self._use_cascade(cascade):
+            textblob_result, vader_result = self.analyze_local(text)
+            if not self.can_skip_gpt(textblob_result['polarity'], vader_result['compound']):
+                gpt_future = submit_gpt()
+        else:
+            gpt_future = submit_gpt()
+            textblob_result, vader_result = self.analyze_local(text)
+        
+        gpt_result = None
+        degraded = []
+        if gpt_future is not None:
+            try:
+                gpt_result = gpt_future.result(timeout=deadline.remaining())
+            except FutureTimeoutError:
+                gpt_result = None
+            if gpt_result is None or gpt_result.get('unavailable'):
+                degraded.append('gpt')
+        
+        result = self._build_result(text, textblob_result, vader_result, gpt_result)
+        result['degraded'] = degraded
+        if degraded:
+            logger.warning(f"Deadline analysis degraded ({', '.join(degraded)}): {result['analysis_summary']}")
+        else:
+            logger.info(f"Analysis complete: {result['analysis_summary']}")
+            self._memo_store(text, result)
+        return result
+    
+    def analyze_local_only(self, text: str) -> Dict[str, Any]:
+        """Score with TextBlob and VADER only, reweighted to cover the missing GPT share"""
+        textblob_result, vader_result = self.analyze_local(text)
+        return self._build_result(text, textblob_result, vader_result, None)
+    
+    def analyze_batch(self, texts: List[str], gpt_batch_size: Optional[int] = None,
+                      cascade: Optional[bool] = None, compact: bool = False,
+                      keep_raw: bool = True) -> List[Dict[str, Any]]:
+        """Analyze many texts, sending only the ones the cascade can't decide to batched GPT scoring
+        
+        compact returns SentimentResult objects (see sentiment/results.py) instead of dicts.
+        """
+        local_results = self.analyze_local_batch(texts)
+        use_cascade = self._use_cascade(cascade)
+        
+        pending = [
+            i for i, (textblob_result, vader_result) in enumerate(local_results)
+            if not (use_cascade and self.can_skip_gpt(textblob_result['polarity'], vader_result['compound']))
+        ]
+        gpt_results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        for i, gpt_result in zip(pending, self.analyze_gpt_batch([texts[i] for i in pending], gpt_batch_size)):
+            gpt_results[i] = gpt_result
+        
+        logger.info(f"Batch of {len(texts)} texts: {len(texts) - len(pending)} decided locally")
+        return [
+            self._build_result(text, textblob_result, vader_result, gpt_result, compact, keep_raw)
+            for text, (textblob_result, vader_result), gpt_result in zip(texts, local_results, gpt_results)
+        ]
+    
+    def analyze_comprehensive_concurrent(self, text: str, cascade: Optional[bool] = None,
+                                         fused: bool = False) -> Dict[str, Any]:
+        """Run all three analyses, overlapping the GPT call with the local scorers
+        
+        With cascade on the local scorers run first so the GPT call can be skipped.
+        With fused on, the GPT call also returns the sass quotes (see analyze_gpt_fused).
+        """
+        with self.metrics.trace('analyze') as trace:
+            result = self._analyze_comprehensive_concurrent(text, cascade, fused)
+        return self.metrics.attach_timings(result, trace)
+    
+    def _analyze_comprehensive_concurrent(self, text: str, cascade: Optional[bool], fused: bool) -> Dict[str, Any]:
+        memoized = self._memo_lookup(text)
+        if memoized is not None:
+            return memoized
+        
+        logger.info(f"Analyzing text (concurrent): {text[:50]}...")
+        
+        if self._use_cascade(cascade):
+            textblob_result, vader_result = self.analyze_local(text)
+            if self.can_skip_gpt(textblob_result['polarity'], vader_result['compound']):
+                gpt_result = None
+            else:
+                gpt_result = self._score_gpt(text, fused)
+        else:
+            # Start the network-bound call first so the local scorers run while we wait on it
+            if self.dispatcher is not None and not fused:
+                gpt_future = self.dispatcher.submit(text)
+            else:
+                gpt_future = self._get_executor().submit(
+                    contextvars.copy_context().run, self.analyze_gpt_fused if fused else self.analyze_gpt, text
+                )
+            textblob_result, vader_result = self.analyze_local(text)
+            gpt_result = gpt_future.result()
+        
+        result = self._build_result(text, textblob_result, vader_result, gpt_result)
+        logger.info(f"Analysis complete: {result['analysis_summary']}")
+        self._memo_store(text, result)
+        return result
+    
+    async def analyze_comprehensive_async(self, text: str, cascade: Optional[bool] = None) -> Dict[str, Any]:
+        """Async variant of analyze_comprehensive with the GPT call overlapped"""
+        memoized = self._memo_lookup(text)
+        if memoized is not None:
+            return memoized
+        
+        logger.info(f"Analyzing text (async): {text[:50]}...")
+        import asyncio
+        loop = asyncio.get_running_loop()
+        
+        if self._use_cascade(cascade):
+            textblob_result, vader_result = await loop.run_in_executor(None, self.analyze_local, text)
+            if self.can_skip_gpt(textblob_result['polarity'], vader_result['compound']):
+                gpt_result = None
+            else:
+                gpt_result = await self.analyze_gpt_async(text)
+        else:
+            gpt_task = asyncio.ensure_future(self.analyze_gpt_async(text))
+            # Local scorers are CPU-bound, keep them off the event loop
+            local_future = loop.run_in_executor(None, self.analyze_local, text)
+            (textblob_result, vader_result), gpt_result = await asyncio.gather(local_future, gpt_task)
+        
+        result = self._build_result(text, textblob_result, vader_result, gpt_result)
+        logger.info(f"Analysis complete: {result['analysis_summary']}")
+        self._memo_store(text, result)
+        return result
+    
+    def close(self) -> None:
+        """Release the background thread pool and the micro-batching dispatcher"""
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
 # Convenience function for quick analysis
 def quick_analyze(text: str) -> Dict[str, Any]:
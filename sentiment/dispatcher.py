@@ -0,0 +1,121 @@
+"""
+Micro-batching dispatcher for GPT sentiment scoring
+Concurrent single-text requests are held for a few milliseconds, coalesced into
+one batched GPT scoring call, and each caller's future gets its own result back
+"""
+
+import time
+import queue
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class MicroBatchDispatcher:
+    """Coalesce concurrent analyze_gpt-style requests into analyze_gpt_batch calls"""
+
+    def __init__(self, analyzer, max_batch: Optional[int] = None, max_wait_ms: Optional[float] = None,
+                 max_concurrent_batches: Optional[int] = None):
+        self.analyzer = analyzer
+        self.max_batch = max_batch or Config.GPT_MICROBATCH_MAX_SIZE
+        self.max_wait = (Config.GPT_MICROBATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+        self.max_concurrent_batches = max_concurrent_batches or Config.GPT_MICROBATCH_CONCURRENCY
+
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._collector: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self) -> None:
+        if self._collector is None:
+            with self._lock:
+                if self._collector is None:
+                    # Batches are sent from a pool so collection continues while one is in flight
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrent_batches, thread_name_prefix='gpt-microbatch'
+                    )
+                    self._collector = threading.Thread(target=self._collect, name='gpt-microbatch-collector',
+                                                       daemon=True)
+                    self._collector.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for the next batch; the future resolves to its GPT result dict"""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def score(self, text: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Blocking submit(); same result shape as SentimentAnalyzer.analyze_gpt"""
+        return self.submit(text).result(timeout)
+
+    def _collect(self) -> None:
+        """Wait for a first request, then gather more until the batch is full or the window closes"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            window_ends = time.monotonic() + self.max_wait
+            stopping = False
+            while len(batch) < self.max_batch:
+                remaining = window_ends - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._executor.submit(self._dispatch, batch)
+            if stopping:
+                return
+
+    def _dispatch(self, batch: List[Tuple[str, Future]]) -> None:
+        """Score one batch (identical texts once) and resolve every future in it"""
+        futures = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not futures:
+            return
+        unique_texts = list(dict.fromkeys(text for text, _ in futures))
+        with self._lock:
+            self.batches += 1
+            self.items += len(futures)
+
+        try:
+            results = self.analyzer.analyze_gpt_batch(unique_texts, batch_size=len(unique_texts))
+        except Exception as e:
+            logger.error(f"Micro-batch of {len(unique_texts)} texts failed: {e}")
+            for _, future in futures:
+                future.set_exception(e)
+            return
+
+        by_text = dict(zip(unique_texts, results))
+        for text, future in futures:
+            future.set_result(dict(by_text[text]))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'items': self.items,
+                'avg_batch_size': self.items / self.batches if self.batches else 0.0,
+                'queued': self._queue.qsize()
+            }
+
+    def close(self) -> None:
+        """Flush queued requests and stop the collector"""
+        if self._collector is not None:
+            self._queue.put(None)
+            self._collector.join()
+            self._collector = None
+            self._executor.shutdown(wait=True)
+            self._executor = None
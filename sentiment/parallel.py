@@ -0,0 +1,113 @@
+"""
+Parallel batch engine for the local (TextBlob + VADER) scorers
+Spreads CPU-bound local scoring across a process pool
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import logging
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Per-worker analyzer, created once by the pool initializer
+_worker_analyzer = None
+
+def _init_worker() -> None:
+    """Build the VADER analyzer and warm up TextBlob once per worker process"""
+    global _worker_analyzer
+    from sentiment.analyzer import SentimentAnalyzer
+
+    _worker_analyzer = SentimentAnalyzer(memo_size=0)
+    _worker_analyzer.analyze_textblob("warm up")
+
+def _in_process_analyzer(analyzer=None):
+    """Analyzer for single-worker runs: the caller's, else this process's, built only once"""
+    if analyzer is not None:
+        return analyzer
+    if _worker_analyzer is None:
+        _init_worker()
+    return _worker_analyzer
+
+def _score_chunk(texts: List[str]) -> List[Tuple[Dict[str, float], Dict[str, float]]]:
+    """Score one chunk of texts inside a worker"""
+    return _worker_analyzer.analyze_local_batch(texts)
+
+def _summarize_chunk(texts: List[str], analyzer=None) -> Dict[str, Any]:
+    """Score one chunk inside a worker (or with analyzer) and return only its MoodAggregator state"""
+    from utils.mood_stats import MoodAggregator
+
+    analyzer = analyzer or _worker_analyzer
+    aggregator = MoodAggregator()
+    for text, (textblob_result, vader_result) in zip(texts, analyzer.analyze_local_batch(texts)):
+        aggregator.update(analyzer._build_result(text, textblob_result, vader_result, None, compact=True))
+    return aggregator.to_dict()
+
+def _chunked(texts: List[str], chunk_size: int) -> Iterator[List[str]]:
+    for start in range(0, len(texts), chunk_size):
+        yield texts[start:start + chunk_size]
+
+def score_local_parallel(texts: List[str], workers: Optional[int] = None,
+                         chunk_size: Optional[int] = None,
+                         analyzer=None) -> List[Tuple[Dict[str, float], Dict[str, float]]]:
+    """Run the TextBlob and VADER scorers over texts on a process pool
+
+    Returns (textblob_result, vader_result) pairs in input order. Texts are sent in
+    chunks of chunk_size to amortize inter-process overhead. With one worker the
+    texts are scored in this process, by analyzer when given.
+    """
+    workers = workers or Config.LOCAL_WORKERS or os.cpu_count() or 1
+    chunk_size = chunk_size or Config.LOCAL_CHUNK_SIZE
+
+    if workers == 1:
+        return _in_process_analyzer(analyzer).analyze_local_batch(texts)
+
+    logger.info(f"Scoring {len(texts)} texts locally on {workers} worker processes")
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        # Executor.map yields chunk results in submission order
+        for chunk_results in executor.map(_score_chunk, _chunked(texts, chunk_size)):
+            results.extend(chunk_results)
+    return results
+
+def analyze_local_parallel(texts: List[str], workers: Optional[int] = None,
+                           chunk_size: Optional[int] = None, analyzer=None,
+                           compact: bool = False) -> List[Dict[str, Any]]:
+    """Local-only analysis results (reweighted TextBlob + VADER) for texts, in input order
+    
+    compact returns SentimentResult objects instead of dicts.
+    """
+    analyzer = _in_process_analyzer(analyzer)
+    return [
+        analyzer._build_result(text, textblob_result, vader_result, None, compact)
+        for text, (textblob_result, vader_result) in zip(
+            texts, score_local_parallel(texts, workers, chunk_size, analyzer)
+        )
+    ]
+
+def summarize_local_parallel(texts: List[str], workers: Optional[int] = None,
+                             chunk_size: Optional[int] = None, analyzer=None):
+    """MoodAggregator over the local-only results of texts
+
+    Each worker summarizes its chunks and sends back the aggregator state, not the
+    results, so the parent only merges a few small dicts. With one worker the texts
+    are summarized in this process, by analyzer when given.
+    """
+    from utils.mood_stats import MoodAggregator
+
+    workers = workers or Config.LOCAL_WORKERS or os.cpu_count() or 1
+    chunk_size = chunk_size or Config.LOCAL_CHUNK_SIZE
+
+    aggregator = MoodAggregator()
+    if workers == 1:
+        analyzer = _in_process_analyzer(analyzer)
+        for chunk in _chunked(texts, chunk_size):
+            aggregator.merge(MoodAggregator.from_dict(_summarize_chunk(chunk, analyzer)))
+        return aggregator
+
+    logger.info(f"Summarizing {len(texts)} texts locally on {workers} worker processes")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        for state in executor.map(_summarize_chunk, _chunked(texts, chunk_size)):
+            aggregator.merge(MoodAggregator.from_dict(state))
+    return aggregator
@@ -0,0 +1,204 @@
+"""
+Compact result objects for large batches
+A dict-per-result layout (nested score dicts, a formatted summary, the raw GPT
+reply and sass fields copied again) costs a few KB per text. These slotted
+classes hold only the numbers and short strings: emoji, vibe, summary and the
+nested score dicts are rebuilt on access, and raw GPT replies can be dropped.
+
+They answer the same top-level lookups as the dicts (result['mood_category'],
+result.get('combined_score')), and to_dict() returns the exact dict shape for
+JSON and other consumers that need a real dict.
+"""
+
+import sys
+from typing import Any, Dict, Iterator, Optional, Tuple
+from config import Config
+
+class _DictView:
+    """Read-only dict-style access to the keys listed in _KEYS"""
+    __slots__ = ()
+    _KEYS: Tuple[str, ...] = ()
+    # Keys reported missing while their value is None
+    _OPTIONAL_KEYS: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None and key in self._OPTIONAL_KEYS:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._KEYS and not (key in self._OPTIONAL_KEYS and getattr(self, key) is None)
+
+    def keys(self) -> Iterator[str]:
+        return (key for key in self._KEYS if key in self)
+
+class SentimentResult(_DictView):
+    """One analyze_comprehensive result, same content as its dict form"""
+    __slots__ = ('text', '_score', 'mood_category', 'textblob_polarity', 'textblob_subjectivity',
+                 'vader_neg', 'vader_neu', 'vader_pos', 'vader_compound', 'gpt_score', 'gpt_emotion',
+                 'gpt_raw_response', 'gpt_sass_quotes', 'gpt_unavailable', 'gpt_skipped', 'degraded')
+    _KEYS = ('text', 'combined_score', 'mood_category', 'mood_emoji', 'mood_vibe', 'individual_scores',
+             'gpt_skipped', 'analysis_summary', 'degraded')
+    _OPTIONAL_KEYS = ('degraded',)
+
+    def __init__(self, text: str, combined_score: float, mood_category: str, textblob_result: Dict[str, float],
+                 vader_result: Dict[str, float], gpt_result: Dict[str, Any], gpt_skipped: bool,
+                 degraded: Optional[list] = None, keep_raw: bool = True):
+        self.text = text
+        # Unrounded, so analysis_summary formats exactly like the dict version
+        self._score = combined_score
+        self.mood_category = mood_category
+        self.textblob_polarity = textblob_result['polarity']
+        self.textblob_subjectivity = textblob_result['subjectivity']
+        self.vader_neg = vader_result['neg']
+        self.vader_neu = vader_result['neu']
+        self.vader_pos = vader_result['pos']
+        self.vader_compound = vader_result['compound']
+        self.gpt_score = gpt_result['score']
+        # Emotions repeat a lot across a batch; share one string per distinct value
+        self.gpt_emotion = sys.intern(gpt_result['emotion'])
+        self.gpt_raw_response = gpt_result.get('raw_response', '') if keep_raw else None
+        self.gpt_sass_quotes = gpt_result.get('sass_quotes') if keep_raw else None
+        self.gpt_unavailable = gpt_result.get('unavailable', False)
+        self.gpt_skipped = gpt_skipped
+        self.degraded = degraded
+
+    @classmethod
+    def from_dict(cls, result: Dict[str, Any], keep_raw: bool = True) -> 'SentimentResult':
+        """Compact an existing result dict (its summary is re-formatted from the rounded score)"""
+        scores = result['individual_scores']
+        return cls(result['text'], result['combined_score'], result['mood_category'], scores['textblob'],
+                   scores['vader'], scores['gpt'], result['gpt_skipped'], result.get('degraded'), keep_raw)
+
+    @property
+    def combined_score(self) -> float:
+        return round(self._score, 3)
+
+    @property
+    def mood_emoji(self) -> str:
+        return Config.MOOD_LABELS[self.mood_category]['emoji']
+
+    @property
+    def mood_vibe(self) -> str:
+        return Config.MOOD_LABELS[self.mood_category]['vibe']
+
+    @property
+    def analysis_summary(self) -> str:
+        return f"{self.mood_emoji} {self.mood_vibe} (Score: {self._score:.2f})"
+
+    @property
+    def individual_scores(self) -> Dict[str, Dict[str, Any]]:
+        gpt = {'score': self.gpt_score, 'emotion': self.gpt_emotion, 'raw_response': self.gpt_raw_response or ''}
+        if self.gpt_sass_quotes is not None:
+            gpt['sass_quotes'] = self.gpt_sass_quotes
+        if self.gpt_unavailable:
+            gpt['unavailable'] = True
+        return {
+            'textblob': {'polarity': self.textblob_polarity, 'subjectivity': self.textblob_subjectivity},
+            'vader': {'neg': self.vader_neg, 'neu': self.vader_neu, 'pos': self.vader_pos,
+                      'compound': self.vader_compound},
+            'gpt': gpt
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The dict analyze_comprehensive returns for this result"""
+        result = {
+            'text': self.text,
+            'combined_score': self.combined_score,
+            'mood_category': self.mood_category,
+            'mood_emoji': self.mood_emoji,
+            'mood_vibe': self.mood_vibe,
+            'individual_scores': self.individual_scores,
+            'gpt_skipped': self.gpt_skipped,
+            'analysis_summary': self.analysis_summary
+        }
+        if self.degraded is not None:
+            result['degraded'] = list(self.degraded)
+        return result
+
+    def __repr__(self) -> str:
+        return f"SentimentResult({self.text[:30]!r}, {self.combined_score}, {self.mood_category!r})"
+
+class SassResult(_DictView):
+    """One generate_sass_quote result, same content as its dict form"""
+    __slots__ = ('sass_quote', 'mood_category', 'sentiment_score', 'generation_method', 'degraded')
+    _KEYS = ('sass_quote', 'mood_category', 'mood_vibe', 'mood_emoji', 'sentiment_score', 'generation_method',
+             'formatted_output', 'degraded')
+    _OPTIONAL_KEYS = ('degraded',)
+
+    def __init__(self, sass_quote: str, mood_category: str, sentiment_score: float, generation_method: str,
+                 degraded: Optional[list] = None):
+        self.sass_quote = sass_quote
+        self.mood_category = mood_category
+        self.sentiment_score = sentiment_score
+        self.generation_method = sys.intern(generation_method)
+        self.degraded = degraded
+
+    @classmethod
+    def from_dict(cls, result: Dict[str, Any]) -> 'SassResult':
+        return cls(result['sass_quote'], result['mood_category'], result['sentiment_score'],
+                   result['generation_method'], result.get('degraded'))
+
+    @property
+    def mood_emoji(self) -> str:
+        return Config.MOOD_LABELS[self.mood_category]['emoji']
+
+    @property
+    def mood_vibe(self) -> str:
+        return Config.MOOD_LABELS[self.mood_category]['vibe']
+
+    @property
+    def formatted_output(self) -> str:
+        return f"{self.mood_emoji} {self.sass_quote}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The dict generate_sass_quote returns for this result"""
+        result = {
+            'sass_quote': self.sass_quote,
+            'mood_category': self.mood_category,
+            'mood_vibe': self.mood_vibe,
+            'mood_emoji': self.mood_emoji,
+            'sentiment_score': self.sentiment_score,
+            'generation_method': self.generation_method,
+            'formatted_output': self.formatted_output
+        }
+        if self.degraded is not None:
+            result['degraded'] = list(self.degraded)
+        return result
+
+class BatchRecord(_DictView):
+    """One batch_process_texts record: index, text, sentiment and sass quote (or error)"""
+    __slots__ = ('index', 'text', 'sentiment', 'sass_quote', 'error')
+    _KEYS = ('index', 'text', 'sentiment', 'sass_quote', 'error')
+    _OPTIONAL_KEYS = ('sentiment', 'sass_quote', 'error')
+
+    def __init__(self, index: int, text: str, sentiment: Optional[SentimentResult] = None,
+                 sass_quote: Optional[SassResult] = None, error: Optional[str] = None):
+        self.index = index
+        self.text = text
+        self.sentiment = sentiment
+        self.sass_quote = sass_quote
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.error is not None:
+            return {'index': self.index, 'text': self.text, 'error': self.error}
+        return {
+            'index': self.index,
+            'text': self.text,
+            'sentiment': self.sentiment.to_dict(),
+            'sass_quote': self.sass_quote.to_dict()
+        }
+
+def to_dict(result: Any) -> Any:
+    """Dict form of a compact result; dicts pass through unchanged"""
+    return result.to_dict() if hasattr(result, 'to_dict') else result
@@ -0,0 +1,288 @@
+"""
+Vectorized batch implementation of VADER's polarity_scores
+Tokens are mapped to integer ids once, and the lexicon, booster, negation and
+ALL-CAPS rules run as NumPy array operations over a whole padded batch
+"""
+
+import string
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Words whose special-case idioms ("the bomb", "yeah right", ...) are rare enough to
+# delegate the whole text to the reference implementation
+SPECIAL_CASE_TRIGGERS = {'shit', 'bomb', 'ass', 'badass', 'stop', 'right', 'death', 'die', 'heart'}
+
+# Multi-word boosters/dampeners, matched as token bigrams
+MULTIWORD_BOOSTERS = [('kind', 'of'), ('sort', 'of'), ('just', 'enough')]
+
+# Words the rules refer to directly
+RULE_WORDS = ['no', 'kind', 'of', 'but', 'least', 'at', 'very', 'never', 'so', 'this',
+              'without', 'doubt', 'or', 'nor', 'sort', 'just', 'enough']
+
+PAD_ID = 0  # Padding and unknown tokens
+NT_ID = 1  # Unknown tokens containing "n't" (negations)
+
+# Token separating texts when a whole slice is tokenized with one split()
+SENTINEL = '\x00'
+
+class VaderBatchScorer:
+    """Batch VADER scorer matching SentimentIntensityAnalyzer.polarity_scores
+
+    Texts containing special-case idioms are scored with the reference analyzer.
+    """
+
+    # Texts are scored in length-sorted slices of this size to limit padding
+    SLICE_SIZE = 4096
+
+    # Raw token -> packed features memo, cleared when it grows past this size
+    TOKEN_CACHE_SIZE = 500000
+
+    def __init__(self, reference=None):
+        from vaderSentiment import vaderSentiment as vader
+
+        self.vader = vader
+        self.reference = reference or vader.SentimentIntensityAnalyzer()
+        self._build_vocabulary()
+        self._token_codes: Dict[str, int] = {}
+
+        # Only single characters are replaced by the reference emoji loop
+        self._emoji_table = str.maketrans({
+            emoji: ' ' + description
+            for emoji, description in self.reference.emojis.items() if len(emoji) == 1
+        })
+
+    def _build_vocabulary(self) -> None:
+        """Assign integer ids to every token a rule can react to and build feature arrays"""
+        vader = self.vader
+        words = set(self.reference.lexicon) | set(vader.NEGATE) | set(RULE_WORDS)
+        words |= {word for word in vader.BOOSTER_DICT if ' ' not in word}
+
+        self.vocab = {word: i for i, word in enumerate(sorted(words), start=NT_ID + 1)}
+        size = len(self.vocab) + NT_ID + 1
+
+        self.lex_val = np.zeros(size)
+        self.in_lex = np.zeros(size, dtype=bool)
+        self.booster_val = np.zeros(size)
+        self.is_booster = np.zeros(size, dtype=bool)
+        self.is_negate = np.zeros(size, dtype=bool)
+        self.is_negate[NT_ID] = True
+
+        for word, i in self.vocab.items():
+            if word in self.reference.lexicon:
+                self.lex_val[i] = self.reference.lexicon[word]
+                self.in_lex[i] = True
+            if word in vader.BOOSTER_DICT:
+                self.booster_val[i] = vader.BOOSTER_DICT[word]
+                self.is_booster[i] = True
+            self.is_negate[i] = word in vader.NEGATE or "n't" in word
+
+        self.ids = {word: self.vocab[word] for word in RULE_WORDS}
+
+    def _token_code(self, token: str) -> int:
+        """Packed token features: vocabulary id, special-case trigger flag and ALL-CAPS flag"""
+        if token == SENTINEL:
+            return -1
+        # Reference tokenization strips punctuation unless that leaves two or fewer characters
+        stripped = token.strip(string.punctuation)
+        word = token if len(stripped) <= 2 else stripped
+        lowered = word.lower()
+        token_id = self.vocab.get(lowered, NT_ID if "n't" in lowered else PAD_ID)
+        trigger = lowered in SPECIAL_CASE_TRIGGERS
+        return token_id * 4 + trigger * 2 + word.isupper()
+
+    def polarity_scores_batch(self, texts: Sequence[str]) -> List[Dict[str, float]]:
+        """polarity_scores for every text, in input order"""
+        results: List[Optional[Dict[str, float]]] = [None] * len(texts)
+
+        # Sort by length so each slice pads to a similar token count
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        for start in range(0, len(order), self.SLICE_SIZE):
+            indices = order[start:start + self.SLICE_SIZE]
+            slice_texts = [texts[i] for i in indices]
+            if any(SENTINEL in text for text in slice_texts):
+                scores = [self.reference.polarity_scores(text) for text in slice_texts]
+            else:
+                scores = self._score_slice(slice_texts)
+            for index, score in zip(indices, scores):
+                results[index] = score
+        return results
+
+    def compound_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Compound scores for every text as a float array"""
+        return np.array([scores['compound'] for scores in self.polarity_scores_batch(texts)])
+
+    def _score_slice(self, texts: List[str]) -> List[Dict[str, float]]:
+        # Tokenize the whole slice with one split, texts separated by a sentinel token
+        joined = f" {SENTINEL} ".join(texts)
+        if not joined.isascii():
+            joined = joined.translate(self._emoji_table)
+        amplifier = np.array([self._punctuation_amplifier(text) for text in texts])
+
+        if len(self._token_codes) > self.TOKEN_CACHE_SIZE:
+            self._token_codes.clear()
+        cache_get = self._token_codes.get
+        codes = []
+        for token in joined.split():
+            code = cache_get(token)
+            if code is None:
+                code = self._token_codes[token] = self._token_code(token)
+            codes.append(code)
+        codes = np.array(codes, dtype=np.int64)
+
+        is_sentinel = codes < 0
+        boundaries = np.flatnonzero(is_sentinel)
+        lengths = np.diff(np.concatenate(([-1], boundaries, [len(codes)]))) - 1
+        codes = codes[~is_sentinel]
+
+        width = max(int(lengths.max()), 1)
+        pos = np.arange(width)[None, :]
+        valid = pos < lengths[:, None]
+        ids = np.full((len(texts), width), PAD_ID, dtype=np.int64)
+        ids[valid] = codes >> 2
+        upper = np.zeros((len(texts), width), dtype=bool)
+        upper[valid] = (codes & 1).astype(bool)
+        trigger = np.zeros((len(texts), width), dtype=bool)
+        trigger[valid] = (codes & 2).astype(bool)
+
+        caps = upper.sum(axis=1)
+        cap_diff = (lengths - caps > 0) & (lengths - caps < lengths)
+
+        sentiments = self._sentiments(ids, upper, valid, pos, cap_diff[:, None])
+        results = self._score_valence(sentiments, valid, lengths, amplifier)
+
+        # Special-case idioms are left to the reference implementation
+        for row in np.flatnonzero(trigger.any(axis=1)):
+            results[row] = self.reference.polarity_scores(texts[row])
+        return results
+
+    @staticmethod
+    def _shift(values: np.ndarray, k: int, fill) -> np.ndarray:
+        """values[:, i - k] at column i (fill where i < k); negative k looks ahead"""
+        out = np.full_like(values, fill)
+        if k > 0:
+            out[:, k:] = values[:, :-k]
+        else:
+            out[:, :k] = values[:, -k:]
+        return out
+
+    def _sentiments(self, ids, upper, valid, pos, cap_diff) -> np.ndarray:
+        """Per-token valences after the lexicon, negation, booster, caps and 'but' rules"""
+        vader = self.vader
+        w = self.ids
+        n_scalar, c_incr = vader.N_SCALAR, vader.C_INCR
+        prev = {k: self._shift(ids, k, PAD_ID) for k in (1, 2, 3)}
+        prev_upper = {k: self._shift(upper, k, False) for k in (1, 2, 3)}
+        nxt = self._shift(ids, -1, PAD_ID)
+        p1, p2, p3 = prev[1], prev[2], prev[3]
+
+        base = self.lex_val[ids]
+        scored = self.in_lex[ids] & valid
+        skipped = self.is_booster[ids] | ((ids == w['kind']) & (nxt == w['of']))
+
+        # "no" negates an adjacent lexicon item instead of scoring on its own
+        valence = np.where((ids == w['no']) & self.in_lex[nxt], 0.0, base)
+        no_before = (p1 == w['no']) | (p2 == w['no']) | ((p3 == w['no']) & ((p1 == w['or']) | (p1 == w['nor'])))
+        valence = np.where(no_before, base * n_scalar, valence)
+
+        # ALL-CAPS emphasis when only some words are capitalized
+        valence = np.where(upper & cap_diff, np.where(valence > 0, valence + c_incr, valence - c_incr), valence)
+
+        so_or_this = {k: (prev[k] == w['so']) | (prev[k] == w['this']) for k in (1, 2)}
+        for k, damp in ((1, 1.0), (2, 0.95), (3, 0.9)):
+            before = prev[k]
+            active = (pos >= k) & ~self.in_lex[before]
+
+            # Booster/dampener scalar from the k-th preceding word
+            booster = self.is_booster[before]
+            scalar = np.where(valence < 0, -self.booster_val[before], self.booster_val[before])
+            caps_boost = booster & prev_upper[k] & cap_diff
+            scalar = np.where(caps_boost, np.where(valence > 0, scalar + c_incr, scalar - c_incr), scalar)
+            scalar = np.where(booster, scalar * damp, 0.0)
+            updated = valence + scalar
+
+            # Negation of the k-th preceding word, with the 'never so' / 'without doubt' exceptions
+            negation = np.where(self.is_negate[before], n_scalar, 1.0)
+            if k == 2:
+                never_so = (p2 == w['never']) & so_or_this[1]
+                without_doubt = (p2 == w['without']) & (p1 == w['doubt'])
+                negation = np.where(never_so, 1.25, np.where(without_doubt, 1.0, negation))
+            elif k == 3:
+                never_so = ((p3 == w['never']) & so_or_this[2]) | so_or_this[1]
+                without_doubt = (p3 == w['without']) & ((p2 == w['doubt']) | (p1 == w['doubt']))
+                negation = np.where(never_so, 1.25, np.where(without_doubt, 1.0, negation))
+            updated = updated * negation
+
+            if k == 3:
+                # Multi-word dampeners such as 'kind of' two or three words back
+                for first, second in MULTIWORD_BOOSTERS:
+                    value = vader.BOOSTER_DICT[f"{first} {second}"]
+                    updated = updated + np.where((p2 == w[first]) & (p1 == w[second]), value, 0.0)
+                    updated = updated + np.where((p3 == w[first]) & (p2 == w[second]), value, 0.0)
+
+            valence = np.where(active, updated, valence)
+
+        # Negation through a preceding 'least' (but not 'at least' / 'very least')
+        least = (p1 == w['least']) & ~self.in_lex[p1]
+        least_negates = ((pos > 1) & least & (p2 != w['at']) & (p2 != w['very'])) | ((pos == 1) & least)
+        valence = np.where(least_negates, valence * n_scalar, valence)
+
+        sentiments = np.where(scored & ~skipped, valence, 0.0)
+
+        # Contrastive 'but' goes through the reference _but_check: it locates values with
+        # list.index(), so repeated valences are rescaled in an order worth matching exactly
+        is_but = (ids == w['but']) & valid
+        for row in np.flatnonzero(is_but.any(axis=1)):
+            length = int(valid[row].sum())
+            words = ['but' if flag else '' for flag in is_but[row, :length]]
+            sentiments[row, :length] = self.reference._but_check(words, sentiments[row, :length].tolist())
+        return sentiments
+
+    @staticmethod
+    def _punctuation_amplifier(text: str) -> float:
+        ep_count = min(text.count('!'), 4)
+        qm_count = text.count('?')
+        qm_amplifier = 0.0
+        if qm_count > 1:
+            qm_amplifier = qm_count * 0.18 if qm_count <= 3 else 0.96
+        return ep_count * 0.292 + qm_amplifier
+
+    @staticmethod
+    def _score_valence(sentiments, valid, lengths, amplifier) -> List[Dict[str, float]]:
+        """Compound normalization and pos/neg/neu proportions, as in score_valence"""
+        # Sequential (cumsum) sums reproduce the reference's left-to-right float additions,
+        # which matters when positive and negative valences nearly cancel out
+        total = np.cumsum(sentiments, axis=1)[:, -1]
+        total = np.where(total > 0, total + amplifier, np.where(total < 0, total - amplifier, total))
+        compound = np.clip(total / np.sqrt(total * total + 15), -1.0, 1.0)
+
+        pos_sum = np.cumsum(np.where(sentiments > 0, sentiments + 1, 0.0), axis=1)[:, -1]
+        neg_sum = np.cumsum(np.where(sentiments < 0, sentiments - 1, 0.0), axis=1)[:, -1]
+        neu_count = ((sentiments == 0) & valid).sum(axis=1)
+
+        pos_wins = pos_sum > np.abs(neg_sum)
+        neg_wins = pos_sum < np.abs(neg_sum)
+        pos_sum = np.where(pos_wins, pos_sum + amplifier, pos_sum)
+        neg_sum = np.where(neg_wins, neg_sum - amplifier, neg_sum)
+
+        denominator = pos_sum + np.abs(neg_sum) + neu_count
+        denominator = np.where(denominator == 0, 1.0, denominator)
+        pos = np.abs(pos_sum / denominator)
+        neg = np.abs(neg_sum / denominator)
+        neu = np.abs(neu_count / denominator)
+
+        results = []
+        for row, length in enumerate(lengths):
+            if length == 0:
+                results.append({'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0})
+                continue
+            results.append({
+                'neg': round(float(neg[row]), 3),
+                'neu': round(float(neu[row]), 3),
+                'pos': round(float(pos[row]), 3),
+                'compound': round(float(compound[row]), 4)
+            })
+        return results
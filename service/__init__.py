@@ -0,0 +1,13 @@
+# service/__init__.py
+"""
+HTTP Service Module
+Serves sentiment analysis and sass quotes over a standard-library asyncio HTTP server
+"""
+
+from .server import SentimentService, run_server
+
+__all__ = ['SentimentService', 'run_server']
+
+__version__ = '1.0.0'
+__author__ = 'Sentiment Bot Team'
+__description__ = 'Keep-alive HTTP endpoints for analysis, sass quotes and streaming batches'
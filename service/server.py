@@ -0,0 +1,486 @@
+"""
+Asyncio HTTP service
+Keeps one warm SentimentAnalyzer / SassQuoteGenerator pair and serves them over
+HTTP/1.1 keep-alive connections using only the standard library:
+
+    GET  /health   service, limiter and breaker stats
+    GET  /metrics  stage timings and counters (Prometheus text, ?format=json for JSON)
+    GET  /trend    sliding / tumbling mood windows over scored texts (?window=5m for one)
+    POST /analyze  {"text": ..., "use_gpt": true, "deadline": 2.5} -> sentiment result
+    POST /sass     same body (or {"sentiment": {...}}) -> sentiment + sass quote
+    POST /batch    NDJSON texts in, NDJSON records out (streamed, input order)
+"""
+
+import json
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+STATUS_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'
+}
+
+class HTTPError(Exception):
+    """Error response raised by request parsing and handlers"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+class StreamAborted(Exception):
+    """A streamed response was cut short; it has been terminated and the connection must close"""
+
+class Request:
+    """Parsed request line and headers; the body is read on demand"""
+
+    def __init__(self, method: str, target: str, version: str, headers: Dict[str, str],
+                 reader: asyncio.StreamReader):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        self.version = version
+        self.headers = headers
+        self.reader = reader
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+
+    @property
+    def chunked(self) -> bool:
+        return 'chunked' in self.headers.get('transfer-encoding', '').lower()
+
+    async def iter_body(self) -> AsyncIterator[bytes]:
+        """Yield the body as it arrives (Content-Length or chunked)"""
+        if self.chunked:
+            while True:
+                size_line = await self.reader.readline()
+                size = int(size_line.split(b';')[0].strip() or b'0', 16)
+                if size == 0:
+                    # Skip trailers up to the blank line
+                    while (await self.reader.readline()).strip():
+                        pass
+                    return
+                yield await self.reader.readexactly(size)
+                await self.reader.readexactly(2)
+        else:
+            remaining = int(self.headers.get('content-length', '0'))
+            while remaining > 0:
+                chunk = await self.reader.read(min(remaining, 65536))
+                if not chunk:
+                    raise HTTPError(400, "Request body ended early")
+                remaining -= len(chunk)
+                yield chunk
+
+    async def read_body(self, limit: int) -> bytes:
+        body = bytearray()
+        async for chunk in self.iter_body():
+            body.extend(chunk)
+            if len(body) > limit:
+                raise HTTPError(413, f"Request body larger than {limit} bytes")
+        return bytes(body)
+
+    async def discard_body(self, limit: int) -> bool:
+        """Read and drop up to limit body bytes, returning whether the whole body was consumed"""
+        discarded = 0
+        async for chunk in self.iter_body():
+            discarded += len(chunk)
+            if discarded > limit:
+                return False
+        return True
+
+    async def iter_lines(self, limit: int) -> AsyncIterator[bytes]:
+        """Yield body lines without buffering the whole body; lines over limit bytes are a 413"""
+        pending = b''
+        async for chunk in self.iter_body():
+            pending += chunk
+            *lines, pending = pending.split(b'\n')
+            for line in lines:
+                if len(line) > limit:
+                    raise HTTPError(413, f"Line longer than {limit} bytes")
+                yield line
+            if len(pending) > limit:
+                raise HTTPError(413, f"Line longer than {limit} bytes")
+        if pending:
+            yield pending
+
+    async def json(self, limit: int) -> Dict[str, Any]:
+        try:
+            payload = json.loads(await self.read_body(limit) or b'{}')
+        except json.JSONDecodeError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return payload
+
+def _parse_bool(value: Any, default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+def _parse_deadline(value: Any) -> Optional[float]:
+    if value is None:
+        return Config.REQUEST_DEADLINE_SECONDS
+    try:
+        return float(value) or None
+    except (TypeError, ValueError):
+        raise HTTPError(400, "deadline must be a number of seconds")
+
+class SentimentService:
+    """HTTP front end over warm analyzer and generator instances"""
+
+    def __init__(self, analyzer=None, generator=None, max_inflight: Optional[int] = None,
+                 max_queue: Optional[int] = None, batch_window: Optional[int] = None):
+        if analyzer is None:
+            from sentiment.analyzer import SentimentAnalyzer
+            analyzer = SentimentAnalyzer()
+        if generator is None:
+            from sass_quotes.sass_gen import SassQuoteGenerator
+            generator = SassQuoteGenerator(client=analyzer.client)
+        self.analyzer = analyzer
+        self.generator = generator
+        self.max_inflight = max_inflight or Config.SERVICE_MAX_INFLIGHT
+        self.max_queue = Config.SERVICE_MAX_QUEUE if max_queue is None else max_queue
+        self.batch_window = batch_window or Config.STREAM_WINDOW
+        # Mood time series over every text this service scores
+        from utils.mood_windows import MoodWindows
+        self.mood_windows = MoodWindows()
+
+        # Scoring is blocking (local scorers + sync GPT client), so it runs on a bounded pool
+        self._executor = ThreadPoolExecutor(max_workers=self.max_inflight, thread_name_prefix='sentiment-service')
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.active_requests = 0
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+
+    def warm_up(self) -> None:
+        """Load TextBlob and VADER before the first request"""
+        self.analyzer.analyze_local("warm up")
+
+    # Blocking work, run on the executor
+
+    def _analyze(self, text: str, use_gpt: bool, deadline: Optional[float], fused: bool = False) -> Dict[str, Any]:
+        if not use_gpt:
+            result = self.analyzer.analyze_local_only(text)
+        else:
+            result = self.analyzer.analyze_comprehensive(text, fused=fused, deadline=deadline)
+        self.mood_windows.add(result)
+        return result
+
+    def _analyze_and_sass(self, payload: Dict[str, Any], use_gpt: bool, deadline) -> Dict[str, Any]:
+        from utils.deadline import Deadline
+        deadline = Deadline.coerce(deadline)
+        sentiment = payload.get('sentiment') or self._analyze(
+            payload['text'], use_gpt, deadline, fused=Config.GPT_FUSED_MODE
+        )
+        return {
+            'sentiment': sentiment,
+            'sass_quote': self.generator.generate_sass_quote(sentiment, use_gpt=use_gpt, deadline=deadline)
+        }
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # Handlers
+
+    def _text_from(self, payload: Dict[str, Any]) -> str:
+        text = payload.get('text')
+        if not isinstance(text, str) or not text.strip():
+            raise HTTPError(400, "'text' must be a non-empty string")
+        return text
+
+    def _sentiment_from(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Client-supplied sentiment result for /sass, or None to score 'text' instead"""
+        sentiment = payload.get('sentiment')
+        if sentiment is None:
+            return None
+        if not isinstance(sentiment, dict):
+            raise HTTPError(400, "'sentiment' must be an object")
+        mood_category = sentiment.get('mood_category')
+        if mood_category not in Config.MOOD_LABELS:
+            raise HTTPError(400, f"'sentiment.mood_category' must be one of: {', '.join(Config.MOOD_LABELS)}")
+        score = sentiment.get('combined_score')
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            raise HTTPError(400, "'sentiment.combined_score' must be a number")
+        mood_info = Config.MOOD_LABELS[mood_category]
+        return {'mood_vibe': mood_info['vibe'], 'mood_emoji': mood_info['emoji'], **sentiment}
+
+    async def handle_analyze(self, request: Request) -> Dict[str, Any]:
+        payload = await request.json(Config.SERVICE_MAX_BODY_BYTES)
+        return await self._run(
+            self._analyze, self._text_from(payload),
+            _parse_bool(payload.get('use_gpt'), True), _parse_deadline(payload.get('deadline'))
+        )
+
+    async def handle_sass(self, request: Request) -> Dict[str, Any]:
+        payload = await request.json(Config.SERVICE_MAX_BODY_BYTES)
+        sentiment = self._sentiment_from(payload)
+        if sentiment is None:
+            self._text_from(payload)
+        else:
+            payload = dict(payload, sentiment=sentiment)
+        return await self._run(
+            self._analyze_and_sass, payload,
+            _parse_bool(payload.get('use_gpt'), True), _parse_deadline(payload.get('deadline'))
+        )
+
+    async def handle_health(self, request: Request) -> Dict[str, Any]:
+        client = self.analyzer.client
+        health = {'status': 'ok', 'service': self.stats()}
+        if client.rate_limiter is not None:
+            health['rate_limiter'] = client.rate_limiter.stats()
+        if client.circuit_breaker is not None:
+            health['circuit_breaker'] = client.circuit_breaker.stats()
+        health['token_usage'] = client.usage.stats()
+        return health
+
+    async def handle_metrics(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        metrics = self.analyzer.metrics
+        if request.query.get('format') == 'json':
+            await self._write_json(writer, 200, metrics.snapshot(), request.keep_alive)
+        else:
+            await self._write_body(writer, 200, 'text/plain; version=0.0.4',
+                                   metrics.render_prometheus().encode('utf-8'), request.keep_alive)
+
+    async def handle_trend(self, request: Request) -> Dict[str, Any]:
+        try:
+            return self.mood_windows.snapshot(request.query.get('window'))
+        except KeyError as e:
+            raise HTTPError(400, e.args[0])
+
+    async def stream_batch(self, request: Request, writer: asyncio.StreamWriter) -> None:
+        """Score NDJSON texts with at most batch_window in flight, streaming records in order"""
+        from utils.pipeline import process_one
+        use_gpt = _parse_bool(request.query.get('use_gpt'), True)
+        deadline = _parse_deadline(request.query.get('deadline'))
+
+        await self._start_chunked(writer, 200, 'application/x-ndjson', request.keep_alive)
+        in_flight = deque()
+        index = 0
+        try:
+            async for line in request.iter_lines(Config.SERVICE_MAX_BODY_BYTES):
+                line = line.strip()
+                if not line:
+                    continue
+                index += 1
+                try:
+                    item = json.loads(line)
+                    text = item.get('text') if isinstance(item, dict) else item
+                except json.JSONDecodeError:
+                    text = line.decode('utf-8', errors='replace')
+                if len(in_flight) >= self.batch_window:
+                    await self._write_record(writer, await in_flight.popleft())
+                if isinstance(text, str) and text.strip():
+                    in_flight.append(asyncio.ensure_future(self._run(
+                        process_one, self.analyzer, self.generator, index, text, use_gpt, deadline
+                    )))
+                else:
+                    # Same rule as /analyze; the error record keeps its place in the output order
+                    invalid = asyncio.get_running_loop().create_future()
+                    invalid.set_result({'index': index, 'error': "'text' must be a non-empty string"})
+                    in_flight.append(invalid)
+
+            while in_flight:
+                await self._write_record(writer, await in_flight.popleft())
+        except ConnectionError:
+            raise
+        except Exception as e:
+            # The 200 status line is already out, so report the error in the stream itself
+            for task in in_flight:
+                task.cancel()
+            self.errors += 1
+            message = e.message if isinstance(e, HTTPError) else str(e) or type(e).__name__
+            logger.error(f"Batch stream failed after {index} lines: {message}")
+            await self._write_chunk(writer, {'error': message})
+            await self._end_chunked(writer)
+            raise StreamAborted(message)
+        await self._end_chunked(writer)
+
+    # HTTP plumbing
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), Config.SERVICE_KEEPALIVE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+        if not request_line.strip():
+            return None
+        try:
+            method, target, version = request_line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line.strip():
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+            if len(headers) > 100:
+                raise HTTPError(400, "Too many headers")
+        return Request(method, target, version, headers, reader)
+
+    async def _write_json(self, writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any],
+                          keep_alive: bool, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        await self._write_body(writer, status, 'application/json', body, keep_alive, headers)
+
+    async def _write_body(self, writer: asyncio.StreamWriter, status: int, content_type: str, body: bytes,
+                          keep_alive: bool, headers: Optional[Dict[str, str]] = None) -> None:
+        lines = [
+            f"HTTP/1.1 {status} {STATUS_REASONS.get(status, 'Unknown')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def _start_chunked(self, writer: asyncio.StreamWriter, status: int, content_type: str,
+                             keep_alive: bool) -> None:
+        writer.write((
+            f"HTTP/1.1 {status} {STATUS_REASONS.get(status, 'Unknown')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode('latin-1'))
+        await writer.drain()
+
+    async def _end_chunked(self, writer: asyncio.StreamWriter) -> None:
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    async def _write_chunk(self, writer: asyncio.StreamWriter, record: Dict[str, Any]) -> None:
+        data = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        writer.write(f"{len(data):x}\r\n".encode('latin-1') + data + b'\r\n')
+        await writer.drain()
+
+    async def _write_record(self, writer: asyncio.StreamWriter, record: Dict[str, Any]) -> None:
+        self.mood_windows.add(record)
+        await self._write_chunk(writer, record)
+
+    def _route(self, request: Request) -> Tuple[Any, bool]:
+        """Handler for a request and whether it streams its own response"""
+        routes = {
+            ('GET', '/health'): (self.handle_health, False),
+            ('GET', '/metrics'): (self.handle_metrics, True),
+            ('GET', '/trend'): (self.handle_trend, False),
+            ('POST', '/analyze'): (self.handle_analyze, False),
+            ('POST', '/sass'): (self.handle_sass, False),
+            ('POST', '/batch'): (self.stream_batch, True)
+        }
+        if (request.method, request.path) in routes:
+            return routes[(request.method, request.path)]
+        if any(path == request.path for _, path in routes):
+            raise HTTPError(405, f"{request.method} not allowed on {request.path}")
+        raise HTTPError(404, f"No route for {request.path}")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection until either side closes it"""
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    keep_alive = request.keep_alive
+                    self.requests += 1
+                    handler, streams = self._route(request)
+
+                    # Bounded queue: shed load instead of letting latency grow without limit
+                    if self.active_requests >= self.max_inflight + self.max_queue:
+                        self.rejected += 1
+                        # Drop the body without buffering it; past the size limit, close instead
+                        keep_alive = keep_alive and await request.discard_body(Config.SERVICE_MAX_BODY_BYTES)
+                        await self._write_json(writer, 503, {'error': 'Server busy, retry shortly'},
+                                               keep_alive, {'Retry-After': '1'})
+                        if not keep_alive:
+                            break
+                        continue
+
+                    self.active_requests += 1
+                    try:
+                        if streams:
+                            await handler(request, writer)
+                        else:
+                            await self._write_json(writer, 200, await handler(request), keep_alive)
+                    finally:
+                        self.active_requests -= 1
+                except HTTPError as e:
+                    keep_alive = False
+                    await self._write_json(writer, e.status, {'error': e.message}, keep_alive)
+                except (ConnectionError, asyncio.IncompleteReadError, StreamAborted):
+                    break
+                except Exception as e:
+                    self.errors += 1
+                    logger.error(f"Service request failed: {e}")
+                    keep_alive = False
+                    await self._write_json(writer, 500, {'error': str(e)}, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def start(self, host: Optional[str] = None, port: Optional[int] = None) -> asyncio.AbstractServer:
+        """Start listening (port 0 picks a free port, see .port)"""
+        self._server = await asyncio.start_server(
+            self.handle_connection, host or Config.SERVICE_HOST,
+            Config.SERVICE_PORT if port is None else port
+        )
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'active_requests': self.active_requests,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'max_inflight': self.max_inflight,
+            'max_queue': self.max_queue
+        }
+
+def run_server(host: Optional[str] = None, port: Optional[int] = None) -> None:
+    """Warm up a service and serve until interrupted"""
+    async def serve():
+        service = SentimentService()
+        service.warm_up()
+        server = await service.start(host, port)
+        logger.info(f"Sentiment service listening on http://{host or Config.SERVICE_HOST}:{service.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await service.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        logger.info("Sentiment service stopped")
@@ -0,0 +1,28 @@
+# tests/fakes.py
+"""
+Test doubles shared by several test modules
+"""
+
+class FakeClient:
+    """Stands in for GPTClient, replaying one canned reply"""
+    model = 'fake-model'
+    
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+    
+    def complete(self, prompt, max_tokens, temperature, timeout=None, deadline=None, stage=None):
+        self.calls.append(prompt)
+        return self.reply
+    
+    def available(self):
+        return True
+
+class FakeClock:
+    """Manually advanced stand-in for time.monotonic"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
@@ -0,0 +1,65 @@
+# tests/test_benchmarks.py
+import pytest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.run_benchmarks import make_texts, summarize, compare_results
+from benchmarks.fake_openai import FakeOpenAIServer, lognormal_latency
+
+def report(throughput, p95, memory):
+    return {'results': [{'name': 'vader/size=10/c=1', 'throughput': throughput,
+                         'p95_ms': p95, 'peak_memory_kb': memory}]}
+
+class TestBenchmarkSuite:
+    def test_texts_are_seeded_and_sized(self):
+        """Inputs are reproducible and have the requested word count"""
+        texts = make_texts(5, 40, seed=1)
+        
+        assert texts == make_texts(5, 40, seed=1)
+        assert all(len(text.split()) == 40 for text in texts)
+    
+    def test_summary_percentiles(self):
+        """Percentiles are reported in milliseconds, throughput in items per second"""
+        summary = summarize([i / 1000 for i in range(1, 101)], items=100, elapsed=2.0)
+        
+        assert summary['throughput'] == 50.0
+        assert summary['p50_ms'] == 51.0 and summary['p99_ms'] == 100.0
+    
+    def test_baseline_comparison(self):
+        """Only changes beyond the tolerance count as regressions"""
+        baseline = report(1000, 1.0, 100)
+        
+        assert compare_results(report(900, 1.1, 110), baseline, tolerance=0.25) == []
+        regressions = compare_results(report(500, 2.0, 300), baseline, tolerance=0.25)
+        assert len(regressions) == 3
+        assert compare_results({'results': [{'name': 'new', 'throughput': 1}]}, baseline) == []
+
+class TestFakeServerFaults:
+    def test_latency_distribution_is_seeded(self):
+        """The lognormal latency repeats for the same seed and centres on the median"""
+        first, second = lognormal_latency(0.1, 0.5, seed=3), lognormal_latency(0.1, 0.5, seed=3)
+        samples = [first(i) for i in range(200)]
+        
+        assert samples == [second(i) for i in range(200)]
+        assert 0.08 < sorted(samples)[100] < 0.12
+    
+    def test_error_rate(self):
+        """Roughly error_rate of the requests are answered with a 500"""
+        import urllib.request
+        import urllib.error
+        
+        statuses = []
+        with FakeOpenAIServer(latency=0, error_rate=0.5, seed=1) as server:
+            for _ in range(40):
+                request = urllib.request.Request(f"{server.base_url}/chat/completions",
+                                                 data=b'{"messages": [{"role": "user", "content": "hi"}]}',
+                                                 headers={'Content-Type': 'application/json'})
+                try:
+                    statuses.append(urllib.request.urlopen(request, timeout=5).status)
+                except urllib.error.HTTPError as e:
+                    statuses.append(e.code)
+            stats = server.stats()
+        
+        assert stats['server_errors'] == statuses.count(500)
+        assert 10 <= statuses.count(500) <= 30
@@ -0,0 +1,114 @@
+# tests/test_cache.py
+import pytest
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cache import CacheStore, SQLiteCache, make_cache_key, normalize_cache_text
+from sentiment.analyzer import SentimentAnalyzer
+from sass_quotes.sass_gen import SassQuoteGenerator
+
+class TestSQLiteCache:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return SQLiteCache(str(tmp_path / 'cache.sqlite3'), ttl_seconds=60, max_entries=10)
+    
+    def test_roundtrip(self, cache):
+        """Stored values come back unchanged"""
+        cache.set('k', {'score': 0.5, 'emotion': 'happy'})
+        assert cache.get('k') == {'score': 0.5, 'emotion': 'happy'}
+        assert cache.get('missing') is None
+    
+    def test_ttl_expiry(self, tmp_path):
+        """Entries older than the TTL are treated as misses"""
+        cache = SQLiteCache(str(tmp_path / 'ttl.sqlite3'), ttl_seconds=0.05)
+        cache.set('k', 'v')
+        time.sleep(0.1)
+        assert cache.get('k') is None
+    
+    def test_size_bounded_eviction(self, cache):
+        """Least recently used entries are evicted above max_entries"""
+        for i in range(15):
+            cache.set(f'k{i}', i)
+        cache.get('k0')  # Touch so it survives eviction
+        cache.evict()
+        
+        assert len(cache) == 10
+        assert cache.get('k0') == 0
+        assert cache.get('k1') is None
+    
+    def test_shared_between_instances(self, tmp_path):
+        """Two stores on the same file see each other's writes"""
+        path = str(tmp_path / 'shared.sqlite3')
+        SQLiteCache(path).set('k', 'v')
+        assert SQLiteCache(path).get('k') == 'v'
+    
+    def test_key_normalization(self):
+        """Whitespace-only differences map to the same key"""
+        key_a = make_cache_key('sentiment', normalize_cache_text("great  day \n"), 'model', 'v1')
+        key_b = make_cache_key('sentiment', normalize_cache_text("great day"), 'model', 'v1')
+        assert key_a == key_b
+        assert key_a != make_cache_key('sentiment', 'great day', 'model', 'v2')
+    
+    def test_incomplete_store_cannot_be_created(self):
+        """CacheStore subclasses must implement get, set and clear"""
+        class GetOnlyCache(CacheStore):
+            def get(self, key):
+                return None
+        
+        with pytest.raises(TypeError):
+            GetOnlyCache()
+
+class TestGPTCaching:
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return SQLiteCache(str(tmp_path / 'gpt.sqlite3'))
+    
+    def test_analyze_gpt_uses_cache(self, cache, monkeypatch):
+        """Repeated texts are answered from the cache"""
+        analyzer = SentimentAnalyzer(cache=cache)
+        calls = []
+        
+        def fake_completion(prompt, max_tokens, temperature, deadline=None, stage=None):
+            calls.append(prompt)
+            return "Score: 0.7\nEmotion: excited"
+        
+        monkeypatch.setattr(analyzer, '_request_completion', fake_completion)
+        first = analyzer.analyze_gpt("Best day ever!")
+        second = analyzer.analyze_gpt("Best  day ever!")
+        
+        assert len(calls) == 1
+        assert first == second
+        assert second['score'] == 0.7
+    
+    def test_failures_are_not_cached(self, cache, monkeypatch):
+        """Fallback results from a failed call are not stored"""
+        analyzer = SentimentAnalyzer(cache=cache)
+        
+        def failing_completion(prompt, max_tokens, temperature, deadline=None, stage=None):
+            raise RuntimeError("API down")
+        
+        monkeypatch.setattr(analyzer, '_request_completion', failing_completion)
+        analyzer.analyze_gpt("Best day ever!")
+        assert len(cache) == 0
+    
+    def test_unparseable_replies_are_not_cached(self, cache, monkeypatch):
+        """A reply without a score falls back to local scoring and is neither cached nor memoized"""
+        analyzer = SentimentAnalyzer(cache=cache, memo_size=10)
+        monkeypatch.setattr(analyzer, '_request_completion',
+                            lambda prompt, max_tokens, temperature, deadline=None, stage=None: "I'd rather not say")
+        
+        assert analyzer.analyze_gpt("Best day ever!")['unavailable']
+        result = analyzer.analyze_comprehensive("Best day ever!", cascade=False)
+        assert result['gpt_skipped']
+        assert result['combined_score'] > 0
+        assert len(cache) == 0
+        assert analyzer.memo_stats()['size'] == 0
+    
+    def test_sass_quote_cached_per_mood_and_score(self, cache):
+        """Cached sass quotes are reused for the same mood and score"""
+        generator = SassQuoteGenerator(cache=cache)
+        cache.set(generator._quote_cache_key('positive', 0.3), "Cached sass ✨")
+        
+        assert generator.generate_gpt_sass_quote('positive', 'Good Vibes', 0.3) == "Cached sass ✨"
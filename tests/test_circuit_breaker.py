@@ -0,0 +1,141 @@
+# tests/test_circuit_breaker.py
+import pytest
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from utils.gpt_client import GPTClient
+from utils.rate_limiter import AdaptiveRateLimiter
+from sentiment.analyzer import SentimentAnalyzer
+from sass_quotes.sass_gen import SassQuoteGenerator
+from benchmarks.fake_openai import FakeOpenAIServer
+from tests.fakes import FakeClock
+
+class BackendDown(Exception):
+    pass
+
+def fail():
+    raise BackendDown("503")
+
+class TestCircuitBreaker:
+    @pytest.fixture
+    def breaker(self):
+        return CircuitBreaker(failure_threshold=3, latency_threshold=1.0, reset_timeout=10.0, clock=FakeClock())
+    
+    def test_opens_after_consecutive_failures(self, breaker):
+        for _ in range(3):
+            with pytest.raises(BackendDown):
+                breaker.call(fail)
+        
+        assert breaker.state == 'open'
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: 'never called')
+        assert breaker.stats()['short_circuited'] == 1
+    
+    def test_half_open_probe_closes_on_recovery(self, breaker):
+        for _ in range(3):
+            with pytest.raises(BackendDown):
+                breaker.call(fail)
+        
+        breaker._clock.now = 10.0
+        assert breaker.is_open() is False
+        assert breaker.call(lambda: 'ok') == 'ok'
+        assert breaker.state == 'closed'
+    
+    def test_failed_probe_reopens(self, breaker):
+        for _ in range(3):
+            with pytest.raises(BackendDown):
+                breaker.call(fail)
+        
+        breaker._clock.now = 10.0
+        with pytest.raises(BackendDown):
+            breaker.call(fail)
+        assert breaker.state == 'open'
+        assert breaker.is_open() is True
+    
+    def test_late_failures_do_not_extend_open_period(self, breaker):
+        for _ in range(3):
+            with pytest.raises(BackendDown):
+                breaker.call(fail)
+        
+        breaker._clock.now = 6.0
+        breaker.record_failure()
+        breaker.record_failure()
+        
+        assert breaker.stats()['opens'] == 1
+        breaker._clock.now = 10.0
+        assert breaker.is_open() is False
+    
+    def test_latency_breach_counts_as_failure(self, breaker):
+        breaker.record_success(latency=5.0)
+        breaker.record_success(latency=5.0)
+        breaker.record_success(latency=5.0)
+        
+        assert breaker.state == 'open'
+    
+    def test_client_errors_do_not_trip(self, breaker):
+        class BadRequest(Exception):
+            status_code = 400
+        
+        def bad_request():
+            raise BadRequest()
+        
+        for _ in range(5):
+            with pytest.raises(BadRequest):
+                breaker.call(bad_request)
+        assert breaker.state == 'closed'
+
+class TestCircuitFastFail:
+    def test_breaker_judges_each_retry_attempt(self):
+        """Failed attempts inside one retry loop open the circuit and stop the retries"""
+        with FakeOpenAIServer(error_rate=1.0) as server:
+            breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30.0)
+            client = GPTClient(api_key='test-key', base_url=server.base_url, circuit_breaker=breaker,
+                               rate_limiter=AdaptiveRateLimiter(max_attempts=10, base_delay=0.01))
+            
+            with pytest.raises(CircuitOpenError):
+                client.complete('Score: Text: "down"', 20, 0.3)
+            with pytest.raises(CircuitOpenError):
+                client.complete('Score: Text: "still down"', 20, 0.3)
+            client.close()
+        
+        assert server.stats()['requests'] == 3
+        assert breaker.state == 'open'
+        assert client.rate_limiter.stats()['attempts'] == 4
+    
+    def test_outage_falls_back_to_local_scores(self):
+        """Once slow calls open the circuit, analysis skips GPT instead of waiting on it"""
+        with FakeOpenAIServer(latency=0.3) as server:
+            breaker = CircuitBreaker(failure_threshold=2, latency_threshold=0.1, reset_timeout=0.5)
+            client = GPTClient(api_key='test-key', base_url=server.base_url, circuit_breaker=breaker,
+                               rate_limiter=AdaptiveRateLimiter(max_attempts=1))
+            analyzer = SentimentAnalyzer(client=client)
+            generator = SassQuoteGenerator(client=client)
+            analyzer.analyze_local("warm up")
+            
+            analyzer.analyze_gpt("first slow call")
+            analyzer.analyze_gpt("second slow call")
+            assert breaker.state == 'open'
+            
+            start = time.perf_counter()
+            result = analyzer.analyze_comprehensive("The API is down but I'm fine", cascade=False)
+            sass = generator.generate_sass_quote(result)
+            elapsed = time.perf_counter() - start
+            
+            assert elapsed < 0.3
+            assert result['gpt_skipped'] is True
+            assert result['combined_score'] == round(analyzer.combine_scores(
+                result['individual_scores']['textblob']['polarity'],
+                result['individual_scores']['vader']['compound']
+            ), 3)
+            assert sass['generation_method'] == 'fallback'
+            assert server.stats()['requests'] == 2
+            
+            # Backend recovers: the half-open probe closes the circuit again
+            server.latency = 0.0
+            time.sleep(0.5)
+            assert analyzer.analyze_gpt("probe")['raw_response']
+            assert breaker.state == 'closed'
+            client.close()
@@ -0,0 +1,94 @@
+# tests/test_columnar.py
+import pytest
+import sys
+import os
+import math
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from utils.columnar import ColumnarResultWriter, ColumnarResults, write_columnar
+from utils.helpers import batch_process_texts, create_mood_summary, export_to_columnar
+from utils.pipeline import run_batch_pipeline
+
+TEXTS = ["I love this so much! 🔥", "I hate everything", "Today was okay, nothing special happened.",
+         "Best. Day. Ever.", "Ugh, café closed again"]
+
+class TestColumnarStore:
+    @pytest.fixture
+    def results(self):
+        results = batch_process_texts(TEXTS, use_gpt=False, workers=1)
+        results.append({'index': len(results) + 1, 'text': "broken", 'error': "boom"})
+        return results
+    
+    def test_round_trip(self, results, tmp_path):
+        """Rows read back with the scores, moods and strings that were written"""
+        store = ColumnarResults(write_columnar(results, str(tmp_path / 'run.moodcol')))
+        
+        assert len(store) == len(results)
+        for i, result in enumerate(results[:-1]):
+            row = store.row(i)
+            assert row['text'] == result['text']
+            assert row['mood_category'] == result['sentiment']['mood_category']
+            assert row['sentiment_score'] == pytest.approx(result['sentiment']['combined_score'], abs=1e-6)
+            assert row['sass_quote'] == result['sass_quote']['sass_quote']
+            assert row['gpt_score'] is None
+            assert row['vader_compound'] == result['sentiment']['individual_scores']['vader']['compound']
+            assert row['textblob_polarity'] == pytest.approx(
+                result['sentiment']['individual_scores']['textblob']['polarity'], rel=1e-6)
+        assert store.row(len(results) - 1) == {'index': len(results), 'text': "broken", 'error': "boom"}
+        assert math.isnan(store.column('combined_score')[-1])
+        with pytest.raises(IndexError):
+            store.row(len(results))
+    
+    def test_aggregations_match_summary(self, results, tmp_path):
+        """Mood distribution, mean score and histogram come from the numeric columns alone"""
+        path = export_to_columnar(results, str(tmp_path / 'run.moodcol'))
+        store = ColumnarResults(path, chunk_rows=2)
+        
+        assert store.summary() == create_mood_summary(results)
+        counts, edges = store.score_histogram(bins=4)
+        assert counts.sum() == len(TEXTS)
+        assert len(edges) == 5
+        assert store.mood_counts()[-1] == 1
+        assert isinstance(store.column('mood'), np.memmap)
+    
+    def test_chunked_writes(self, tmp_path):
+        """Flushing every few rows keeps offsets contiguous across chunks"""
+        records = [{'index': i, 'text': f"text {i} " * i, 'error': 'x'} for i in range(1, 12)]
+        with ColumnarResultWriter(str(tmp_path / 'run.moodcol'), chunk_rows=3) as writer:
+            writer.write_many(records)
+        store = ColumnarResults(str(tmp_path / 'run.moodcol'))
+        
+        assert [store.string('text', i) for i in range(len(records))] == [r['text'] for r in records]
+    
+    def test_incomplete_store_rejected(self, tmp_path):
+        """A store whose writer never closed has no meta.json and cannot be opened"""
+        writer = ColumnarResultWriter(str(tmp_path / 'run.moodcol'))
+        writer.write({'index': 1, 'text': "hi", 'error': 'x'})
+        with pytest.raises(ValueError):
+            ColumnarResults(str(tmp_path / 'run.moodcol'))
+        writer.close()
+        assert len(ColumnarResults(str(tmp_path / 'run.moodcol'))) == 1
+    
+    def test_interrupted_write_stays_incomplete(self, tmp_path):
+        """A with block that raises part-way leaves a store that cannot be opened"""
+        path = str(tmp_path / 'run.moodcol')
+        with pytest.raises(KeyboardInterrupt):
+            with ColumnarResultWriter(path) as writer:
+                writer.write({'index': 1, 'text': "hi", 'error': 'x'})
+                writer.write({'index': 2, 'text': "there", 'error': 'x'})
+                raise KeyboardInterrupt
+        
+        with pytest.raises(ValueError):
+            ColumnarResults(path)
+    
+    def test_batch_pipeline_columnar(self, tmp_path):
+        """The batch pipeline picks the columnar format from a .moodcol output"""
+        source = tmp_path / 'in.txt'
+        source.write_text("\n".join(TEXTS), encoding='utf-8')
+        out = str(tmp_path / 'results.moodcol')
+        
+        assert run_batch_pipeline(str(source), out, use_gpt=False) == len(TEXTS)
+        assert ColumnarResults(out).summary()['valid_analyses'] == len(TEXTS)
+        with pytest.raises(ValueError):
+            run_batch_pipeline(str(source), '-', fmt='columnar', use_gpt=False)
@@ -0,0 +1,80 @@
+# tests/test_deadline.py
+import pytest
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from utils.deadline import Deadline, DeadlineExceeded
+from utils.gpt_client import GPTClient
+from utils.rate_limiter import AdaptiveRateLimiter
+from utils.circuit_breaker import CircuitBreaker
+from sentiment.analyzer import SentimentAnalyzer
+from sass_quotes.sass_gen import SassQuoteGenerator
+from benchmarks.fake_openai import FakeOpenAIServer
+
+def make_client(server):
+    return GPTClient(api_key='test-key', base_url=server.base_url,
+                     rate_limiter=AdaptiveRateLimiter(max_attempts=1), circuit_breaker=CircuitBreaker())
+
+class TestDeadline:
+    def test_budget_counts_down(self):
+        deadline = Deadline(0.05)
+        
+        assert 0 < deadline.remaining() <= 0.05
+        assert Deadline.coerce(deadline) is deadline
+        assert Deadline.coerce(None) is None
+        time.sleep(0.06)
+        assert deadline.expired()
+        with pytest.raises(DeadlineExceeded):
+            deadline.check()
+    
+    def test_hedge_beats_slow_primary(self, monkeypatch):
+        """A duplicate sent after the hedge delay answers before the stuck first request"""
+        monkeypatch.setattr(Config, 'GPT_HEDGE_DEFAULT_DELAY', 0.1)
+        with FakeOpenAIServer(latency=lambda number: 2.0 if number == 1 else 0.0) as server:
+            client = make_client(server)
+            client.sync_client  # Build the openai client up front so the primary goes out first
+            
+            start = time.perf_counter()
+            reply = client.complete('Score: Text: "hi"', 20, 0.3, deadline=Deadline(3.0))
+            elapsed = time.perf_counter() - start
+            client.close()
+        
+        assert reply.startswith("Score:")
+        assert elapsed < 1.0
+        assert client.hedges_sent == 1 and client.hedges_won == 1
+    
+    def test_expired_gpt_stage_is_degraded(self):
+        """When GPT can't answer in budget the result is local-only and flags the GPT stage"""
+        with FakeOpenAIServer(latency=1.0) as server:
+            client = make_client(server)
+            analyzer = SentimentAnalyzer(client=client)
+            generator = SassQuoteGenerator(client=client)
+            analyzer.analyze_local("warm up")
+            
+            deadline = Deadline(0.3)
+            start = time.perf_counter()
+            result = analyzer.analyze_comprehensive("Running late but vibing", cascade=False, deadline=deadline)
+            sass = generator.generate_sass_quote(result, deadline=deadline)
+            elapsed = time.perf_counter() - start
+            client.close()
+        
+        assert elapsed < 0.6
+        assert result['degraded'] == ['gpt']
+        assert result['gpt_skipped'] is True
+        assert sass['degraded'] == ['sass_quote']
+        assert sass['generation_method'] == 'fallback'
+        assert client.circuit_breaker.state == 'closed'
+    
+    def test_fast_backend_is_not_degraded(self):
+        with FakeOpenAIServer() as server:
+            client = make_client(server)
+            analyzer = SentimentAnalyzer(client=client)
+            
+            result = analyzer.analyze_comprehensive("Great day", cascade=False, deadline=2.0)
+            client.close()
+        
+        assert result['degraded'] == []
+        assert result['gpt_skipped'] is False
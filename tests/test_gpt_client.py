@@ -0,0 +1,76 @@
+# tests/test_gpt_client.py
+import pytest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.gpt_client import GPTClient, get_default_client
+from sentiment.analyzer import SentimentAnalyzer
+from sass_quotes.sass_gen import SassQuoteGenerator
+
+class RecordingClient(GPTClient):
+    """GPTClient that records prompts instead of calling the API"""
+    
+    def __init__(self, reply):
+        super().__init__(api_key='test-key', model='test-model')
+        self.reply = reply
+        self.calls = []
+    
+    def complete(self, prompt, max_tokens, temperature, timeout=None, deadline=None, stage=None):
+        self.calls.append(prompt)
+        return self.reply
+
+class TestGPTClient:
+    def test_default_client_is_shared(self):
+        """Both components use the same pooled client by default"""
+        assert SentimentAnalyzer().client is SassQuoteGenerator().client is get_default_client()
+    
+    def test_injected_client_is_used(self):
+        """An injected client serves both sentiment scoring and sass quotes"""
+        client = RecordingClient("Score: 0.4\nEmotion: content")
+        analyzer = SentimentAnalyzer(client=client)
+        generator = SassQuoteGenerator(client=client)
+        
+        assert analyzer.analyze_gpt("pretty good day")['score'] == 0.4
+        assert generator.generate_gpt_sass_quote('positive', 'Good Vibes', 0.3) == "Score: 0.4\nEmotion: content"
+        assert len(client.calls) == 2
+    
+    def test_pool_configuration(self):
+        """The sync client is built on an httpx pool with the configured limits and timeout"""
+        client = GPTClient(api_key='test-key', pool_size=3, timeout=7.5)
+        
+        limits = client._limits()
+        assert limits.max_connections == 3
+        assert limits.max_keepalive_connections == 3
+        assert client._timeout().read == 7.5
+        assert client.sync_client is client.sync_client
+        client.close()
+    
+    def test_request_timeout_keeps_connect_timeout(self):
+        """Per-request timeouts keep the connect cap instead of spending the whole budget on connecting"""
+        from config import Config
+        from utils.deadline import Deadline
+        client = GPTClient(api_key='test-key', timeout=20.0)
+        
+        timeout = client._request_timeout(None, None)
+        assert (timeout.read, timeout.connect) == (20.0, Config.GPT_CONNECT_TIMEOUT)
+        
+        timeout = client._request_timeout(None, Deadline(1.0))
+        assert timeout.read <= 1.0 and timeout.connect == timeout.read
+    
+    def test_async_client_per_event_loop(self):
+        """Each event loop gets its own async pool, and aclose() closes the current one"""
+        import asyncio
+        client = GPTClient(api_key='test-key')
+        
+        async def get_and_close():
+            async_client = client.async_client
+            assert client.async_client is async_client
+            await client.aclose()
+            return async_client
+        
+        first = asyncio.run(get_and_close())
+        second = asyncio.run(get_and_close())
+        assert first is not second
+        assert first.is_closed() and second.is_closed()
+        assert len(client._async_clients) == 0
@@ -0,0 +1,71 @@
+# tests/test_metrics.py
+import pytest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.metrics import Metrics
+from sentiment.analyzer import SentimentAnalyzer
+from sass_quotes.sass_gen import SassQuoteGenerator
+from tests.fakes import FakeClient
+
+class TestMetrics:
+    def test_disabled_is_a_no_op(self):
+        """While disabled nothing is recorded and results carry no timings"""
+        metrics = Metrics(enabled=False, result_timings=True)
+        analyzer = SentimentAnalyzer(client=FakeClient("Score: 0.5\nEmotion: happy"), memo_size=0, metrics=metrics)
+        
+        result = analyzer.analyze_comprehensive("What a great day", cascade=False)
+        
+        assert 'timings' not in result
+        assert metrics.snapshot() == {'enabled': False, 'counters': {}, 'stages': {}}
+    
+    def test_analysis_timings_and_counters(self):
+        """Each stage is timed into the histograms and the result's timings block"""
+        metrics = Metrics(enabled=True, result_timings=True)
+        analyzer = SentimentAnalyzer(client=FakeClient("Score: 0.5\nEmotion: happy"), memo_size=0, metrics=metrics)
+        
+        result = analyzer.analyze_comprehensive("What a great day", cascade=False)
+        
+        assert set(result['timings']) == {'textblob_ms', 'vader_ms', 'gpt_request_ms', 'gpt_parse_ms', 'total_ms'}
+        assert result['timings']['total_ms'] >= result['timings']['textblob_ms']
+        snapshot = metrics.snapshot()
+        assert snapshot['counters'] == {'gpt_calls': 1}
+        assert snapshot['stages']['analyze']['count'] == 1
+    
+    def test_deadline_path_times_gpt_in_worker_thread(self):
+        """The GPT call made on the executor still lands in the caller's timings"""
+        metrics = Metrics(enabled=True, result_timings=True)
+        analyzer = SentimentAnalyzer(client=FakeClient("Score: 0.5\nEmotion: happy"), memo_size=0, metrics=metrics)
+        
+        result = analyzer.analyze_comprehensive("What a great day", cascade=False, deadline=5.0)
+        
+        assert 'gpt_request_ms' in result['timings']
+        analyzer.close()
+    
+    def test_parse_failures_and_fallbacks(self):
+        """Unparseable replies and fallback quotes are counted"""
+        metrics = Metrics(enabled=True)
+        client = FakeClient("I'd rather not say")
+        analyzer = SentimentAnalyzer(client=client, memo_size=0, metrics=metrics)
+        generator = SassQuoteGenerator(client=client, metrics=metrics)
+        
+        sentiment = analyzer.analyze_comprehensive("meh", cascade=False)
+        generator.generate_sass_quote(sentiment, use_gpt=False)
+        
+        assert 'timings' not in sentiment
+        assert metrics.snapshot()['counters'] == {'gpt_calls': 1, 'parse_failures': 1, 'sass_fallbacks': 1}
+    
+    def test_prometheus_histogram_is_cumulative(self):
+        metrics = Metrics(enabled=True, buckets=[0.01, 0.1])
+        for seconds in (0.005, 0.05, 0.05, 1.0):
+            metrics.observe('gpt_request', seconds)
+        metrics.increment('gpt_calls', 4)
+        
+        text = metrics.render_prometheus()
+        
+        assert 'sentiment_bot_gpt_calls_total 4' in text
+        assert 'sentiment_bot_stage_duration_seconds_bucket{stage="gpt_request",le="0.01"} 1' in text
+        assert 'sentiment_bot_stage_duration_seconds_bucket{stage="gpt_request",le="0.1"} 3' in text
+        assert 'sentiment_bot_stage_duration_seconds_bucket{stage="gpt_request",le="+Inf"} 4' in text
+        assert metrics.snapshot()['stages']['gpt_request']['buckets'] == {'le_10ms': 1, 'le_100ms': 2, 'le_inf': 1}
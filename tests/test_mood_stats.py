@@ -0,0 +1,76 @@
+# tests/test_mood_stats.py
+import pytest
+import sys
+import os
+import json
+import random
+import statistics
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentiment.parallel import summarize_local_parallel
+from utils.helpers import batch_process_texts, create_mood_summary
+from utils.mood_stats import MoodAggregator
+
+def _scores(count, seed=1):
+    rng = random.Random(seed)
+    return [round(max(-1.0, min(1.0, rng.gauss(0.2, 0.4))), 3) for _ in range(count)]
+
+class TestMoodAggregator:
+    def test_running_stats(self):
+        """Mean, variance, min/max are exact and quantiles within half a bin"""
+        scores = _scores(2000)
+        aggregator = MoodAggregator()
+        for score in scores:
+            aggregator.add(score, 'positive' if score > 0 else 'negative')
+        
+        assert aggregator.mean == pytest.approx(statistics.fmean(scores))
+        assert aggregator.variance == pytest.approx(statistics.pvariance(scores))
+        assert (aggregator.min, aggregator.max) == (min(scores), max(scores))
+        ordered = sorted(scores)
+        for q in (0.1, 0.5, 0.9, 0.99):
+            assert abs(aggregator.quantile(q) - ordered[int(q * len(ordered)) - 1]) <= 1.0 / aggregator.bins + 1e-9
+    
+    def test_merge_matches_single_pass(self):
+        """Shards merged through their serialized state equal one aggregator over everything"""
+        scores = _scores(900, seed=2)
+        whole = MoodAggregator()
+        shards = [MoodAggregator() for _ in range(3)]
+        for i, score in enumerate(scores):
+            whole.add(score, 'neutral')
+            shards[i % 3].add(score, 'neutral')
+        
+        merged = MoodAggregator()
+        for shard in shards + [MoodAggregator()]:
+            merged.merge(MoodAggregator.from_dict(json.loads(json.dumps(shard.to_dict()))))
+        
+        assert merged.count == whole.count
+        assert merged.mean == pytest.approx(whole.mean)
+        assert merged.variance == pytest.approx(whole.variance)
+        assert merged.sketch == whole.sketch
+        assert merged.summary() == whole.summary()
+        assert MoodAggregator.from_scores(scores).summary()['score_stats'] == whole.summary()['score_stats']
+        with pytest.raises(ValueError):
+            merged.merge(MoodAggregator(bins=10))
+    
+    def test_create_mood_summary(self):
+        """Dict and compact batch records summarize the same; failed records only count as seen"""
+        texts = ["I love this so much!", "I hate everything", "Today was okay, nothing special happened."]
+        plain = batch_process_texts(texts, use_gpt=False, workers=1)
+        compact = batch_process_texts(texts, use_gpt=False, workers=1, compact=True)
+        plain.append({'index': 4, 'text': "broken", 'error': "boom"})
+        
+        summary = create_mood_summary(plain)
+        assert summary['total_texts'] == 4
+        assert summary['valid_analyses'] == 3
+        assert sum(summary['mood_distribution'].values()) == 3
+        assert summary['score_stats']['min'] <= summary['average_score'] <= summary['score_stats']['max']
+        assert create_mood_summary(iter(compact))['score_stats'] == summary['score_stats']
+        assert create_mood_summary([]) == {}
+    
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_parallel_summary(self, workers):
+        """Workers ship aggregator state instead of results and the merge matches a serial summary"""
+        texts = ["I love this so much!", "I hate everything", "Meh.", "Best. Day. Ever.", "It's fine I guess"] * 4
+        serial = create_mood_summary(batch_process_texts(texts, use_gpt=False, workers=1))
+        
+        assert summarize_local_parallel(texts, workers=workers, chunk_size=3).summary() == serial
@@ -0,0 +1,87 @@
+# tests/test_mood_windows.py
+import pytest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.helpers import format_mood_trend
+from utils.mood_windows import MoodWindows, SlidingMoodWindow, TumblingMoodWindow
+
+def _record(score, mood, timestamp=None):
+    record = {'text': "t", 'sentiment': {'combined_score': score, 'mood_category': mood}}
+    if timestamp is not None:
+        record['timestamp'] = timestamp
+    return record
+
+class TestSlidingMoodWindow:
+    def test_expires_old_buckets(self):
+        """Results leave the window once their bucket is older than the window length"""
+        window = SlidingMoodWindow(60, buckets=6)
+        window.add(0.8, 'very_positive', 1000.0)
+        window.add(-0.4, 'negative', 1030.0)
+        
+        snapshot = window.snapshot(1035.0)
+        assert snapshot['count'] == 2
+        assert snapshot['average_score'] == 0.2
+        assert snapshot['mood_distribution'] == {'very_positive': 1, 'negative': 1}
+        
+        assert window.snapshot(1065.0)['mood_distribution'] == {'negative': 1}
+        assert window.snapshot(5000.0)['count'] == 0
+        assert window.score_sum == 0.0
+    
+    def test_out_of_order_and_late(self):
+        """Slightly out-of-order results land in their bucket; ones older than the window are dropped"""
+        window = SlidingMoodWindow(60, buckets=6)
+        window.add(0.5, 'positive', 1050.0)
+        window.add(0.1, 'neutral', 1010.0)
+        window.add(0.9, 'very_positive', 900.0)
+        
+        assert window.count == 2
+        assert window.late == 1
+        assert window.snapshot(1075.0)['mood_distribution'] == {'positive': 1}
+    
+    def test_bounded_memory(self):
+        """The ring never grows with the number of results"""
+        window = SlidingMoodWindow(60, buckets=6)
+        for i in range(10000):
+            window.add(0.2, 'positive', 1000.0 + i * 0.5)
+        assert len(window._counts) == 6
+        assert window.count <= 130
+
+class TestTumblingMoodWindow:
+    def test_closes_periods_into_history(self):
+        """Each aligned period is summarized once it ends, keeping the last `history`"""
+        window = TumblingMoodWindow(60, history=2)
+        for minute, score in enumerate([0.6, -0.6, 0.0]):
+            window.add(score, 'positive' if score > 0 else 'negative', 600.0 + minute * 60 + 5)
+        window.add(0.3, 'positive', 600.0 + 30)
+        
+        snapshot = window.snapshot(600.0 + 3 * 60)
+        assert [period['average_score'] for period in snapshot['history']] == [-0.6, 0.0]
+        assert snapshot['current']['count'] == 0
+        assert window.late == 1
+
+class TestMoodWindows:
+    def test_windows_and_trend(self):
+        """All sizes update from one stream, timestamps come from the records"""
+        now = [10000.0]
+        windows = MoodWindows(sizes={'1m': 60, '5m': 300}, buckets=10, clock=lambda: now[0])
+        windows.add(_record(0.7, 'very_positive', timestamp=now[0] - 200))
+        windows.add(_record(-0.3, 'negative'))
+        windows.add({'index': 3, 'text': "broken", 'error': "boom"})
+        
+        snapshot = windows.snapshot()
+        assert snapshot['total'] == 2
+        assert snapshot['windows']['1m']['sliding']['count'] == 1
+        assert snapshot['windows']['5m']['sliding']['count'] == 2
+        assert list(windows.snapshot('1m')['windows']) == ['1m']
+        with pytest.raises(KeyError):
+            windows.snapshot('1d')
+        
+        assert "Last 1m" in format_mood_trend(snapshot)
+    
+    def test_iso_timestamps(self):
+        """Interactive session records carry ISO timestamps"""
+        windows = MoodWindows(sizes={'1h': 3600})
+        windows.add(_record(0.4, 'positive', timestamp='2024-01-01T12:00:00'))
+        assert windows.sliding['1h'].count == 1
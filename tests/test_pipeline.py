@@ -0,0 +1,76 @@
+# tests/test_pipeline.py
+import pytest
+import sys
+import os
+import io
+import json
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pipeline import stream_process_texts, iter_texts, JSONLResultWriter, CSVResultWriter, run_batch_pipeline
+from sentiment.analyzer import SentimentAnalyzer
+from sass_quotes.sass_gen import SassQuoteGenerator
+
+class TestStreamingPipeline:
+    @pytest.fixture
+    def analyzer(self, monkeypatch):
+        analyzer = SentimentAnalyzer()
+        monkeypatch.setattr(
+            analyzer, 'analyze_gpt',
+            lambda text: {'score': 0.2, 'emotion': 'calm', 'raw_response': 'Score: 0.2\nEmotion: calm'}
+        )
+        return analyzer
+    
+    def test_results_in_input_order(self, analyzer):
+        """Results come back in input order with 1-based indexes"""
+        texts = [f"text number {i}" for i in range(20)]
+        results = list(stream_process_texts(texts, analyzer, SassQuoteGenerator(), window=4, use_gpt=False))
+        
+        assert [r['index'] for r in results] == list(range(1, 21))
+        assert [r['text'] for r in results] == texts
+    
+    def test_bounded_in_flight_window(self, analyzer):
+        """The pipeline never pulls more than `window` texts ahead of what it has yielded"""
+        pulled = []
+        
+        def source():
+            for i in range(50):
+                pulled.append(i)
+                yield f"text {i}"
+        
+        window = 5
+        for yielded, _ in enumerate(stream_process_texts(source(), analyzer, SassQuoteGenerator(), window=window, use_gpt=False), 1):
+            assert len(pulled) - yielded <= window
+    
+    def test_writers(self, analyzer):
+        """JSONL and CSV writers emit one record per result"""
+        results = list(stream_process_texts(["Great!", "Awful."], analyzer, SassQuoteGenerator(), window=2))
+        
+        jsonl = io.StringIO()
+        csv_out = io.StringIO()
+        jsonl_writer, csv_writer = JSONLResultWriter(jsonl), CSVResultWriter(csv_out)
+        for result in results:
+            jsonl_writer.write(result)
+            csv_writer.write(result)
+        
+        lines = jsonl.getvalue().splitlines()
+        assert [json.loads(line)['text'] for line in lines] == ["Great!", "Awful."]
+        assert len(csv_out.getvalue().splitlines()) == 3
+    
+    def test_run_batch_pipeline_from_file(self, tmp_path):
+        """End-to-end local-only run from a text file into JSONL"""
+        source = tmp_path / 'in.txt'
+        source.write_text("I love it\n\nI hate it\n", encoding='utf-8')
+        out = tmp_path / 'results.jsonl'
+        
+        assert list(iter_texts(str(source))) == ["I love it", "I hate it"]
+        assert run_batch_pipeline(str(source), str(out), use_gpt=False) == 2
+        assert len(out.read_text(encoding='utf-8').splitlines()) == 2
+    
+    def test_malformed_jsonl_lines_are_skipped(self, tmp_path, caplog):
+        """Bad JSON, non-object records and missing or non-string text are logged with their line number and skipped"""
+        source = tmp_path / 'in.jsonl'
+        source.write_text('{"text": "first"}\n{not json\n"just a string"\n{"id": 4}\n{"text": 5}\n'
+                          '{"text": ""}\n{"text": "last"}\n', encoding='utf-8')
+        
+        assert list(iter_texts(str(source))) == ["first", "last"]
+        assert all(f"line {n}" in caplog.text for n in range(2, 7))
@@ -0,0 +1,79 @@
+# tests/test_prompts.py
+import pytest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from utils.prompts import LATEST_VERSIONS, get_prompt, mood_lines
+from sentiment.analyzer import SentimentAnalyzer
+
+class TestPromptTemplates:
+    def test_compact_prompts_are_smaller(self):
+        """Every latest prompt is shorter than the original and asks for no more tokens"""
+        fields = {'text': "I love this", 'numbered': '1. "I love this"', 'moods': mood_lines(),
+                  'mood_vibe': 'Good Vibes', 'mood_description': 'happy', 'sentiment_score': 0.4, 'count': 3}
+        for stage in LATEST_VERSIONS:
+            old, new = get_prompt(stage, 'v1'), get_prompt(stage)
+            assert len(new.render(**fields)) < len(old.render(**fields))
+            assert new.budget(3) <= old.budget(3)
+            assert '\n\n' not in new.render(**fields)
+    
+    def test_fused_quotes_follow_sass_style(self):
+        """Fused prompts ask for the same 1-2 emojis as the sass prompts of their version"""
+        for version in ('v1', 'v2'):
+            fused = get_prompt('sentiment_fused', version).render(text="hi", moods=mood_lines())
+            assert '1-2' in fused and 'emojis' in fused
+            assert 'no hashtags or emojis' not in fused
+            assert '1-2' in get_prompt('sass', version).template
+    
+    def test_pinned_version(self, monkeypatch):
+        """Config can pin a stage to an older prompt, which also changes its cache key"""
+        analyzer = SentimentAnalyzer()
+        latest_key = analyzer._gpt_cache_key("hello")
+        monkeypatch.setattr(Config, 'GPT_PROMPT_VERSIONS', {'sentiment': 'v1'})
+        
+        assert get_prompt('sentiment').version == 'v1'
+        assert analyzer._gpt_cache_key("hello") != latest_key
+        with pytest.raises(KeyError):
+            get_prompt('sentiment', 'v99')
+    
+    def test_budget_and_stage_reach_the_client(self, monkeypatch):
+        """Each call asks for its template's max_tokens and names its stage"""
+        analyzer = SentimentAnalyzer()
+        calls = []
+        
+        def fake_completion(prompt, max_tokens, temperature, deadline=None, stage=None):
+            calls.append((max_tokens, stage))
+            return "\n".join(f"{i} | Score: 0.1 | Emotion: calm" for i in (1, 2, 3)) if stage == 'sentiment_batch' \
+                else "Score: 0.1\nEmotion: calm"
+        
+        monkeypatch.setattr(analyzer, '_request_completion', fake_completion)
+        analyzer.analyze_gpt("fine")
+        analyzer.analyze_gpt_batch(["a", "b", "c"], batch_size=3)
+        
+        assert calls == [(Config.GPT_SENTIMENT_MAX_TOKENS, 'sentiment'),
+                         (3 * Config.GPT_BATCH_TOKENS_PER_TEXT, 'sentiment_batch')]
+
+class TestUsageAccounting:
+    def test_usage_is_booked_per_stage(self):
+        """Token usage reported by the API is totalled under each call's prompt stage"""
+        from benchmarks.fake_openai import FakeOpenAIServer
+        from utils.gpt_client import GPTClient
+        from utils.circuit_breaker import CircuitBreaker
+        from utils.rate_limiter import AdaptiveRateLimiter
+        from sass_quotes.sass_gen import SassQuoteGenerator
+        
+        with FakeOpenAIServer() as server:
+            client = GPTClient(api_key='fake-key', base_url=server.base_url,
+                               rate_limiter=AdaptiveRateLimiter(), circuit_breaker=CircuitBreaker())
+            SentimentAnalyzer(client=client).analyze_gpt("What a day")
+            SassQuoteGenerator(client=client).generate_gpt_sass_quote('positive', 'Good Vibes', 0.4)
+            SassQuoteGenerator(client=client).generate_gpt_sass_quote('negative', 'Down Bad', -0.4)
+            client.close()
+            stats = server.stats()
+        
+        usage = client.usage.stats()
+        assert set(usage) == {'sentiment', 'sass'}
+        assert usage['sass']['calls'] == 2
+        assert sum(stage['prompt_tokens'] for stage in usage.values()) == stats['prompt_tokens']
@@ -0,0 +1,157 @@
+# tests/test_rate_limiter.py
+import pytest
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rate_limiter import AIMDLimiter, AdaptiveRateLimiter, TokenBucket
+from utils.deadline import Deadline, DeadlineExceeded
+from utils.gpt_client import GPTClient
+from benchmarks.fake_openai import FakeOpenAIServer
+from tests.fakes import FakeClock
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+class ThrottledError(Exception):
+    status_code = 429
+    
+    def __init__(self, retry_after):
+        super().__init__("429")
+        self.response = FakeResponse({'retry-after': str(retry_after)})
+
+class TestRateLimiterUnits:
+    def test_token_bucket_waits_for_refill(self):
+        """A drained bucket reports how long until the quota covers the request"""
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock)  # 1 unit per second
+        
+        assert bucket.reserve(60) == 0.0
+        assert bucket.reserve(2) == pytest.approx(2.0)
+        clock.now = 5.0
+        assert bucket.reserve(1) == 0.0
+    
+    def test_refused_reservation_takes_nothing(self):
+        """A reservation that would wait past max_wait leaves the bucket as it was"""
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock)
+        bucket.reserve(60)
+        
+        assert bucket.reserve(5, max_wait=2.0) is None
+        assert bucket.level == 0.0
+        assert bucket.reserve(1, max_wait=2.0) == pytest.approx(1.0)
+    
+    def test_deadline_rejection_does_not_drain_quota(self):
+        """A call the deadline can't cover is refused before either bucket is charged"""
+        limiter = AdaptiveRateLimiter(rpm=60, tpm=600)
+        limiter.tokens.reserve(600)
+        requests_before = limiter.requests.level
+        
+        with pytest.raises(DeadlineExceeded):
+            limiter.call(lambda: 'reply', estimated_tokens=100, deadline=Deadline(0.5))
+        assert limiter.requests.level == pytest.approx(requests_before, abs=0.1)
+        assert limiter.tokens.level == pytest.approx(0.0, abs=0.1)
+    
+    def test_aimd_halves_on_throttle_and_grows_on_success(self):
+        limiter = AIMDLimiter(initial=8, maximum=10, cooldown=0.0)
+        
+        limiter.acquire()
+        limiter.release(success=False, throttled=True)
+        assert int(limiter.limit) == 4
+        
+        for _ in range(8):
+            limiter.acquire()
+            limiter.release(success=True)
+        assert int(limiter.limit) == 5
+    
+    def test_aimd_acquire_gives_up_after_timeout(self):
+        """A caller waiting on a full limiter raises instead of blocking forever"""
+        limiter = AIMDLimiter(initial=1, maximum=1)
+        limiter.acquire()
+        
+        start = time.perf_counter()
+        with pytest.raises(DeadlineExceeded):
+            limiter.acquire(timeout=0.05)
+        assert time.perf_counter() - start < 1.0
+        assert limiter.in_flight == 1
+        
+        limiter.release(success=True)
+        limiter.acquire(timeout=0.05)
+        assert limiter.in_flight == 1
+    
+    def test_aimd_async_waiter_woken_by_release(self):
+        """An async waiter parks until release() wakes it, even from another thread"""
+        import asyncio
+        import threading
+        limiter = AIMDLimiter(initial=1, maximum=1)
+        limiter.acquire()
+        
+        async def wait_for_slot():
+            waiting = asyncio.ensure_future(limiter.acquire_async(timeout=5.0))
+            await asyncio.sleep(0.05)
+            assert not waiting.done()
+            assert len(limiter._async_waiters) == 1
+            
+            threading.Thread(target=limiter.release, args=(True,)).start()
+            await asyncio.wait_for(waiting, 1.0)
+            
+            with pytest.raises(DeadlineExceeded):
+                await limiter.acquire_async(timeout=0.05)
+        
+        asyncio.run(wait_for_slot())
+        assert limiter.in_flight == 1
+        assert limiter._async_waiters == []
+    
+    def test_backoff_respects_retry_after(self):
+        """Jittered backoff is never shorter than the server's Retry-After"""
+        limiter = AdaptiveRateLimiter(base_delay=0.01, max_delay=5.0)
+        
+        assert all(limiter.backoff_delay(0, ThrottledError(1.5)) >= 1.5 for _ in range(20))
+        assert all(limiter.backoff_delay(3, Exception("x")) <= 0.08 for _ in range(20))
+    
+    def test_non_retryable_error_raises_immediately(self):
+        limiter = AdaptiveRateLimiter(base_delay=0.01)
+        calls = []
+        
+        def failing():
+            calls.append(1)
+            raise ValueError("bad request")
+        
+        with pytest.raises(ValueError):
+            limiter.call(failing, estimated_tokens=10)
+        assert len(calls) == 1
+
+class TestRateLimiterAgainstFakeServer:
+    def test_retries_through_429s(self):
+        """Forced 429s are retried after Retry-After instead of falling back"""
+        with FakeOpenAIServer(fail_first=2, retry_after=0.1) as server:
+            client = GPTClient(api_key='test-key', base_url=server.base_url,
+                               rate_limiter=AdaptiveRateLimiter(base_delay=0.01))
+            
+            start = time.perf_counter()
+            reply = client.complete('Score: Text: "nice"', 20, 0.3)
+            elapsed = time.perf_counter() - start
+            client.close()
+        
+        assert reply.startswith("Score:")
+        assert server.stats()['requests'] == 3
+        assert client.rate_limiter.stats()['rate_limited'] == 2
+        assert elapsed >= 0.2
+    
+    def test_concurrency_adapts_to_server_cap(self):
+        """AIMD backs off to what the server accepts and every request still succeeds"""
+        with FakeOpenAIServer(latency=0.05, max_concurrency=2, retry_after=0.05) as server:
+            limiter = AdaptiveRateLimiter(initial_concurrency=8, max_concurrency=8, base_delay=0.01, max_attempts=10)
+            client = GPTClient(api_key='test-key', base_url=server.base_url, pool_size=8, rate_limiter=limiter)
+            
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                replies = list(executor.map(lambda i: client.complete(f'Score: Text: "{i}"', 20, 0.3), range(16)))
+            client.close()
+        
+        assert len(replies) == 16
+        assert limiter.stats()['failures'] == 0
+        assert limiter.stats()['concurrency_limit'] < 8
+        assert server.stats()['completed'] == 16
@@ -0,0 +1,88 @@
+# tests/test_results.py
+import pytest
+import sys
+import os
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentiment.analyzer import SentimentAnalyzer
+from sentiment.results import BatchRecord, SentimentResult, to_dict
+from utils.helpers import batch_process_texts, create_mood_summary, export_to_csv
+
+def _gpt_result(score=0.6):
+    quotes = {'positive': "Main character energy, no notes", 'neutral': "Existing peacefully"}
+    return {'score': score, 'emotion': 'joy', 'raw_response': '{"score": 0.6, "emotion": "joy"}',
+            'sass_quotes': quotes}
+
+class TestCompactResults:
+    @pytest.fixture
+    def analyzer(self):
+        return SentimentAnalyzer(memo_size=0)
+    
+    def _build(self, analyzer, text, gpt_result, **kwargs):
+        return analyzer._build_result(text, analyzer.analyze_textblob(text), analyzer.analyze_vader(text),
+                                      gpt_result, **kwargs)
+    
+    def test_to_dict_matches_dict_result(self, analyzer):
+        """A compact result converts back to exactly the dict analyze_comprehensive builds"""
+        for text, gpt_result in (("I love this so much!", _gpt_result()), ("Meh, whatever", None)):
+            expected = self._build(analyzer, text, gpt_result)
+            compact = self._build(analyzer, text, gpt_result, compact=True)
+            
+            assert isinstance(compact, SentimentResult)
+            assert compact.to_dict() == expected
+            assert to_dict(expected) is expected
+    
+    def test_dict_style_access(self, analyzer):
+        """Compact results answer the lookups existing consumers make"""
+        result = self._build(analyzer, "I love this so much!", _gpt_result(), compact=True)
+        
+        assert result['mood_category'] == result.mood_category
+        assert result.get('combined_score') == result.combined_score
+        assert result['individual_scores']['gpt']['emotion'] == 'joy'
+        assert 'degraded' not in result
+        assert result.get('degraded', []) == []
+        with pytest.raises(KeyError):
+            result['missing']
+    
+    def test_drop_raw_response(self, analyzer):
+        """keep_raw=False drops the raw GPT reply and fused quotes but keeps the scores"""
+        result = self._build(analyzer, "I love this so much!", _gpt_result(), compact=True, keep_raw=False)
+        gpt = result['individual_scores']['gpt']
+        
+        assert gpt['raw_response'] == ''
+        assert 'sass_quotes' not in gpt
+        assert gpt['score'] == 0.6
+    
+    def test_smaller_than_dicts(self, analyzer):
+        """Compact local-only results hold well under half the memory of the dicts"""
+        texts = [f"Today was okay, nothing special happened {i}" for i in range(300)]
+        local = [(analyzer.analyze_textblob(text), analyzer.analyze_vader(text)) for text in texts]
+        
+        def retained(compact):
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            results = [analyzer._build_result(text, tb, vader, None, compact) for text, (tb, vader) in zip(texts, local)]
+            size = tracemalloc.get_traced_memory()[0] - before
+            tracemalloc.stop()
+            return size, results
+        
+        dict_size, _ = retained(False)
+        compact_size, _ = retained(True)
+        assert compact_size < dict_size * 0.5
+    
+    def test_batch_process_compact(self, tmp_path):
+        """Compact batch records work with the summary and CSV helpers"""
+        texts = ["I love this so much!", "I hate everything", "Today was okay, nothing special happened."]
+        records = batch_process_texts(texts, use_gpt=False, workers=1, compact=True)
+        plain = batch_process_texts(texts, use_gpt=False, workers=1)
+        
+        assert all(isinstance(record, BatchRecord) for record in records)
+        assert [record['sentiment']['mood_category'] for record in records] == \
+               [record['sentiment']['mood_category'] for record in plain]
+        assert create_mood_summary(records) == create_mood_summary(plain)
+        assert records[0].to_dict()['sass_quote']['formatted_output'] == records[0]['sass_quote'].formatted_output
+        
+        filename = export_to_csv(records, str(tmp_path / "out.csv"))
+        with open(filename, encoding='utf-8') as f:
+            assert len(f.readlines()) == len(texts) + 1
@@ -0,0 +1,110 @@
+# tests/test_sass_quotes.py
+import pytest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sass_quotes.sass_gen import SassQuoteGenerator
+from tests.fakes import FakeClient
+
+SENTIMENT = {
+    'mood_category': 'positive',
+    'mood_vibe': 'Good Vibes',
+    'mood_emoji': '😊',
+    'combined_score': 0.4,
+    'individual_scores': {'gpt': {'score': 0.5, 'emotion': 'happy'}}
+}
+
+class TestMultipleQuotes:
+    def test_alternatives_from_one_request(self):
+        """All alternatives come from a single numbered-list completion"""
+        client = FakeClient('Here you go:\n1. "Glow check: passed ✨"\n2) Serving sunshine 🌟\n3. Vibes? Immaculate 😌')
+        generator = SassQuoteGenerator(client=client)
+        
+        quotes = generator.generate_multiple_quotes(SENTIMENT, count=3, gpt_alternatives=True)
+        
+        assert len(client.calls) == 1
+        assert [q['sass_quote'] for q in quotes] == ["Glow check: passed ✨", "Serving sunshine 🌟", "Vibes? Immaculate 😌"]
+        assert all(q['generation_method'] == 'gpt' for q in quotes)
+    
+    def test_duplicates_are_padded_with_fallbacks(self):
+        """Repeated quotes are dropped and the shortfall filled from fallbacks"""
+        client = FakeClient("1. Serving sunshine 🌟\n2. serving sunshine!\n3. Serving sunshine 🌟")
+        generator = SassQuoteGenerator(client=client)
+        
+        quotes = generator.generate_multiple_quotes(SENTIMENT, count=3, gpt_alternatives=True)
+        
+        assert [q['generation_method'] for q in quotes] == ['gpt', 'fallback', 'fallback']
+        assert quotes[1]['sass_quote'] in generator.fallback_quotes['positive']
+    
+    def test_failed_request_falls_back(self):
+        """An API error still returns count fallback quotes"""
+        class FailingClient(FakeClient):
+            def complete(self, *args, **kwargs):
+                raise RuntimeError("boom")
+        
+        generator = SassQuoteGenerator(client=FailingClient(''))
+        quotes = generator.generate_multiple_quotes(SENTIMENT, count=3, gpt_alternatives=True)
+        
+        assert len(quotes) == 3
+        assert all(q['generation_method'] == 'fallback' for q in quotes)
+
+class TestQuotePool:
+    REPLY = "\n".join(f"{i}. Pooled quote number {i} ✨" for i in range(1, 6))
+    
+    @pytest.fixture
+    def pool(self):
+        from sass_quotes.quote_pool import SassQuotePool
+        
+        generator = SassQuoteGenerator(client=FakeClient(self.REPLY))
+        pool = SassQuotePool(generator, size=3, low_watermark=1, bucket_width=0.25)
+        generator.pool = pool
+        yield pool
+        pool.stop()
+    
+    def test_scores_share_a_bucket(self, pool):
+        """Nearby scores map to the same pool bucket"""
+        assert pool.bucket('positive', 0.4) == pool.bucket('positive', 0.55) == ('positive', 0.5)
+        assert pool.bucket('positive', 0.3) == ('positive', 0.25)
+    
+    def test_refill_serves_from_pool(self, pool):
+        """One refill request fills the bucket and later quotes come from it"""
+        generator = pool.generator
+        
+        first = generator.generate_sass_quote(SENTIMENT)
+        assert first['generation_method'] == 'gpt'
+        
+        pool.start()
+        pool._refill_queue.join()
+        
+        second = generator.generate_sass_quote(SENTIMENT)
+        assert second['generation_method'] == 'gpt_pool'
+        assert second['sass_quote'].startswith("Pooled quote number")
+        
+        stats = pool.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+        assert stats['refills'] >= 1 and stats['last_refill_ms'] >= 0
+    
+    def test_stale_quotes_are_dropped(self, pool):
+        """Quotes older than max_age count as a miss"""
+        pool.refill(pool.bucket('positive', 0.4))
+        pool.max_age = -1
+        
+        assert pool.pop('positive', 0.4) is None
+    
+    def test_generators_share_one_lazily_started_pool(self, pool, monkeypatch):
+        """Generators use the process-wide pool, which no-GPT quotes never start"""
+        import threading
+        from config import Config
+        from sass_quotes import quote_pool
+        
+        monkeypatch.setattr(Config, 'QUOTE_POOL_ENABLED', True)
+        monkeypatch.setattr(quote_pool, '_default_pool', None)
+        for _ in range(3):
+            SassQuoteGenerator(client=FakeClient(self.REPLY)).generate_sass_quote(SENTIMENT, use_gpt=False)
+        assert quote_pool._default_pool is None
+        assert not any(thread.name == 'sass-quote-pool' for thread in threading.enumerate())
+        
+        monkeypatch.setattr(quote_pool, '_default_pool', pool)
+        assert SassQuoteGenerator().pool is SassQuoteGenerator().pool is pool
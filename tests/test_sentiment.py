@@ -2,6 +2,8 @@
 import pytest
 import sys
 import os
+import time
+import asyncio
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sentiment.analyzer import SentimentAnalyzer, quick_analyze
@@ -61,6 +63,8 @@ class TestSentimentAnalyzer:
 import pytest
 import sys
 import os
+import time
+import asyncio
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from sass_quotes.sass_gen import SassQuoteGenerator
@@ -94,6 +98,21 @@ class TestSassQuoteGenerator:
         assert isinstance(result['sass_quote'], str)
         assert len(result['sass_quote']) > 0
     
+    def test_failed_gpt_quote_is_labelled_fallback(self, generator, sample_sentiment, monkeypatch):
+        """A canned quote served because GPT failed is not reported as a GPT quote"""
+        from utils.circuit_breaker import CircuitOpenError
+        
+        def circuit_opened(*args, **kwargs):
+            raise CircuitOpenError("GPT circuit is open")
+        
+        generator.cache = None
+        monkeypatch.setattr(generator.client, 'available', lambda: True)
+        monkeypatch.setattr(generator.client, 'complete', circuit_opened)
+        result = generator.generate_sass_quote(dict(sample_sentiment, individual_scores={}))
+        
+        assert result['generation_method'] == 'fallback'
+        assert result['sass_quote'] in generator.fallback_quotes[result['mood_category']]
+    
     def test_multiple_quotes(self, generator, sample_sentiment):
         """Test multiple quote generation"""
         quotes = generator.generate_multiple_quotes(sample_sentiment, count=3)
@@ -103,5 +122,398 @@ class TestSassQuoteGenerator:
             assert 'sass_quote' in quote
             assert 'formatted_output' in quote
 
+class TestConcurrentAnalysis:
+    GPT_DELAY = 0.3
+    LOCAL_DELAY = 0.1
+    
+    @pytest.fixture
+    def slow_analyzer(self, monkeypatch):
+        """Analyzer with a stubbed slow GPT backend and slowed local scorers"""
+        analyzer = SentimentAnalyzer()
+        real_textblob = analyzer.analyze_textblob
+        real_vader = analyzer.analyze_vader
+        
+        gpt_result = {'score': 0.5, 'emotion': 'happy', 'raw_response': 'Score: 0.5\nEmotion: happy'}
+        
+        def slow_gpt(text):
+            time.sleep(self.GPT_DELAY)
+            return gpt_result
+        
+        async def slow_gpt_async(text):
+            await asyncio.sleep(self.GPT_DELAY)
+            return gpt_result
+        
+        def slow_textblob(text):
+            time.sleep(self.LOCAL_DELAY)
+            return real_textblob(text)
+        
+        def slow_vader(text):
+            time.sleep(self.LOCAL_DELAY)
+            return real_vader(text)
+        
+        monkeypatch.setattr(analyzer, 'analyze_gpt', slow_gpt)
+        monkeypatch.setattr(analyzer, 'analyze_gpt_async', slow_gpt_async)
+        monkeypatch.setattr(analyzer, 'analyze_textblob', slow_textblob)
+        monkeypatch.setattr(analyzer, 'analyze_vader', slow_vader)
+        yield analyzer
+        analyzer.close()
+    
+    def test_concurrent_matches_sequential(self, slow_analyzer):
+        """Concurrent analysis returns the same result dict as the sequential path"""
+        text = "I'm having a great day!"
+        assert slow_analyzer.analyze_comprehensive_concurrent(text) == slow_analyzer.analyze_comprehensive(text)
+    
+    def test_concurrent_latency(self, slow_analyzer):
+        """Local scorers overlap with the slow GPT call"""
+        start = time.perf_counter()
+        slow_analyzer.analyze_comprehensive_concurrent("What a lovely morning")
+        elapsed = time.perf_counter() - start
+        
+        sequential = self.GPT_DELAY + 2 * self.LOCAL_DELAY
+        assert elapsed < sequential - self.LOCAL_DELAY / 2
+    
+    @pytest.mark.asyncio
+    async def test_async_latency(self, slow_analyzer):
+        """Async analysis overlaps the local scorers with the GPT call"""
+        text = "What a lovely morning"
+        start = time.perf_counter()
+        result = await slow_analyzer.analyze_comprehensive_async(text)
+        elapsed = time.perf_counter() - start
+        
+        sequential = self.GPT_DELAY + 2 * self.LOCAL_DELAY
+        assert elapsed < sequential - self.LOCAL_DELAY / 2
+        assert result == slow_analyzer.analyze_comprehensive(text)
+
+
+class TestGPTBatch:
+    @pytest.fixture
+    def analyzer(self):
+        return SentimentAnalyzer()
+    
+    @staticmethod
+    def _numbered_texts(prompt):
+        return [line.strip() for line in prompt.split('\n') if line.strip()[:1].isdigit() and '. "' in line]
+    
+    def test_batch_parses_numbered_reply(self, analyzer, monkeypatch):
+        """One request scores every text in the batch"""
+        calls = []
+        
+        def fake_completion(prompt, max_tokens, temperature, deadline=None, stage=None):
+            calls.append(prompt)
+            count = len(self._numbered_texts(prompt))
+            return "\n".join(f"{i} | Score: {i / 10} | Emotion: mood {i}" for i in range(1, count + 1))
+        
+        monkeypatch.setattr(analyzer, '_request_completion', fake_completion)
+        results = analyzer.analyze_gpt_batch(["a", "b", "c", "d"], batch_size=4)
+        
+        assert len(calls) == 1
+        assert [r['score'] for r in results] == [0.1, 0.2, 0.3, 0.4]
+        assert results[2]['emotion'] == 'mood 3'
+    
+    def test_malformed_reply_splits_batch(self, analyzer, monkeypatch):
+        """A malformed batched reply is retried as smaller batches"""
+        calls = []
+        
+        def fake_completion(prompt, max_tokens, temperature, deadline=None, stage=None):
+            calls.append(prompt)
+            count = len(self._numbered_texts(prompt))
+            if count > 2:
+                return "1 | Score: 0.5 | Emotion: happy"  # Missing lines
+            if count == 0:
+                return "Score: -0.5\nEmotion: sad"
+            return "\n".join(f"{i} | Score: 0.5 | Emotion: happy" for i in range(1, count + 1))
+        
+        monkeypatch.setattr(analyzer, '_request_completion', fake_completion)
+        results = analyzer.analyze_gpt_batch(["a", "b", "c", "d", "e"], batch_size=5)
+        
+        assert len(results) == 5
+        # 5 -> (2, 3) -> (2, (1, 2)); the lone text goes through the single-text prompt
+        assert [r['score'] for r in results] == [0.5, 0.5, -0.5, 0.5, 0.5]
+        assert len(calls) == 5
+
+
+class TestResultMemo:
+    @pytest.fixture
+    def analyzer(self, monkeypatch):
+        analyzer = SentimentAnalyzer(memo_size=2)
+        analyzer.gpt_calls = 0
+        
+        def fake_gpt(text):
+            analyzer.gpt_calls += 1
+            return {'score': 0.6, 'emotion': 'joyful', 'raw_response': 'Score: 0.6\nEmotion: joyful'}
+        
+        monkeypatch.setattr(analyzer, 'analyze_gpt', fake_gpt)
+        return analyzer
+    
+    def test_normalized_repeat_is_memoized(self, analyzer):
+        """Texts that clean_text maps to the same string reuse the stored result"""
+        first = analyzer.analyze_comprehensive("Loving this!!! https://t.co/abc")
+        second = analyzer.analyze_comprehensive("Loving   this!")
+        
+        assert analyzer.gpt_calls == 1
+        assert second['combined_score'] == first['combined_score']
+        assert second['text'] == "Loving   this!"
+        assert analyzer.memo_stats()['hits'] == 1
+    
+    def test_memo_hits_are_independent_copies(self, analyzer):
+        """Mutating a returned result changes neither the memo nor other callers' results"""
+        first = analyzer.analyze_comprehensive("Loving this!")
+        compound = first['individual_scores']['vader']['compound']
+        
+        second = analyzer.analyze_comprehensive("Loving this!")
+        second['individual_scores']['vader']['compound'] = -1
+        first['individual_scores']['gpt']['score'] = -1
+        third = analyzer.analyze_comprehensive("Loving this!")
+        
+        assert analyzer.memo_stats()['hits'] == 2
+        assert first['individual_scores']['vader']['compound'] == compound
+        assert third['individual_scores']['vader']['compound'] == compound
+        assert third['individual_scores']['gpt']['score'] == 0.6
+    
+    def test_memo_is_bounded(self, analyzer):
+        """The memo evicts least recently used entries beyond its size"""
+        for text in ["one", "two", "three"]:
+            analyzer.analyze_comprehensive(text)
+        
+        stats = analyzer.memo_stats()
+        assert stats['size'] == 2
+        assert stats['evictions'] == 1
+        assert stats['misses'] == 3
+    
+    def test_memo_disabled_by_default(self):
+        """Without a memo size every call is recomputed"""
+        assert SentimentAnalyzer().memo is None
+
+
+class TestParallelLocalScoring:
+    def test_parallel_preserves_order(self):
+        """Process-pool scoring returns the same results, in input order, as the local scorers"""
+        from sentiment.parallel import score_local_parallel
+        
+        analyzer = SentimentAnalyzer()
+        texts = ["I love this!", "This is terrible", "It's fine I guess", "Best. Day. Ever!", "meh"] * 3
+        
+        parallel = score_local_parallel(texts, workers=2, chunk_size=4)
+        assert parallel == [analyzer.analyze_local(text) for text in texts]
+    
+    def test_single_worker_reuses_analyzer(self, monkeypatch):
+        """One worker scores in process with the given analyzer, or one built once, never per call"""
+        from sentiment import parallel
+        
+        inits = []
+        real_init = parallel._init_worker
+        monkeypatch.setattr(parallel, '_worker_analyzer', None)
+        monkeypatch.setattr(parallel, '_init_worker', lambda: inits.append(1) or real_init())
+        
+        analyzer = SentimentAnalyzer(memo_size=0)
+        results = parallel.analyze_local_parallel(["I love this!", "meh"], workers=1, analyzer=analyzer)
+        assert [r['text'] for r in results] == ["I love this!", "meh"]
+        assert inits == []
+        
+        parallel.score_local_parallel(["one"], workers=1)
+        parallel.score_local_parallel(["two"], workers=1)
+        assert inits == [1]
+    
+    def test_local_only_reweighting(self):
+        """Local-only results renormalize the TextBlob/VADER weights and flag the skipped GPT stage"""
+        analyzer = SentimentAnalyzer()
+        result = analyzer.analyze_local_only("I love this!")
+        
+        textblob = result['individual_scores']['textblob']['polarity']
+        vader = result['individual_scores']['vader']['compound']
+        assert result['gpt_skipped'] is True
+        assert result['combined_score'] == round((textblob + vader) / 2, 3)
+
+
+class TestGPTCascade:
+    @pytest.fixture
+    def analyzer(self, monkeypatch):
+        analyzer = SentimentAnalyzer()
+        analyzer.gpt_calls = 0
+        
+        def fake_gpt(text):
+            analyzer.gpt_calls += 1
+            return {'score': 0.0, 'emotion': 'neutral', 'raw_response': 'Score: 0.0\nEmotion: neutral'}
+        
+        monkeypatch.setattr(analyzer, 'analyze_gpt', fake_gpt)
+        return analyzer
+    
+    def test_skip_decision(self, analyzer):
+        """Only strongly agreeing local scores skip GPT"""
+        assert analyzer.can_skip_gpt(0.9, 0.95)
+        assert analyzer.can_skip_gpt(-0.9, -0.8)
+        assert not analyzer.can_skip_gpt(0.0, 0.05)  # GPT could tip it either way
+        assert not analyzer.can_skip_gpt(0.9, -0.9)  # Local scorers disagree
+    
+    def test_skip_keeps_mood_bucket(self, analyzer):
+        """Whenever GPT is skipped, every GPT score within the margin lands in the same bucket"""
+        from config import Config
+        
+        steps = [x / 20 for x in range(-20, 21)]
+        for textblob in steps:
+            for vader in steps:
+                if not analyzer.can_skip_gpt(textblob, vader):
+                    continue
+                consensus = (textblob + vader) / 2
+                buckets = {
+                    analyzer.get_mood_category(analyzer.combine_scores(textblob, vader, gpt))
+                    for gpt in (max(-1, consensus - Config.GPT_CASCADE_MARGIN), consensus,
+                                min(1, consensus + Config.GPT_CASCADE_MARGIN))
+                }
+                assert len(buckets) == 1
+    
+    def test_cascade_skips_gpt_call(self, analyzer):
+        """An obviously positive text is decided without calling GPT"""
+        result = analyzer.analyze_comprehensive("I love this, it is absolutely amazing and wonderful!", cascade=True)
+        
+        assert result['gpt_skipped'] is True
+        assert result['mood_category'] == 'very_positive'
+        assert analyzer.gpt_calls == 0
+    
+    def test_cascade_off_always_calls_gpt(self, analyzer):
+        """Without cascade the GPT stage always runs"""
+        result = analyzer.analyze_comprehensive("I love this, it is absolutely amazing and wonderful!", cascade=False)
+        
+        assert result['gpt_skipped'] is False
+        assert analyzer.gpt_calls == 1
+    
+    def test_batch_only_sends_undecided_texts(self, analyzer, monkeypatch):
+        """Batched analysis sends only texts the cascade can't decide to GPT"""
+        sent = []
+        
+        def fake_batch(texts, batch_size=None):
+            sent.extend(texts)
+            return [{'score': 0.0, 'emotion': 'neutral', 'raw_response': 'x'} for _ in texts]
+        
+        monkeypatch.setattr(analyzer, 'analyze_gpt_batch', fake_batch)
+        texts = ["I love this, it is absolutely amazing and wonderful!", "The meeting is at noon."]
+        results = analyzer.analyze_batch(texts, cascade=True)
+        
+        assert sent == ["The meeting is at noon."]
+        assert [r['gpt_skipped'] for r in results] == [True, False]
+
+class TestFusedGPT:
+    FUSED_REPLY = (
+        '```json\n{"score": 0.9, "emotion": "thrilled", "quotes": {'
+        '"very_positive": "Main character energy, no notes.", '
+        '"positive": "\\"Vibes are immaculate.\\"", "bogus": "ignored"}}\n```'
+    )
+    
+    @pytest.fixture
+    def analyzer(self, monkeypatch):
+        analyzer = SentimentAnalyzer()
+        analyzer.calls = []
+        
+        def fake_completion(prompt, max_tokens, temperature, deadline=None, stage=None):
+            analyzer.calls.append(prompt)
+            return self.FUSED_REPLY
+        
+        monkeypatch.setattr(analyzer, '_request_completion', fake_completion)
+        return analyzer
+    
+    def test_parses_score_and_quotes(self, analyzer):
+        """A fenced JSON reply yields the score, emotion and known-mood quotes"""
+        result = analyzer.analyze_gpt_fused("Best day ever!")
+        
+        assert result['score'] == 0.9
+        assert result['emotion'] == 'thrilled'
+        assert result['sass_quotes'] == {
+            'very_positive': 'Main character energy, no notes.',
+            'positive': 'Vibes are immaculate.'
+        }
+    
+    def test_plain_reply_falls_back(self, analyzer, monkeypatch):
+        """A 'Score: / Emotion:' reply still parses, just without quotes"""
+        monkeypatch.setattr(analyzer, '_request_completion', lambda *args, **kwargs: "Score: -0.4\nEmotion: annoyed")
+        result = analyzer.analyze_gpt_fused("ugh")
+        
+        assert result['score'] == -0.4
+        assert result['sass_quotes'] == {}
+    
+    def test_truncated_reply_keeps_score_and_is_not_cached(self, tmp_path, monkeypatch):
+        """A reply cut off at the token budget keeps its score and complete quotes but isn't cached"""
+        from utils.cache import SQLiteCache
+        cache = SQLiteCache(str(tmp_path / 'fused.sqlite3'))
+        analyzer = SentimentAnalyzer(cache=cache)
+        truncated = '{"score": -0.8, "emotion": "angry", "quotes": {"very_positive": "x", "positive": "y'
+        monkeypatch.setattr(analyzer, '_request_completion', lambda *args, **kwargs: truncated)
+        result = analyzer.analyze_gpt_fused("I am furious")
+        
+        assert result['score'] == -0.8
+        assert result['emotion'] == 'angry'
+        assert result['sass_quotes'] == {'very_positive': 'x'}
+        assert result['truncated']
+        assert len(cache) == 0
+        
+        monkeypatch.setattr(analyzer, '_request_completion', lambda *args, **kwargs: '{"emotion": "angry", "quo')
+        assert analyzer.analyze_gpt_fused("I am furious")['unavailable']
+        assert len(cache) == 0
+    
+    def test_one_request_for_sentiment_and_quote(self, analyzer):
+        """The sass generator reuses the fused quote instead of calling GPT again"""
+        from sass_quotes.sass_gen import SassQuoteGenerator
+        
+        generator = SassQuoteGenerator()
+        generator.generate_gpt_sass_quote = lambda *args: pytest.fail("unexpected sass GPT call")
+        
+        sentiment = analyzer.analyze_comprehensive("I love this, it is absolutely amazing and wonderful!",
+                                                   cascade=False, fused=True)
+        sass = generator.generate_sass_quote(sentiment)
+        
+        assert len(analyzer.calls) == 1
+        assert sass['generation_method'] == 'gpt_fused'
+        assert sass['sass_quote'] == sentiment['individual_scores']['gpt']['sass_quotes'][sentiment['mood_category']]
+
+class TestMicroBatchDispatcher:
+    @pytest.fixture
+    def analyzer(self, monkeypatch):
+        import re
+        from sentiment.dispatcher import MicroBatchDispatcher
+        
+        analyzer = SentimentAnalyzer()
+        analyzer.calls = []
+        
+        def fake_completion(prompt, max_tokens, temperature, deadline=None, stage=None):
+            # Each text is "text N" and scores N / 10, so every caller can check its own slice
+            analyzer.calls.append(prompt)
+            numbered = re.findall(r'^\s*(\d+)\. "text (\d+)"', prompt, re.MULTILINE)
+            if not numbered:
+                n = re.search(r'Text: "text (\d+)"', prompt).group(1)
+                return f"Score: {int(n) / 10}\nEmotion: single {n}"
+            return "\n".join(f"{i} | Score: {int(n) / 10} | Emotion: batched {n}" for i, n in numbered)
+        
+        monkeypatch.setattr(analyzer, '_request_completion', fake_completion)
+        analyzer.dispatcher = MicroBatchDispatcher(analyzer, max_batch=8, max_wait_ms=100)
+        yield analyzer
+        analyzer.close()
+    
+    def test_concurrent_requests_share_one_call(self, analyzer):
+        """Eight simultaneous analyses become one GPT request, each getting its own score"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        texts = [f"text {n}" for n in range(1, 9)]
+        analyzer.analyze_local("warm up")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda text: analyzer.analyze_comprehensive(text, cascade=False), texts))
+        
+        assert len(analyzer.calls) == 1
+        assert [r['individual_scores']['gpt']['score'] for r in results] == [n / 10 for n in range(1, 9)]
+        assert analyzer.dispatcher.stats()['avg_batch_size'] == 8
+    
+    def test_batches_are_capped(self, analyzer):
+        futures = [analyzer.dispatcher.submit(f"text {n}") for n in range(1, 11)]
+        scores = [future.result(timeout=5)['score'] for future in futures]
+        
+        assert scores == [n / 10 for n in range(1, 11)]
+        assert len(analyzer.calls) == 2
+        assert analyzer.dispatcher.stats()['batches'] == 2
+    
+    def test_lone_request_waits_at_most_the_window(self, analyzer):
+        start = time.perf_counter()
+        result = analyzer.dispatcher.score("text 3", timeout=5)
+        
+        assert result['score'] == 0.3
+        assert time.perf_counter() - start < 0.5
+
 if __name__ == "__main__":
-    pytest.main([__file__])
\ No newline at end of file
+    pytest.main([__file__])
@@ -0,0 +1,191 @@
+# tests/test_service.py
+import pytest
+import sys
+import os
+import json
+import asyncio
+import threading
+import http.client
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from sentiment.analyzer import SentimentAnalyzer
+from service.server import SentimentService
+from utils.gpt_client import GPTClient
+from utils.circuit_breaker import CircuitBreaker
+
+@pytest.fixture
+def service(monkeypatch):
+    """Service on a free port, served from a background event loop, with GPT stubbed out"""
+    monkeypatch.setattr(Config, 'GPT_FUSED_MODE', False)
+    analyzer = SentimentAnalyzer(client=GPTClient(api_key='test-key', circuit_breaker=CircuitBreaker()))
+    monkeypatch.setattr(analyzer, 'analyze_gpt', lambda text, deadline=None: {
+        'score': 0.5, 'emotion': 'stubbed', 'raw_response': 'Score: 0.5'
+    })
+    service = SentimentService(analyzer=analyzer, max_inflight=2, max_queue=0, batch_window=2)
+    service.generator.generate_gpt_sass_quote = lambda *args, **kwargs: "Stubbed sass ✨"
+    service.warm_up()
+    
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(service.start('127.0.0.1', 0), loop).result()
+    yield service
+    asyncio.run_coroutine_threadsafe(service.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+def post(connection, path, payload):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+    connection.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    return response.status, response.read()
+
+class TestSentimentService:
+    def test_analyze_and_sass_share_a_keepalive_connection(self, service):
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        
+        status, body = post(connection, '/analyze', {'text': "I love this so much!"})
+        assert status == 200
+        result = json.loads(body)
+        assert result['individual_scores']['gpt']['emotion'] == 'stubbed'
+        assert result['combined_score'] > 0
+        
+        status, body = post(connection, '/sass', {'text': "I love this so much!"})
+        assert status == 200
+        assert json.loads(body)['sass_quote']['sass_quote'] == "Stubbed sass ✨"
+        assert service.stats()['requests'] == 2
+        connection.close()
+    
+    def test_local_only_request(self, service):
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        status, body = post(connection, '/analyze', {'text': "meh", 'use_gpt': False})
+        
+        assert status == 200
+        assert json.loads(body)['gpt_skipped'] is True
+    
+    def test_batch_streams_ndjson_in_order(self, service):
+        texts = ["Best day ever!", "This is awful.", "Lunch at noon.", "So proud of you!", "ugh"]
+        body = '\n'.join(json.dumps({'text': text}) for text in texts).encode('utf-8')
+        
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        status, data = post(connection, '/batch?use_gpt=false', body)
+        records = [json.loads(line) for line in data.decode('utf-8').splitlines()]
+        
+        assert status == 200
+        assert [r['index'] for r in records] == [1, 2, 3, 4, 5]
+        assert [r['text'] for r in records] == texts
+        assert all(r['sass_quote']['generation_method'] == 'fallback' for r in records)
+    
+    def test_batch_invalid_items_get_error_records(self, service):
+        """Items without a non-empty string text are reported in place instead of being scored"""
+        lines = [{'text': "Great!"}, {'foo': 1}, {'text': ""}, {'text': None}, {'text': "Awful."}]
+        body = '\n'.join(json.dumps(line) for line in lines).encode('utf-8')
+        
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        status, data = post(connection, '/batch?use_gpt=false', body)
+        records = [json.loads(line) for line in data.decode('utf-8').splitlines()]
+        
+        assert status == 200
+        assert [r['index'] for r in records] == [1, 2, 3, 4, 5]
+        assert [r.get('text') for r in records] == ["Great!", None, None, None, "Awful."]
+        assert all(set(r) == {'index', 'error'} for r in records[1:4])
+    
+    def test_batch_error_is_reported_in_stream(self, service, monkeypatch):
+        """A bad line after the stream started ends it with an error record, not a second status line"""
+        monkeypatch.setattr(Config, 'SERVICE_MAX_BODY_BYTES', 100)
+        body = b'\n'.join([json.dumps({'text': "fine"}).encode('utf-8'), b'x' * 500, b'{"text": "never read"}'])
+        
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        status, data = post(connection, '/batch?use_gpt=false', body)
+        records = [json.loads(line) for line in data.decode('utf-8').splitlines()]
+        
+        assert status == 200
+        assert records[-1] == {'error': "Line longer than 100 bytes"}
+        assert all('never read' not in json.dumps(r) for r in records)
+        assert service.stats()['errors'] == 1
+    
+    def test_errors(self, service):
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        assert post(connection, '/analyze', b'not json')[0] == 400
+        
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        assert post(connection, '/analyze', {'text': ''})[0] == 400
+        
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        assert post(connection, '/nope', {})[0] == 404
+    
+    def test_sass_validates_supplied_sentiment(self, service):
+        """A client-supplied sentiment needs a known mood_category and a numeric combined_score"""
+        for sentiment in ({'combined_score': 0.4}, {'mood_category': 'positive'},
+                          {'mood_category': 'elated', 'combined_score': 0.4},
+                          {'mood_category': 'positive', 'combined_score': 'high'}, ['positive']):
+            connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+            status, body = post(connection, '/sass', {'sentiment': sentiment})
+            assert status == 400
+            assert 'sentiment' in json.loads(body)['error']
+        
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        status, body = post(connection, '/sass', {'sentiment': {'mood_category': 'positive', 'combined_score': 0.4},
+                                                  'use_gpt': False})
+        assert status == 200
+        assert json.loads(body)['sass_quote']['mood_vibe'] == Config.MOOD_LABELS['positive']['vibe']
+        assert service.stats()['errors'] == 0
+    
+    def test_full_queue_is_rejected(self, service):
+        """Requests beyond max_inflight + max_queue get a 503 instead of queueing forever"""
+        service.active_requests = service.max_inflight
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        status, _ = post(connection, '/analyze', {'text': "hello"})
+        service.active_requests = 0
+        
+        assert status == 503
+        assert service.stats()['rejected'] == 1
+    
+    def test_oversized_body_is_not_buffered_when_rejected(self, service, monkeypatch):
+        """A shed request with a body over the limit gets its 503 and the connection is closed"""
+        monkeypatch.setattr(Config, 'SERVICE_MAX_BODY_BYTES', 100)
+        service.active_requests = service.max_inflight
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        connection.request('POST', '/analyze', body=b'x' * 1000)
+        response = connection.getresponse()
+        response.read()
+        service.active_requests = 0
+        
+        assert response.status == 503
+        assert response.getheader('Connection') == 'close'
+    
+    def test_metrics_endpoint(self, service):
+        from utils.metrics import Metrics
+        service.analyzer.metrics = Metrics(enabled=True)
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        post(connection, '/analyze', {'text': "I love this so much!", 'use_gpt': False})
+        
+        connection.request('GET', '/metrics')
+        response = connection.getresponse()
+        text = response.read().decode('utf-8')
+        assert response.status == 200
+        assert response.getheader('Content-Type').startswith('text/plain')
+        assert 'sentiment_bot_stage_duration_seconds_count{stage="vader"} 1' in text
+        
+        connection.request('GET', '/metrics?format=json')
+        response = connection.getresponse()
+        assert json.loads(response.read())['stages']['textblob']['count'] == 1
+        connection.close()
+    
+    def test_trend_endpoint(self, service):
+        connection = http.client.HTTPConnection('127.0.0.1', service.port, timeout=10)
+        post(connection, '/analyze', {'text': "I love this so much!", 'use_gpt': False})
+        post(connection, '/analyze', {'text': "I hate everything", 'use_gpt': False})
+        
+        connection.request('GET', '/trend?window=5m')
+        response = connection.getresponse()
+        trend = json.loads(response.read())
+        assert response.status == 200
+        assert list(trend['windows']) == ['5m']
+        assert trend['windows']['5m']['sliding']['count'] == 2
+        
+        connection.request('GET', '/trend?window=2d')
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 400
+        connection.close()
@@ -0,0 +1,35 @@
+# tests/test_startup.py
+import pytest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_startup import loaded_heavy_modules, measure_import_ms
+
+# Generous ceiling so slow CI machines don't flake; the benchmark enforces the tight budget
+MAX_MAIN_IMPORT_MS = 500
+
+class TestStartup:
+    def test_heavy_modules_deferred(self):
+        """Importing the entry points and building the components loads no NLP/API libraries"""
+        heavy = loaded_heavy_modules(
+            "import main\n"
+            "from sentiment.analyzer import SentimentAnalyzer\n"
+            "from sass_quotes.sass_gen import SassQuoteGenerator\n"
+            "SentimentAnalyzer()\n"
+            "SassQuoteGenerator().get_fallback_quote('neutral')"
+        )
+        assert heavy == []
+    
+    def test_scorers_load_on_first_use(self):
+        """The local scorers pull in their libraries when first called"""
+        heavy = loaded_heavy_modules(
+            "from sentiment.analyzer import SentimentAnalyzer\n"
+            "SentimentAnalyzer().analyze_local('hello')"
+        )
+        assert 'textblob' in heavy and 'vaderSentiment' in heavy
+        assert 'openai' not in heavy
+    
+    def test_main_import_budget(self):
+        """Importing main stays within the startup budget"""
+        assert measure_import_ms('main') < MAX_MAIN_IMPORT_MS
@@ -0,0 +1,71 @@
+# tests/test_vader_batch.py
+import pytest
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentiment.vader_batch import VaderBatchScorer
+
+TOLERANCE = 1e-4
+
+# Covers negation, boosters, caps, 'but', 'least', 'kind of', emojis, emoticons and idioms
+REFERENCE_SENTENCES = [
+    "VADER is smart, handsome, and funny.",
+    "VADER is smart, handsome, and funny!",
+    "VADER is very smart, handsome, and funny.",
+    "VADER is VERY SMART, handsome, and FUNNY.",
+    "VADER is VERY SMART, uber handsome, and FRIGGIN FUNNY!!!",
+    "VADER is not smart, handsome, nor funny.",
+    "At least it isn't a horrible book.",
+    "The book was only kind of good.",
+    "The plot was good, but the characters are uncompelling and the dialog is not great.",
+    "Today SUX!",
+    "Today only kinda sux! But I'll get by, lol",
+    "Make sure you :) or :D today!",
+    "Catch utf-8 emoji such as 💘 and 💋 and 😁",
+    "Not bad at all",
+    "That concert was the bomb, yeah right",
+    "I never so loved a movie. Without a doubt the best??",
+    "no good, no way, no or nor happy",
+    "",
+    "   ",
+]
+
+@pytest.fixture(scope='module')
+def scorer():
+    return VaderBatchScorer()
+
+class TestVaderBatchScorer:
+    @staticmethod
+    def _random_corpus(count):
+        words = ("good bad great terrible not never so this very extremely kind of sort just enough but least "
+                 "at the movie was I love hate no nor or without doubt isn't don't kinda barely SUPER GOOD BAD "
+                 "happy sad :) :( 😁 💔 amazing awful fine okay meh lol wtf! ?? !!! really hardly despite").split()
+        rng = random.Random(7)
+        return [
+            " ".join(rng.choice(words) for _ in range(rng.randint(0, 20))) + rng.choice(["", "!", "!!", "??", "."])
+            for _ in range(count)
+        ]
+    
+    def _assert_matches_reference(self, scorer, texts):
+        expected = [scorer.reference.polarity_scores(text) for text in texts]
+        actual = scorer.polarity_scores_batch(texts)
+        for text, e, a in zip(texts, expected, actual):
+            for key in ('neg', 'neu', 'pos', 'compound'):
+                assert abs(e[key] - a[key]) <= TOLERANCE, (text, e, a)
+    
+    def test_reference_sentences(self, scorer):
+        """Hand-picked sentences exercising every rule match polarity_scores"""
+        self._assert_matches_reference(scorer, REFERENCE_SENTENCES)
+    
+    def test_random_corpus(self, scorer):
+        """A randomized corpus dense in modifiers matches polarity_scores"""
+        self._assert_matches_reference(scorer, self._random_corpus(3000))
+    
+    def test_order_preserved(self, scorer):
+        """Results come back in input order despite length sorting"""
+        texts = ["I hate this so much", "ok", "This is the best thing that has ever happened to me!"]
+        results = scorer.polarity_scores_batch(texts)
+        assert results[0]['compound'] < 0 < results[2]['compound']
+        assert list(scorer.compound_batch(texts)) == [r['compound'] for r in results]
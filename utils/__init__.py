@@ -8,6 +8,7 @@ from .helpers import (
     format_results, 
     validate_text_input,
     format_sentiment_breakdown,
+    format_mood_trend,
     save_results_to_json,
     load_results_from_json,
     get_emoji_sentiment_scale,
@@ -15,6 +16,7 @@ from .helpers import (
     print_colored_output,
     create_mood_summary,
     export_to_csv,
+    export_to_columnar,
     interactive_mood_analyzer
 )
 
@@ -23,6 +25,7 @@ __all__ = [
     'format_results', 
     'validate_text_input',
     'format_sentiment_breakdown',
+    'format_mood_trend',
     'save_results_to_json',
     'load_results_from_json',
     'get_emoji_sentiment_scale',
@@ -30,6 +33,7 @@ __all__ = [
     'print_colored_output',
     'create_mood_summary',
     'export_to_csv',
+    'export_to_columnar',
     'interactive_mood_analyzer'
 ]
 
@@ -0,0 +1,203 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+def normalize_cache_text(text: str) -> str:
+    """Normalize text before hashing so trivially different inputs share a cache entry"""
+    return ' '.join(text.split())
+
+def make_cache_key(namespace: str, normalized_input: str, model: str, prompt_version: str) -> str:
+    """Build a cache key from the normalized input, model name and prompt version"""
+    payload = json.dumps([namespace, normalized_input, model, prompt_version], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class CacheStore(ABC):
+    """Interface for the stores backing the GPT response cache
+
+    Values are JSON-serializable objects. Implementations must return None on a miss
+    and must never raise from get/set, so a broken cache only costs a GPT call.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+class SQLiteCache(CacheStore):
+    """SQLite-backed cache with TTL expiry and least-recently-used eviction
+
+    Uses WAL mode and one connection per thread/process, so the same database file
+    can be shared by several worker processes.
+    """
+
+    # Check the entry count every N writes rather than on each one
+    EVICTION_CHECK_INTERVAL = 64
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, reconnecting after a fork"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+            'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)')
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            conn = self._connect()
+            row = conn.execute('SELECT value, created_at FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+
+            now = time.time()
+            if self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                return None
+
+            conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+            return json.loads(row[0])
+        except Exception as e:
+            logger.error(f"Cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._writes += 1
+            if self._writes % self.EVICTION_CHECK_INTERVAL == 0:
+                self.evict()
+        except Exception as e:
+            logger.error(f"Cache write failed: {e}")
+
+    def evict(self) -> None:
+        """Drop expired entries, then the least recently used ones above max_entries"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if self.ttl_seconds is not None:
+                conn.execute('DELETE FROM cache WHERE created_at < ?', (time.time() - self.ttl_seconds,))
+            if self.max_entries is not None:
+                count = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+                if count > self.max_entries:
+                    conn.execute(
+                        'DELETE FROM cache WHERE key IN '
+                        '(SELECT key FROM cache ORDER BY accessed_at ASC LIMIT ?)',
+                        (count - self.max_entries,)
+                    )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def clear(self) -> None:
+        self._connect().execute('DELETE FROM cache')
+
+    def __len__(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+_default_cache: Optional[CacheStore] = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache() -> CacheStore:
+    """Shared GPT response cache configured from Config"""
+    global _default_cache
+    from config import Config
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SQLiteCache(
+                os.path.join(Config.CACHE_DIR, 'gpt_cache.sqlite3'),
+                ttl_seconds=Config.GPT_CACHE_TTL_SECONDS,
+                max_entries=Config.GPT_CACHE_MAX_ENTRIES
+            )
+        return _default_cache
+
+class LRUCache:
+    """Bounded, thread-safe in-process LRU map with hit/miss/eviction counters"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'max_size': self.max_size
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
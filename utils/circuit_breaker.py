@@ -0,0 +1,166 @@
+"""
+Circuit breaker for the GPT backend
+After repeated failures (or calls slower than the latency threshold) the circuit
+opens and GPT calls fail instantly, so callers drop to local scores and fallback
+quotes instead of waiting out timeouts. A single half-open probe is let through
+every reset period to detect recovery.
+"""
+
+import time
+import threading
+import logging
+from typing import Any, Callable, Dict, Optional, TypeVar
+from config import Config
+from utils.deadline import DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the backend while the circuit is open"""
+
+def counts_as_backend_failure(error: Exception) -> bool:
+    """Client errors (bad request, auth), throttling (429, which the rate limiter backs off
+    from) and our own deadline cut-offs say nothing about backend health; everything else does"""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    status = getattr(error, 'status_code', None)
+    return not (status is not None and 400 <= status < 500 and status != 408)
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with latency breaches counted as failures"""
+
+    def __init__(self, failure_threshold: Optional[int] = None, latency_threshold: Optional[float] = None,
+                 reset_timeout: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold or Config.GPT_CIRCUIT_FAILURE_THRESHOLD
+        self.latency_threshold = latency_threshold or Config.GPT_CIRCUIT_LATENCY_THRESHOLD
+        self.reset_timeout = Config.GPT_CIRCUIT_RESET_SECONDS if reset_timeout is None else reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+        self.opens = 0
+        self.short_circuited = 0
+
+    def is_open(self) -> bool:
+        """True while calls would be short-circuited (doesn't claim the half-open probe)"""
+        with self._lock:
+            if self.state == OPEN:
+                return self._clock() - self.opened_at < self.reset_timeout
+            return self.state == HALF_OPEN and self._probe_in_flight
+
+    def check(self) -> None:
+        """Raise CircuitOpenError now if calls are being short-circuited (doesn't claim the probe)"""
+        if self.is_open():
+            with self._lock:
+                self.short_circuited += 1
+            raise CircuitOpenError("GPT circuit is open")
+
+    def allow_request(self) -> bool:
+        """Admit a call; once the reset period passes exactly one probe is admitted"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                logger.info("GPT circuit half-open, sending probe request")
+                return True
+            self.short_circuited += 1
+            return False
+
+    def record_success(self, latency: float) -> None:
+        if latency > self.latency_threshold:
+            logger.warning(f"GPT call took {latency:.2f}s (threshold {self.latency_threshold:.2f}s)")
+            self.record_failure()
+            return
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("GPT backend recovered, circuit closed")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            # Late failures from calls admitted before the circuit opened must not
+            # push back the reset period, or a busy caller could keep it open forever
+            if self.state == OPEN:
+                return
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.opens += 1
+                logger.warning(f"GPT circuit opened after {self.consecutive_failures} failures, "
+                               f"using local scores for {self.reset_timeout:.0f}s")
+                self.state = OPEN
+                self.opened_at = self._clock()
+
+    def record_neutral(self) -> None:
+        """Release a probe slot after a call that neither proves nor disproves backend health"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _finish(self, started: float, error: Optional[Exception]) -> None:
+        if error is None:
+            self.record_success(self._clock() - started)
+        elif counts_as_backend_failure(error):
+            self.record_failure()
+        else:
+            self.record_neutral()
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """Run fn through the breaker, raising CircuitOpenError while it is open"""
+        if not self.allow_request():
+            raise CircuitOpenError("GPT circuit is open")
+        started = self._clock()
+        try:
+            result = fn()
+        except Exception as e:
+            self._finish(started, e)
+            raise
+        self._finish(started, None)
+        return result
+
+    async def acall(self, fn):
+        """Async variant of call() for coroutine factories"""
+        if not self.allow_request():
+            raise CircuitOpenError("GPT circuit is open")
+        started = self._clock()
+        try:
+            result = await fn()
+        except Exception as e:
+            self._finish(started, e)
+            raise
+        self._finish(started, None)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'opens': self.opens,
+                'short_circuited': self.short_circuited
+            }
+
+_default_breaker: Optional[CircuitBreaker] = None
+_default_breaker_lock = threading.Lock()
+
+def get_default_circuit_breaker() -> CircuitBreaker:
+    """Process-wide breaker, so one unhealthy backend trips every component"""
+    global _default_breaker
+    with _default_breaker_lock:
+        if _default_breaker is None:
+            _default_breaker = CircuitBreaker()
+        return _default_breaker
@@ -0,0 +1,272 @@
+"""
+Columnar result store
+A store is a directory of flat binary columns: float32 scores, uint8 mood codes,
+and an offset-indexed UTF-8 heap for each string column. meta.json records the
+row count, dtypes and mood code table, and is written last, so a store without
+it is incomplete. The reader memory-maps the columns, so aggregations such as the
+mood distribution or a score histogram only touch the pages of the numeric
+columns they read. Text and quotes are decoded one row at a time when asked for.
+"""
+
+import os
+import json
+import logging
+import numpy as np
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+META_FILE = 'meta.json'
+NO_MOOD = 255  # Mood code of rows that failed (no sentiment result)
+
+# Numeric columns and their dtypes
+NUMERIC_COLUMNS = {
+    'combined_score': 'float32',
+    'textblob_polarity': 'float32',
+    'vader_compound': 'float32',
+    'gpt_score': 'float32',  # NaN when GPT was skipped
+    'mood': 'uint8',
+}
+STRING_COLUMNS = ('text', 'sass_quote', 'error')
+
+def _numeric_row(result: Dict[str, Any], mood_codes: Dict[str, int]) -> Tuple[float, float, float, float, int]:
+    sentiment = result.get('sentiment')
+    if sentiment is None:
+        nan = float('nan')
+        return nan, nan, nan, nan, NO_MOOD
+    scores = sentiment['individual_scores']
+    gpt_score = float('nan') if sentiment.get('gpt_skipped') else scores['gpt']['score']
+    return (sentiment['combined_score'], scores['textblob']['polarity'], scores['vader']['compound'],
+            gpt_score, mood_codes[sentiment['mood_category']])
+
+def _score_value(value: np.float32) -> float:
+    """Shortest decimal that reads back as the same float32 (0.6369, not 0.636900007724762)
+
+    Scores with up to 7 significant digits (VADER's 4-decimal compound, GPT's scores)
+    come back exactly as written; TextBlob's full-precision polarity keeps 7 digits.
+    """
+    return float(str(value))
+
+class ColumnarResultWriter:
+    """Append batch records (batch_process_texts / pipeline shape) to a columnar store
+
+    Rows are buffered and flushed every chunk_rows, so memory stays flat for any run length.
+    """
+
+    def __init__(self, path: str, chunk_rows: int = 65536):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.moods = list(Config.MOOD_LABELS)
+        self._mood_codes = {mood: code for code, mood in enumerate(self.moods)}
+        self.rows = 0
+        os.makedirs(path, exist_ok=True)
+        # A rewritten store stays incomplete until close() writes the new meta
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        self._numeric_files = {name: open(os.path.join(path, f"{name}.bin"), 'wb') for name in NUMERIC_COLUMNS}
+        self._heap_files = {name: open(os.path.join(path, f"{name}.heap"), 'wb') for name in STRING_COLUMNS}
+        self._offset_files = {name: open(os.path.join(path, f"{name}.offsets"), 'wb') for name in STRING_COLUMNS}
+        self._heap_sizes = {name: 0 for name in STRING_COLUMNS}
+        for handle in self._offset_files.values():
+            np.zeros(1, dtype=np.int64).tofile(handle)
+        self._numeric_buffer: List[Tuple[float, float, float, float, int]] = []
+        self._string_buffers: Dict[str, List[bytes]] = {name: [] for name in STRING_COLUMNS}
+
+    def write(self, result: Dict[str, Any]) -> None:
+        self._numeric_buffer.append(_numeric_row(result, self._mood_codes))
+        sass_result = result.get('sass_quote')
+        self._string_buffers['text'].append(result.get('text', '').encode('utf-8'))
+        self._string_buffers['sass_quote'].append(
+            sass_result.get('sass_quote', '').encode('utf-8') if sass_result is not None else b''
+        )
+        self._string_buffers['error'].append(result.get('error', '').encode('utf-8'))
+        self.rows += 1
+        if len(self._numeric_buffer) >= self.chunk_rows:
+            self.flush()
+
+    def write_many(self, results) -> None:
+        for result in results:
+            self.write(result)
+
+    def flush(self) -> None:
+        if not self._numeric_buffer:
+            return
+        columns = list(zip(*self._numeric_buffer))
+        for (name, dtype), values in zip(NUMERIC_COLUMNS.items(), columns):
+            np.asarray(values, dtype=dtype).tofile(self._numeric_files[name])
+        for name, chunks in self._string_buffers.items():
+            offsets = np.cumsum([len(chunk) for chunk in chunks], dtype=np.int64) + self._heap_sizes[name]
+            self._heap_files[name].write(b''.join(chunks))
+            offsets.tofile(self._offset_files[name])
+            self._heap_sizes[name] = int(offsets[-1])
+            chunks.clear()
+        self._numeric_buffer.clear()
+
+    def _close_files(self) -> None:
+        for handle in (*self._numeric_files.values(), *self._heap_files.values(), *self._offset_files.values()):
+            handle.close()
+        self._numeric_files = None
+
+    def abort(self) -> None:
+        """Close the column files without writing meta.json, leaving the store incomplete"""
+        if self._numeric_files is not None:
+            self._close_files()
+
+    def close(self) -> None:
+        """Flush the remaining rows and write meta.json, completing the store"""
+        if self._numeric_files is None:
+            return
+        self.flush()
+        self._close_files()
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'rows': self.rows,
+            'moods': self.moods,
+            'numeric_columns': NUMERIC_COLUMNS,
+            'string_columns': list(STRING_COLUMNS),
+        }
+        with open(os.path.join(self.path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        logger.info(f"Columnar store written to {self.path} ({self.rows} rows)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # A run that raised (or was interrupted) must not read back as a complete store
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+class ColumnarResults:
+    """Memory-mapped, read-only view of a columnar store"""
+
+    def __init__(self, path: str, chunk_rows: int = 1 << 20):
+        meta_path = os.path.join(path, META_FILE)
+        if not os.path.exists(meta_path):
+            raise ValueError(f"{path} is not a complete columnar result store (missing {META_FILE})")
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format version: {self.meta['format_version']}")
+        self.path = path
+        self.rows: int = self.meta['rows']
+        self.moods: List[str] = self.meta['moods']
+        # Rows scanned per step by the aggregations, bounding their temporaries
+        self.chunk_rows = chunk_rows
+        self._columns: Dict[str, np.ndarray] = {}
+        self._offsets: Dict[str, np.ndarray] = {}
+        self._heaps: Dict[str, np.ndarray] = {}
+
+    def _map(self, filename: str, dtype) -> np.ndarray:
+        full_path = os.path.join(self.path, filename)
+        if os.path.getsize(full_path) == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(full_path, dtype=dtype, mode='r')
+
+    def column(self, name: str) -> np.ndarray:
+        """Memory-mapped numeric column (combined_score, textblob_polarity, vader_compound, gpt_score, mood)"""
+        if name not in self._columns:
+            if name not in self.meta['numeric_columns']:
+                raise KeyError(f"No numeric column {name!r}")
+            self._columns[name] = self._map(f"{name}.bin", self.meta['numeric_columns'][name])[:self.rows]
+        return self._columns[name]
+
+    def string(self, name: str, index: int) -> str:
+        """One decoded value of a string column (text, sass_quote, error)"""
+        if name not in self._offsets:
+            if name not in self.meta['string_columns']:
+                raise KeyError(f"No string column {name!r}")
+            self._offsets[name] = self._map(f"{name}.offsets", np.int64)
+            self._heaps[name] = self._map(f"{name}.heap", np.uint8)
+        if not 0 <= index < self.rows:
+            raise IndexError(index)
+        start, end = self._offsets[name][index], self._offsets[name][index + 1]
+        return self._heaps[name][start:end].tobytes().decode('utf-8')
+
+    def _chunks(self, name: str) -> Iterator[np.ndarray]:
+        column = self.column(name)
+        for start in range(0, self.rows, self.chunk_rows):
+            yield column[start:start + self.chunk_rows]
+
+    def mood_counts(self) -> np.ndarray:
+        """Rows per mood code, plus a final slot counting failed rows"""
+        counts = np.zeros(len(self.moods) + 1, dtype=np.int64)
+        for chunk in self._chunks('mood'):
+            codes = np.minimum(chunk, len(self.moods))
+            counts += np.bincount(codes, minlength=len(self.moods) + 1)
+        return counts
+
+    def mood_distribution(self) -> Dict[str, int]:
+        """{mood_category: count} over the successful rows, like create_mood_summary's"""
+        counts = self.mood_counts()
+        return {mood: int(count) for mood, count in zip(self.moods, counts) if count}
+
+    def score_histogram(self, bins: int = 20, value_range: Tuple[float, float] = (-1.0, 1.0),
+                        column: str = 'combined_score') -> Tuple[np.ndarray, np.ndarray]:
+        """(counts, bin_edges) of a score column, ignoring NaN rows"""
+        edges = np.linspace(value_range[0], value_range[1], bins + 1)
+        counts = np.zeros(bins, dtype=np.int64)
+        for chunk in self._chunks(column):
+            counts += np.histogram(chunk[~np.isnan(chunk)], bins=edges)[0]
+        return counts, edges
+
+    def aggregate(self, column: str = 'combined_score'):
+        """MoodAggregator over a score column and the mood distribution, merged chunk by chunk"""
+        from utils.mood_stats import MoodAggregator
+
+        aggregator = MoodAggregator()
+        for chunk in self._chunks(column):
+            aggregator.merge(MoodAggregator.from_scores(chunk))
+        aggregator.moods = self.mood_distribution()
+        aggregator.total = self.rows
+        return aggregator
+
+    def summary(self) -> Dict[str, Any]:
+        """Same dict as create_mood_summary, computed from the numeric columns only"""
+        return self.aggregate().summary()
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """One flattened row (the pipeline CSV columns plus the individual scores)
+
+        Individual scores are stored as float32, see _score_value() for what survives.
+        """
+        if not 0 <= index < self.rows:
+            raise IndexError(index)
+        mood_code = int(self.column('mood')[index])
+        row = {
+            'index': index + 1,
+            'text': self.string('text', index),
+            'error': self.string('error', index),
+        }
+        if mood_code == NO_MOOD:
+            return row
+        mood = self.moods[mood_code]
+        gpt_score = self.column('gpt_score')[index]
+        row.update({
+            'sentiment_score': round(float(self.column('combined_score')[index]), 3),
+            'mood_category': mood,
+            'mood_emoji': Config.MOOD_LABELS.get(mood, {}).get('emoji', ''),
+            'textblob_polarity': _score_value(self.column('textblob_polarity')[index]),
+            'vader_compound': _score_value(self.column('vader_compound')[index]),
+            'gpt_score': None if np.isnan(gpt_score) else _score_value(gpt_score),
+            'sass_quote': self.string('sass_quote', index),
+        })
+        return row
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self.row(i) for i in range(self.rows))
+
+def write_columnar(results: Sequence[Dict[str, Any]], path: str) -> str:
+    """Write a list of batch records as a columnar store, returning its path"""
+    with ColumnarResultWriter(path) as writer:
+        writer.write_many(results)
+    return path
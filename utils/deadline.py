@@ -0,0 +1,37 @@
+"""
+End-to-end request deadlines
+A Deadline is created once per message and handed down to every stage, so each
+GPT call only gets the time that is left of the overall latency budget
+"""
+
+import time
+from typing import Optional, Union
+
+class DeadlineExceeded(TimeoutError):
+    """The request's latency budget ran out before this stage finished"""
+
+class Deadline:
+    """Absolute point in time (monotonic clock) by which a request must finish"""
+
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def coerce(cls, deadline: Union['Deadline', float, None]) -> Optional['Deadline']:
+        """Accept a Deadline, a budget in seconds, or None"""
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+        return cls(deadline)
+
+    def remaining(self) -> float:
+        """Seconds left, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self, stage: str = 'request') -> None:
+        """Raise DeadlineExceeded if the budget is already spent"""
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline of {self.budget:.2f}s exceeded before {stage}")
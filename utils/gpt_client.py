@@ -0,0 +1,382 @@
+"""
+Shared OpenAI client
+One pooled sync/async client used by SentimentAnalyzer and SassQuoteGenerator,
+so back-to-back GPT calls reuse the same keep-alive connections
+"""
+
+import time
+import weakref
+import threading
+import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional
+from config import Config
+from utils.deadline import Deadline, DeadlineExceeded
+from utils.rate_limiter import AdaptiveRateLimiter, estimate_tokens, get_default_rate_limiter
+from utils.circuit_breaker import CircuitBreaker, get_default_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+class LatencyTracker:
+    """Rolling window of recent GPT call latencies"""
+
+    def __init__(self, window: Optional[int] = None):
+        self._samples = deque(maxlen=window or Config.GPT_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """pct-th percentile of the window, or None until enough samples are in"""
+        with self._lock:
+            if len(self._samples) < Config.GPT_HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+class UsageTracker:
+    """Token usage reported by the API, totalled per prompt stage"""
+
+    def __init__(self):
+        self._stages: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: Optional[str], usage: Any) -> None:
+        if usage is None:
+            return
+        with self._lock:
+            totals = self._stages.setdefault(stage or 'other', {
+                'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0
+            })
+            totals['calls'] += 1
+            totals['prompt_tokens'] += getattr(usage, 'prompt_tokens', 0) or 0
+            totals['completion_tokens'] += getattr(usage, 'completion_tokens', 0) or 0
+            totals['total_tokens'] += getattr(usage, 'total_tokens', 0) or 0
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {stage: dict(totals) for stage, totals in sorted(self._stages.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+
+class GPTClient:
+    """Lazily built OpenAI clients with an explicit connection pool and timeouts
+
+    Every request goes through the rate limiter and each of its attempts through the
+    circuit breaker (both shared process-wide by default). The limiter owns retries; openai's own retries are
+    only used when it is disabled. Calls made with a deadline are hedged.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 pool_size: Optional[int] = None, timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None, model: Optional[str] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None):
+        self.api_key = api_key or Config.OPENAI_API_KEY
+        self.base_url = base_url or Config.OPENAI_BASE_URL
+        self.pool_size = pool_size or Config.GPT_POOL_SIZE or Config.GPT_CONCURRENCY_MAX
+        self.timeout = timeout or Config.GPT_TIMEOUT
+        self.model = model or Config.GPT_MODEL
+        
+        if rate_limiter is None and Config.GPT_RATE_LIMIT_ENABLED:
+            rate_limiter = get_default_rate_limiter()
+        self.rate_limiter = rate_limiter
+        if max_retries is None:
+            max_retries = 0 if rate_limiter is not None else Config.GPT_MAX_RETRIES
+        self.max_retries = max_retries
+        
+        if circuit_breaker is None and Config.GPT_CIRCUIT_BREAKER_ENABLED:
+            circuit_breaker = get_default_circuit_breaker()
+        self.circuit_breaker = circuit_breaker
+        self._sync_client = None
+        # httpx.AsyncClient pools are bound to the loop they first ran on, so keep one per loop
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        
+        # Recent latencies drive the hedge delay for deadline-bound calls
+        self.latencies = LatencyTracker()
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        
+        # Prompt/completion tokens reported by the API, per prompt stage
+        self.usage = UsageTracker()
+
+    def _timeout(self, timeout: Optional[float] = None):
+        import httpx
+        timeout = timeout or self.timeout
+        return httpx.Timeout(timeout, connect=min(Config.GPT_CONNECT_TIMEOUT, timeout))
+
+    def _limits(self):
+        import httpx
+        return httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.pool_size,
+            keepalive_expiry=Config.GPT_KEEPALIVE_EXPIRY
+        )
+
+    @property
+    def sync_client(self):
+        """openai.OpenAI instance backed by a pooled httpx.Client"""
+        if self._sync_client is None:
+            with self._lock:
+                if self._sync_client is None:
+                    import httpx
+                    import openai
+                    self._sync_client = openai.OpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        timeout=self._timeout(),
+                        max_retries=self.max_retries,
+                        http_client=httpx.Client(limits=self._limits(), timeout=self._timeout())
+                    )
+        return self._sync_client
+
+    @property
+    def async_client(self):
+        """openai.AsyncOpenAI instance for the running event loop, backed by a pooled httpx.AsyncClient"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                import httpx
+                import openai
+                client = openai.AsyncOpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    timeout=self._timeout(),
+                    max_retries=self.max_retries,
+                    http_client=httpx.AsyncClient(limits=self._limits(), timeout=self._timeout())
+                )
+                self._async_clients[loop] = client
+        return client
+
+    def _create_kwargs(self, prompt: str, max_tokens: int, temperature: float) -> dict:
+        return {
+            'model': self.model,
+            'messages': [{"role": "user", "content": prompt}],
+            'max_tokens': max_tokens,
+            'temperature': temperature
+        }
+
+    def _request_timeout(self, timeout: Optional[float], deadline: Optional[Deadline]):
+        """Per-request httpx.Timeout, capped by what is left of the deadline
+
+        Always a full httpx.Timeout: openai turns a bare float into one that drops the
+        connect timeout, letting a dead host hold the call for the whole budget.
+        """
+        timeout = timeout or self.timeout
+        if deadline is not None:
+            deadline.check('GPT request')
+            timeout = min(timeout, deadline.remaining())
+        return self._timeout(timeout)
+
+    def _record_usage(self, response, estimated_tokens: int, stage: Optional[str]) -> None:
+        usage = getattr(response, 'usage', None)
+        self.usage.record(stage, usage)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_usage(estimated_tokens, getattr(usage, 'total_tokens', None))
+
+    def _send(self, kwargs: dict, estimated_tokens: int, timeout: Optional[float],
+              deadline: Optional[Deadline]):
+        """One request through the rate limiter, with every attempt going through the circuit breaker"""
+        def request():
+            started = time.perf_counter()
+            try:
+                response = self.sync_client.chat.completions.create(
+                    **kwargs, timeout=self._request_timeout(timeout, deadline)
+                )
+            except Exception as e:
+                if deadline is not None and deadline.expired():
+                    raise DeadlineExceeded("Deadline exceeded waiting on GPT") from e
+                raise
+            self.latencies.record(time.perf_counter() - started)
+            return response
+        
+        if self.circuit_breaker is not None:
+            # Fail fast before taking any quota, then judge each attempt on its own
+            self.circuit_breaker.check()
+            attempt = request
+            request = lambda: self.circuit_breaker.call(attempt)
+        if self.rate_limiter is not None:
+            return self.rate_limiter.call(request, estimated_tokens, deadline)
+        return request()
+
+    async def _asend(self, kwargs: dict, estimated_tokens: int, timeout: Optional[float],
+                     deadline: Optional[Deadline]):
+        """Async variant of _send()"""
+        async def request():
+            started = time.perf_counter()
+            try:
+                response = await self.async_client.chat.completions.create(
+                    **kwargs, timeout=self._request_timeout(timeout, deadline)
+                )
+            except Exception as e:
+                if deadline is not None and deadline.expired():
+                    raise DeadlineExceeded("Deadline exceeded waiting on GPT") from e
+                raise
+            self.latencies.record(time.perf_counter() - started)
+            return response
+        
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.check()
+            attempt = request
+            request = lambda: self.circuit_breaker.acall(attempt)
+        if self.rate_limiter is not None:
+            return await self.rate_limiter.acall(request, estimated_tokens, deadline)
+        return await request()
+
+    def hedge_delay(self) -> float:
+        """How long a deadline-bound call may run before a duplicate is sent"""
+        delay = self.latencies.percentile(Config.GPT_HEDGE_PERCENTILE)
+        return Config.GPT_HEDGE_DEFAULT_DELAY if delay is None else delay
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        if self._hedge_executor is None:
+            with self._lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(
+                        max_workers=self.pool_size, thread_name_prefix='gpt-hedge'
+                    )
+        return self._hedge_executor
+
+    def _send_hedged(self, kwargs: dict, estimated_tokens: int, timeout: Optional[float],
+                     deadline: Deadline):
+        """Send a request and, if it outlives the hedge delay, a duplicate; first success wins"""
+        executor = self._get_hedge_executor()
+        pending = {executor.submit(self._send, kwargs, estimated_tokens, timeout, deadline)}
+        
+        done, _ = wait(pending, timeout=min(self.hedge_delay(), deadline.remaining()))
+        if not done and not deadline.expired():
+            self.hedges_sent += 1
+            hedge = executor.submit(self._send, kwargs, estimated_tokens, timeout, deadline)
+            pending.add(hedge)
+        else:
+            hedge = None
+        
+        last_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded("Deadline exceeded waiting on GPT")
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self.hedges_won += 1
+                    return future.result()
+                last_error = future.exception()
+        raise last_error
+
+    async def _asend_hedged(self, kwargs: dict, estimated_tokens: int, timeout: Optional[float],
+                            deadline: Deadline):
+        """Async variant of _send_hedged()"""
+        import asyncio
+        primary = asyncio.ensure_future(self._asend(kwargs, estimated_tokens, timeout, deadline))
+        pending = {primary}
+        
+        done, _ = await asyncio.wait(pending, timeout=min(self.hedge_delay(), deadline.remaining()))
+        hedge = None
+        if not done and not deadline.expired():
+            self.hedges_sent += 1
+            hedge = asyncio.ensure_future(self._asend(kwargs, estimated_tokens, timeout, deadline))
+            pending.add(hedge)
+        
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=deadline.remaining(),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise DeadlineExceeded("Deadline exceeded waiting on GPT")
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedges_won += 1
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            # The losing request is no longer needed
+            for task in pending:
+                task.cancel()
+
+    def complete(self, prompt: str, max_tokens: int, temperature: float,
+                 timeout: Optional[float] = None, deadline: Optional[Deadline] = None,
+                 stage: Optional[str] = None) -> str:
+        """Send a single-message chat completion and return the stripped reply
+        
+        With a deadline the request is capped at the remaining budget (DeadlineExceeded
+        otherwise) and hedged once it runs past the p95 latency. Token usage is booked
+        under stage (the prompt stage, see utils/prompts.py).
+        """
+        kwargs = self._create_kwargs(prompt, max_tokens, temperature)
+        estimated_tokens = estimate_tokens(prompt, max_tokens)
+        
+        if deadline is not None and Config.GPT_HEDGE_ENABLED:
+            response = self._send_hedged(kwargs, estimated_tokens, timeout, deadline)
+        else:
+            response = self._send(kwargs, estimated_tokens, timeout, deadline)
+        self._record_usage(response, estimated_tokens, stage)
+        return response.choices[0].message.content.strip()
+
+    async def acomplete(self, prompt: str, max_tokens: int, temperature: float,
+                        timeout: Optional[float] = None, deadline: Optional[Deadline] = None,
+                        stage: Optional[str] = None) -> str:
+        """Async variant of complete()"""
+        kwargs = self._create_kwargs(prompt, max_tokens, temperature)
+        estimated_tokens = estimate_tokens(prompt, max_tokens)
+        
+        if deadline is not None and Config.GPT_HEDGE_ENABLED:
+            response = await self._asend_hedged(kwargs, estimated_tokens, timeout, deadline)
+        else:
+            response = await self._asend(kwargs, estimated_tokens, timeout, deadline)
+        self._record_usage(response, estimated_tokens, stage)
+        return response.choices[0].message.content.strip()
+
+    def available(self) -> bool:
+        """False while the circuit breaker is short-circuiting GPT calls"""
+        return self.circuit_breaker is None or not self.circuit_breaker.is_open()
+
+    def close(self) -> None:
+        """Close the sync connection pool and the hedge threads
+
+        Async pools can only be closed on their own event loop, see aclose().
+        """
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    async def aclose(self) -> None:
+        """Close the running loop's async connection pool, then everything close() does"""
+        import asyncio
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+        self.close()
+
+_default_client: Optional[GPTClient] = None
+_default_client_lock = threading.Lock()
+
+def get_default_client() -> GPTClient:
+    """Process-wide GPT client shared by every component that doesn't get one injected"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = GPTClient()
+        return _default_client
+
+def set_default_client(client: Optional[GPTClient]) -> None:
+    """Replace the shared GPT client (None resets it to a fresh Config-based client)"""
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
@@ -2,7 +2,7 @@ import re
 import string
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -69,7 +69,9 @@ def format_sentiment_breakdown(sentiment_result: Dict[str, Any]) -> str:
         vader = individual['vader']
         breakdown.append(f"⚡ VADER: {vader.get('compound', 0):.3f} (pos: {vader.get('pos', 0):.2f}, neg: {vader.get('neg', 0):.2f})")
     
-    if 'gpt' in individual:
+    if sentiment_result.get('gpt_skipped'):
+        breakdown.append("🤖 GPT: skipped")
+    elif 'gpt' in individual:
         gpt = individual['gpt']
         breakdown.append(f"🤖 GPT: {gpt.get('score', 0):.3f} ({gpt.get('emotion', 'neutral')})")
     
@@ -84,10 +86,12 @@ def save_results_to_json(sentiment_result: Dict[str, Any], sass_result: Dict[str
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"sentiment_analysis_{timestamp}.json"
     
+    from sentiment.results import to_dict
+    
     combined_results = {
         "timestamp": datetime.now().isoformat(),
-        "sentiment_analysis": sentiment_result,
-        "sass_quote": sass_result
+        "sentiment_analysis": to_dict(sentiment_result),
+        "sass_quote": to_dict(sass_result)
     }
     
     try:
@@ -110,6 +114,26 @@ def load_results_from_json(filename: str) -> Optional[Dict[str, Any]]:
         logger.error(f"Failed to load results: {e}")
         return None
 
+def format_mood_trend(snapshot: Dict[str, Any]) -> str:
+    """Format a MoodWindows snapshot: each window's live view and recent completed periods"""
+    from config import Config
+    
+    lines = ["📈 MOOD TREND", "-" * 40]
+    for name, views in snapshot['windows'].items():
+        sliding = views['sliding']
+        if sliding['count']:
+            emoji = Config.MOOD_LABELS[sliding['dominant_mood']]['emoji']
+            lines.append(f"Last {name}: {emoji} {sliding['dominant_mood']} "
+                         f"(avg {sliding['average_score']:+.2f}, {sliding['count']} texts)")
+        else:
+            lines.append(f"Last {name}: no texts")
+        history = views['tumbling']['history'][-6:]
+        if history:
+            trend = " → ".join(Config.MOOD_LABELS[period['dominant_mood']]['emoji'] for period in history)
+            lines.append(f"   past {name} periods: {trend}")
+    lines.append("-" * 40)
+    return "\n".join(lines)
+
 def get_emoji_sentiment_scale() -> str:
     """Get visual emoji sentiment scale"""
     scale = [
@@ -121,36 +145,81 @@ def get_emoji_sentiment_scale() -> str:
     ]
     return "\n".join(scale)
 
-def batch_process_texts(texts: List[str]) -> List[Dict[str, Any]]:
-    """Process multiple texts at once"""
+def batch_process_texts(texts: List[str], gpt_batch_size: Optional[int] = None,
+                        use_gpt: bool = True, workers: Optional[int] = None,
+                        compact: bool = False, keep_raw: bool = True) -> List[Dict[str, Any]]:
+    """Process multiple texts at once
+    
+    GPT scoring packs gpt_batch_size texts into each request (defaults to Config.GPT_BATCH_SIZE).
+    With use_gpt=False only the local scorers run, spread over `workers` processes.
+    compact returns slotted BatchRecord objects (dict-style access, .to_dict()) for large
+    batches; keep_raw=False also drops the raw GPT replies.
+    """
+    from config import Config
     from sentiment.analyzer import SentimentAnalyzer
+    from sentiment.results import BatchRecord, SassResult, SentimentResult
     from sass_quotes.sass_gen import SassQuoteGenerator
     
     analyzer = SentimentAnalyzer()
     generator = SassQuoteGenerator()
     results = []
+    gpt_batch_size = gpt_batch_size or Config.GPT_BATCH_SIZE
     
     logger.info(f"Processing {len(texts)} texts in batch")
     
-    for i, text in enumerate(texts, 1):
-        try:
-            logger.info(f"Processing text {i}/{len(texts)}")
-            sentiment_result = analyzer.analyze_comprehensive(text)
-            sass_result = generator.generate_sass_quote(sentiment_result)
-            
+    if not use_gpt:
+        from sentiment.parallel import analyze_local_parallel
+        
+        sentiment_results = analyze_local_parallel(texts, workers=workers, analyzer=analyzer, compact=compact)
+        for i, (text, sentiment_result) in enumerate(zip(texts, sentiment_results), 1):
+            sass_result = generator.generate_sass_quote(sentiment_result, use_gpt=False)
+            if compact:
+                results.append(BatchRecord(i, text, sentiment_result, SassResult.from_dict(sass_result)))
+                continue
             results.append({
                 'index': i,
                 'text': text,
                 'sentiment': sentiment_result,
                 'sass_quote': sass_result
             })
+        return results
+    
+    for start in range(0, len(texts), gpt_batch_size):
+        chunk = texts[start:start + gpt_batch_size]
+        try:
+            sentiment_results = analyzer.analyze_batch(chunk, gpt_batch_size, compact=compact, keep_raw=keep_raw)
         except Exception as e:
-            logger.error(f"Error processing text {i}: {e}")
-            results.append({
-                'index': i,
-                'text': text,
-                'error': str(e)
-            })
+            logger.error(f"Error analyzing texts {start + 1}-{start + len(chunk)}: {e}")
+            sentiment_results = [None] * len(chunk)
+        
+        for i, text, sentiment_result in zip(range(start + 1, start + len(chunk) + 1), chunk, sentiment_results):
+            try:
+                logger.info(f"Processing text {i}/{len(texts)}")
+                if sentiment_result is None:
+                    sentiment_result = analyzer.analyze_comprehensive(text)
+                    if compact:
+                        sentiment_result = SentimentResult.from_dict(sentiment_result, keep_raw)
+                sass_result = generator.generate_sass_quote(sentiment_result)
+                
+                if compact:
+                    results.append(BatchRecord(i, text, sentiment_result, SassResult.from_dict(sass_result)))
+                    continue
+                results.append({
+                    'index': i,
+                    'text': text,
+                    'sentiment': sentiment_result,
+                    'sass_quote': sass_result
+                })
+            except Exception as e:
+                logger.error(f"Error processing text {i}: {e}")
+                if compact:
+                    results.append(BatchRecord(i, text, error=str(e)))
+                    continue
+                results.append({
+                    'index': i,
+                    'text': text,
+                    'error': str(e)
+                })
     
     return results
 
@@ -171,32 +240,18 @@ def print_colored_output(text: str, color: str = 'white') -> None:
     color_code = colors.get(color.lower(), colors['white'])
     print(f"{color_code}{text}{colors['end']}")
 
-def create_mood_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Create summary statistics from multiple analyses"""
-    if not results:
-        return {}
+def create_mood_summary(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Create summary statistics from multiple analyses
     
-    mood_counts = {}
-    total_score = 0
-    valid_results = 0
-    
-    for result in results:
-        if 'sentiment' in result:
-            sentiment = result['sentiment']
-            mood = sentiment.get('mood_category', 'neutral')
-            mood_counts[mood] = mood_counts.get(mood, 0) + 1
-            total_score += sentiment.get('combined_score', 0)
-            valid_results += 1
-    
-    avg_score = total_score / valid_results if valid_results > 0 else 0
-    
-    return {
-        'total_texts': len(results),
-        'valid_analyses': valid_results,
-        'average_score': round(avg_score, 3),
-        'mood_distribution': mood_counts,
-        'dominant_mood': max(mood_counts.items(), key=lambda x: x[1])[0] if mood_counts else 'neutral'
-    }
+    Results are consumed one at a time, so any iterable works. For summaries that are
+    built incrementally or merged across workers use utils.mood_stats.MoodAggregator.
+    """
+    from utils.mood_stats import MoodAggregator
+    
+    aggregator = MoodAggregator().update_many(results)
+    if not aggregator.total:
+        return {}
+    return aggregator.summary()
 
 def export_to_csv(results: List[Dict[str, Any]], filename: Optional[str] = None) -> str:
     """Export results to CSV file"""
@@ -228,17 +283,36 @@ def export_to_csv(results: List[Dict[str, Any]], filename: Optional[str] = None)
         logger.error(f"Failed to export to CSV: {e}")
         return ""
 
+def export_to_columnar(results: List[Dict[str, Any]], path: Optional[str] = None) -> str:
+    """Export results to a memory-mappable columnar store (see utils/columnar.py)"""
+    if not path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = f"sentiment_results_{timestamp}.moodcol"
+    
+    try:
+        from utils.columnar import write_columnar
+        write_columnar(results, path)
+        logger.info(f"Results exported to {path}")
+        return path
+    except Exception as e:
+        logger.error(f"Failed to export to columnar store: {e}")
+        return ""
+
 def interactive_mood_analyzer():
     """Interactive command-line mood analyzer"""
+    from config import Config
     from sentiment.analyzer import SentimentAnalyzer
     from sass_quotes.sass_gen import SassQuoteGenerator
     
+    from utils.mood_windows import MoodWindows
+    
     analyzer = SentimentAnalyzer()
     generator = SassQuoteGenerator()
+    mood_windows = MoodWindows()
     
     print_colored_output("🎭 INTERACTIVE MOOD ANALYZER", 'cyan')
     print_colored_output("=" * 50, 'cyan')
-    print("Commands: 'help', 'scale', 'batch', 'save', 'quit'")
+    print("Commands: 'help', 'scale', 'batch', 'trend', 'save', 'quit'")
     print_colored_output("=" * 50, 'cyan')
     
     session_results = []
@@ -255,12 +329,16 @@ def interactive_mood_analyzer():
                 print("  help  - Show this help")
                 print("  scale - Show emoji sentiment scale")
                 print("  batch - Process multiple texts")
+                print("  trend - Show the session mood over the last 1m/5m/1h")
                 print("  save  - Save session results")
                 print("  quit  - Exit analyzer")
                 continue
             elif user_input.lower() == 'scale':
                 print_colored_output(get_emoji_sentiment_scale(), 'yellow')
                 continue
+            elif user_input.lower() == 'trend':
+                print_colored_output(format_mood_trend(mood_windows.snapshot()), 'yellow')
+                continue
             elif user_input.lower() == 'batch':
                 print("Enter texts (one per line, empty line to finish):")
                 batch_texts = []
@@ -276,6 +354,7 @@ def interactive_mood_analyzer():
                         if 'sentiment' in result:
                             print(f"{result['index']}. {result['sass_quote']['formatted_output']}")
                     session_results.extend(batch_results)
+                    mood_windows.add_many(batch_results)
                 continue
             elif user_input.lower() == 'save':
                 if session_results:
@@ -290,7 +369,7 @@ def interactive_mood_analyzer():
                 continue
             
             # Analyze sentiment
-            sentiment_result = analyzer.analyze_comprehensive(user_input)
+            sentiment_result = analyzer.analyze_comprehensive(user_input, fused=Config.GPT_FUSED_MODE)
             sass_result = generator.generate_sass_quote(sentiment_result)
             
             # Display results
@@ -304,6 +383,7 @@ def interactive_mood_analyzer():
                 'sass_quote': sass_result,
                 'timestamp': datetime.now().isoformat()
             })
+            mood_windows.add(session_results[-1])
             
         except KeyboardInterrupt:
             print_colored_output("\n👋 Goodbye!", 'green')
@@ -0,0 +1,184 @@
+"""
+Per-stage timing and counters
+Stages (TextBlob, VADER, the GPT request, response parsing, quote generation) are
+timed with the monotonic clock into fixed-bucket latency histograms, alongside
+counters such as GPT calls, fallbacks, parse failures and cache hits. A snapshot
+is available as JSON or Prometheus text. While disabled every hook returns
+immediately, so instrumented code pays only an attribute check.
+"""
+
+import time
+import threading
+import contextvars
+from typing import Any, Dict, Optional, Sequence
+from config import Config
+
+# Per-call stage timings of the innermost active trace ({stage_ms: float}), None outside a trace
+_current_timings: 'contextvars.ContextVar[Optional[Dict[str, float]]]' = contextvars.ContextVar(
+    'metrics_timings', default=None
+)
+
+class _NullStage:
+    """Shared no-op stage handed out while metrics are disabled"""
+    timings = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    """Times one stage into its histogram and the active trace's timings"""
+    __slots__ = ('metrics', 'name', 'started')
+
+    def __init__(self, metrics: 'Metrics', name: str):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        self.metrics.observe(self.name, elapsed)
+        timings = _current_timings.get()
+        if timings is not None:
+            key = f"{self.name}_ms"
+            timings[key] = round(timings.get(key, 0.0) + elapsed * 1000, 3)
+        return False
+
+class _Trace:
+    """Top-level stage that collects the timings of the stages nested inside it"""
+    __slots__ = ('metrics', 'name', 'started', 'timings', '_token')
+
+    def __init__(self, metrics: 'Metrics', name: str):
+        self.metrics = metrics
+        self.name = name
+        self.timings: Optional[Dict[str, float]] = None
+
+    def __enter__(self):
+        self.timings = {}
+        self._token = _current_timings.set(self.timings)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        _current_timings.reset(self._token)
+        self.metrics.observe(self.name, elapsed)
+        self.timings['total_ms'] = round(elapsed * 1000, 3)
+        return False
+
+class Metrics:
+    """Thread-safe registry of stage latency histograms and counters"""
+
+    def __init__(self, enabled: Optional[bool] = None, buckets: Optional[Sequence[float]] = None,
+                 result_timings: Optional[bool] = None):
+        self.enabled = Config.METRICS_ENABLED if enabled is None else enabled
+        # Attach a 'timings' block to analysis and sass results
+        self.result_timings = Config.METRICS_RESULT_TIMINGS if result_timings is None else result_timings
+        self.buckets = tuple(sorted(buckets or Config.METRICS_LATENCY_BUCKETS))
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[str, Any]] = {}
+        self._counters: Dict[str, int] = {}
+
+    def stage(self, name: str):
+        """Context manager timing one stage"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def trace(self, name: str):
+        """Context manager timing a whole operation; .timings holds its per-stage breakdown"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Trace(self, name)
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record one stage duration"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = {
+                    'count': 0, 'sum': 0.0, 'max': 0.0, 'buckets': [0] * (len(self.buckets) + 1)
+                }
+            histogram['count'] += 1
+            histogram['sum'] += seconds
+            histogram['max'] = max(histogram['max'], seconds)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram['buckets'][i] += 1
+                    break
+            else:
+                histogram['buckets'][-1] += 1
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def attach_timings(self, result: Dict[str, Any], trace) -> Dict[str, Any]:
+        """Copy of result with the trace's timings block, when result timings are on"""
+        if trace.timings is None or not self.result_timings:
+            return result
+        result = dict(result)
+        result['timings'] = dict(trace.timings)
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly view: counters plus per-stage count, mean, max and bucket counts (ms)"""
+        with self._lock:
+            stages = {}
+            for name, histogram in sorted(self._histograms.items()):
+                labels = [f"le_{bound * 1000:g}ms" for bound in self.buckets] + ['le_inf']
+                stages[name] = {
+                    'count': histogram['count'],
+                    'sum_ms': round(histogram['sum'] * 1000, 3),
+                    'mean_ms': round(histogram['sum'] * 1000 / histogram['count'], 3),
+                    'max_ms': round(histogram['max'] * 1000, 3),
+                    'buckets': dict(zip(labels, histogram['buckets']))
+                }
+            return {'enabled': self.enabled, 'counters': dict(sorted(self._counters.items())), 'stages': stages}
+
+    def render_prometheus(self, prefix: str = 'sentiment_bot') -> str:
+        """Prometheus text exposition format (cumulative histogram buckets in seconds)"""
+        with self._lock:
+            lines = []
+            for name, value in sorted(self._counters.items()):
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                lines.append(f"{prefix}_{name}_total {value}")
+            if self._histograms:
+                metric = f"{prefix}_stage_duration_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+            for name, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram['buckets']):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{stage="{name}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{stage="{name}",le="+Inf"}} {histogram["count"]}')
+                lines.append(f'{metric}_sum{{stage="{name}"}} {histogram["sum"]:.6f}')
+                lines.append(f'{metric}_count{{stage="{name}"}} {histogram["count"]}')
+            return '\n'.join(lines) + '\n'
+
+_default_metrics: Optional[Metrics] = None
+_default_metrics_lock = threading.Lock()
+
+def get_default_metrics() -> Metrics:
+    """Process-wide registry shared by the analyzer, the sass generator and the service"""
+    global _default_metrics
+    with _default_metrics_lock:
+        if _default_metrics is None:
+            _default_metrics = Metrics()
+        return _default_metrics
@@ -0,0 +1,185 @@
+"""
+Streaming mood aggregator
+Summarizes results one at a time: mood distribution, score count, mean and
+variance (Welford), min/max and a fixed-bin score histogram used as a quantile
+sketch. Aggregators built on different workers or shards merge exactly, and
+to_dict() is a small JSON-friendly state (the sketch is stored sparsely), so a
+parallel batch ships summaries between processes instead of results.
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional
+from config import Config
+
+STATE_VERSION = 1
+
+def _sentiment_of(result: Any) -> Optional[Any]:
+    """The sentiment part of a batch record, or the result itself if it is one"""
+    if 'sentiment' in result:
+        return result['sentiment']
+    if 'combined_score' in result:
+        return result
+    return None
+
+class MoodAggregator:
+    """Mergeable running summary of sentiment results
+
+    Quantiles come from a histogram of `bins` equal-width bins over [-1, 1]; each
+    is accurate to half a bin width (0.005 with the default 200 bins).
+    """
+
+    def __init__(self, bins: Optional[int] = None):
+        self.bins = bins or Config.MOOD_SUMMARY_SKETCH_BINS
+        self.total = 0  # Every result seen, including failed ones
+        self.count = 0  # Results with a score
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+        self.min = math.inf
+        self.max = -math.inf
+        self.moods: Dict[str, int] = {}
+        self.sketch: List[int] = [0] * self.bins
+
+    def _bin(self, score: float) -> int:
+        return min(self.bins - 1, max(0, int((score + 1.0) / 2.0 * self.bins)))
+
+    def add(self, score: float, mood: str) -> None:
+        """Add one scored result"""
+        self.total += 1
+        self.count += 1
+        delta = score - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (score - self.mean)
+        self.min = min(self.min, score)
+        self.max = max(self.max, score)
+        self.moods[mood] = self.moods.get(mood, 0) + 1
+        self.sketch[self._bin(score)] += 1
+
+    def update(self, result: Any) -> None:
+        """Add a batch record or sentiment result (dict or compact); failed records only count as seen"""
+        sentiment = _sentiment_of(result)
+        if sentiment is None:
+            self.total += 1
+            return
+        self.add(sentiment.get('combined_score', 0), sentiment.get('mood_category', 'neutral'))
+
+    def update_many(self, results: Iterable[Any]) -> 'MoodAggregator':
+        for result in results:
+            self.update(result)
+        return self
+
+    @classmethod
+    def from_scores(cls, scores, moods: Optional[Dict[str, int]] = None, total: Optional[int] = None,
+                    bins: Optional[int] = None) -> 'MoodAggregator':
+        """Aggregator over an array of scores (NaN entries skipped), computed with NumPy
+
+        moods and total supply the mood distribution and the seen count, which the
+        scores alone don't carry; total defaults to the number of scores.
+        """
+        import numpy as np
+
+        scores = np.asarray(scores, dtype=np.float64)
+        valid = scores[~np.isnan(scores)]
+        aggregator = cls(bins)
+        aggregator.total = len(scores) if total is None else total
+        aggregator.moods = dict(moods or {})
+        if len(valid):
+            aggregator.count = len(valid)
+            aggregator.mean = float(valid.mean())
+            aggregator.m2 = float(((valid - aggregator.mean) ** 2).sum())
+            aggregator.min = float(valid.min())
+            aggregator.max = float(valid.max())
+            indexes = np.clip(((valid + 1.0) / 2.0 * aggregator.bins).astype(np.int64), 0, aggregator.bins - 1)
+            aggregator.sketch = np.bincount(indexes, minlength=aggregator.bins).tolist()
+        return aggregator
+
+    def merge(self, other: 'MoodAggregator') -> 'MoodAggregator':
+        """Fold another aggregator's state into this one (Chan et al. pairwise update)"""
+        if other.bins != self.bins:
+            raise ValueError(f"Cannot merge sketches with {other.bins} and {self.bins} bins")
+        self.total += other.total
+        if other.count:
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self.m2 += other.m2 + delta * delta * self.count * other.count / count
+            self.count = count
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        for mood, mood_count in other.moods.items():
+            self.moods[mood] = self.moods.get(mood, 0) + mood_count
+        self.sketch = [a + b for a, b in zip(self.sketch, other.sketch)]
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the scores"""
+        return self.m2 / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Approximate score quantile (0 <= q <= 1) from the sketch"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, bin_count in enumerate(self.sketch):
+            seen += bin_count
+            if seen >= rank:
+                center = -1.0 + (index + 0.5) * 2.0 / self.bins
+                return min(self.max, max(self.min, center))
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """create_mood_summary's dict plus a score_stats block"""
+        summary = {
+            'total_texts': self.total,
+            'valid_analyses': self.count,
+            'average_score': round(self.mean, 3),
+            'mood_distribution': dict(self.moods),
+            'dominant_mood': max(self.moods.items(), key=lambda x: x[1])[0] if self.moods else 'neutral'
+        }
+        if self.count:
+            summary['score_stats'] = {
+                'mean': round(self.mean, 3),
+                'stddev': round(math.sqrt(self.variance), 3),
+                'min': round(self.min, 3),
+                'max': round(self.max, 3),
+                'p50': round(self.quantile(0.5), 3),
+                'p90': round(self.quantile(0.9), 3),
+                'p99': round(self.quantile(0.99), 3)
+            }
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable state; the sketch is stored as [bin, count] pairs for non-empty bins"""
+        return {
+            'version': STATE_VERSION,
+            'bins': self.bins,
+            'total': self.total,
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'moods': dict(self.moods),
+            'sketch': [[index, bin_count] for index, bin_count in enumerate(self.sketch) if bin_count]
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'MoodAggregator':
+        if state.get('version') != STATE_VERSION:
+            raise ValueError(f"Unsupported aggregator state version: {state.get('version')}")
+        aggregator = cls(state['bins'])
+        aggregator.total = state['total']
+        aggregator.count = state['count']
+        aggregator.mean = state['mean']
+        aggregator.m2 = state['m2']
+        if aggregator.count:
+            aggregator.min = state['min']
+            aggregator.max = state['max']
+        aggregator.moods = dict(state['moods'])
+        for index, bin_count in state['sketch']:
+            aggregator.sketch[index] = bin_count
+        return aggregator
+
+    def __repr__(self) -> str:
+        return f"MoodAggregator(count={self.count}, mean={self.mean:.3f})"
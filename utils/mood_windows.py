@@ -0,0 +1,207 @@
+"""
+Windowed mood time series
+Tracks the mood of a live message stream over fixed time windows (1m / 5m / 1h
+by default). Each sliding window is a ring of time buckets with running totals:
+adding a result touches one bucket, advancing the clock expires whole buckets,
+and a query reads the totals, so cost and memory don't grow with the stream.
+Tumbling windows summarize aligned periods with a MoodAggregator and keep the
+last few completed periods as the trend history.
+"""
+
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from config import Config
+from utils.mood_stats import MoodAggregator, _sentiment_of
+
+def _timestamp_of(result: Any, default: float) -> float:
+    """A record's 'timestamp' (epoch seconds or ISO string), else default"""
+    value = result.get('timestamp') if hasattr(result, 'get') else None
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+def _distribution_summary(count: int, score_sum: float, mood_counts: Dict[str, int]) -> Dict[str, Any]:
+    return {
+        'count': count,
+        'average_score': round(score_sum / count, 3) if count else 0,
+        'mood_distribution': mood_counts,
+        'dominant_mood': max(mood_counts.items(), key=lambda x: x[1])[0] if mood_counts else 'neutral'
+    }
+
+class SlidingMoodWindow:
+    """Mood distribution and average score over the last `length` seconds
+
+    The window is split into `buckets` slots, so it slides in steps of
+    length / buckets seconds and results older than that are dropped.
+    """
+
+    def __init__(self, length: float, buckets: Optional[int] = None):
+        self.length = length
+        self.buckets = buckets or Config.MOOD_WINDOW_BUCKETS
+        self.width = length / self.buckets
+        self.moods = list(Config.MOOD_LABELS)
+        self._mood_codes = {mood: code for code, mood in enumerate(self.moods)}
+        # Bucket id = floor(timestamp / width); the live ids (head - buckets, head] map to distinct slots
+        self._counts = [0] * self.buckets
+        self._sums = [0.0] * self.buckets
+        self._mood_counts = [[0] * len(self.moods) for _ in range(self.buckets)]
+        self._head = None  # Newest bucket id seen
+        self.count = 0
+        self.score_sum = 0.0
+        self.mood_totals = [0] * len(self.moods)
+        self.late = 0  # Results too old for the window when they arrived
+
+    def _expire(self, slot: int) -> None:
+        self.count -= self._counts[slot]
+        self.score_sum -= self._sums[slot]
+        for code, mood_count in enumerate(self._mood_counts[slot]):
+            self.mood_totals[code] -= mood_count
+        self._counts[slot] = 0
+        self._sums[slot] = 0.0
+        self._mood_counts[slot] = [0] * len(self.moods)
+
+    def advance(self, now: float) -> None:
+        """Move the window to end at now, expiring buckets that fell out of it"""
+        bucket_id = int(now // self.width)
+        if self._head is None:
+            self._head = bucket_id
+            return
+        if bucket_id <= self._head:
+            return
+        # At most one pass over the ring, however long the stream was idle
+        for expired_id in range(max(self._head + 1, bucket_id - self.buckets + 1), bucket_id + 1):
+            slot = expired_id % self.buckets
+            if self._counts[slot]:
+                self._expire(slot)
+        self._head = bucket_id
+        if self.count == 0:
+            # Clear the float drift left by subtracting expired sums
+            self.score_sum = 0.0
+
+    def add(self, score: float, mood: str, timestamp: float) -> None:
+        self.advance(timestamp)
+        bucket_id = int(timestamp // self.width)
+        if bucket_id <= self._head - self.buckets:
+            self.late += 1
+            return
+        slot = bucket_id % self.buckets
+        code = self._mood_codes[mood]
+        self._counts[slot] += 1
+        self._sums[slot] += score
+        self._mood_counts[slot][code] += 1
+        self.count += 1
+        self.score_sum += score
+        self.mood_totals[code] += 1
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        self.advance(now)
+        mood_counts = {mood: count for mood, count in zip(self.moods, self.mood_totals) if count}
+        return {'window_seconds': self.length, **_distribution_summary(self.count, self.score_sum, mood_counts)}
+
+class TumblingMoodWindow:
+    """Summaries of aligned `length`-second periods, keeping the last `history` completed ones"""
+
+    def __init__(self, length: float, history: Optional[int] = None):
+        self.length = length
+        self.history = deque(maxlen=history or Config.MOOD_WINDOW_HISTORY)
+        self._period: Optional[int] = None
+        self._aggregator = MoodAggregator()
+        self.late = 0  # Results for periods already closed
+
+    def _close(self) -> None:
+        summary = self._aggregator.summary()
+        self.history.append({
+            'start': self._period * self.length,
+            'count': summary['valid_analyses'],
+            'average_score': summary['average_score'],
+            'mood_distribution': summary['mood_distribution'],
+            'dominant_mood': summary['dominant_mood'],
+            'stddev': summary.get('score_stats', {}).get('stddev', 0.0)
+        })
+        self._aggregator = MoodAggregator()
+
+    def advance(self, now: float) -> None:
+        period = int(now // self.length)
+        if self._period is None:
+            self._period = period
+        elif period > self._period:
+            self._close()
+            # Idle periods in between have no results and are left out of the history
+            self._period = period
+
+    def add(self, score: float, mood: str, timestamp: float) -> None:
+        self.advance(timestamp)
+        if int(timestamp // self.length) < self._period:
+            self.late += 1
+            return
+        self._aggregator.add(score, mood)
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        self.advance(now)
+        current = self._aggregator
+        return {
+            'window_seconds': self.length,
+            'current': {
+                'start': self._period * self.length,
+                **_distribution_summary(current.count, current.mean * current.count, dict(current.moods))
+            },
+            'history': list(self.history)
+        }
+
+class MoodWindows:
+    """Sliding and tumbling windows of every configured size over one result stream (thread-safe)"""
+
+    def __init__(self, sizes: Optional[Dict[str, float]] = None, buckets: Optional[int] = None,
+                 history: Optional[int] = None, clock=time.time):
+        self.sizes = dict(sizes or Config.MOOD_WINDOW_SIZES)
+        self.clock = clock
+        self.sliding = {name: SlidingMoodWindow(length, buckets) for name, length in self.sizes.items()}
+        self.tumbling = {name: TumblingMoodWindow(length, history) for name, length in self.sizes.items()}
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def add(self, result: Any, timestamp: Optional[float] = None) -> None:
+        """Add a batch record or sentiment result; failed records are ignored
+
+        The timestamp defaults to the result's 'timestamp' field, else the current time.
+        """
+        sentiment = _sentiment_of(result)
+        if sentiment is None:
+            return
+        if timestamp is None:
+            timestamp = _timestamp_of(result, self.clock())
+        score = sentiment.get('combined_score', 0)
+        mood = sentiment.get('mood_category', 'neutral')
+        with self._lock:
+            self.total += 1
+            for window in self.sliding.values():
+                window.add(score, mood, timestamp)
+            for window in self.tumbling.values():
+                window.add(score, mood, timestamp)
+
+    def add_many(self, results) -> None:
+        for result in results:
+            self.add(result)
+
+    def snapshot(self, window: Optional[str] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        """Sliding and tumbling views of every window (or just `window`) as of now"""
+        if window is not None and window not in self.sizes:
+            raise KeyError(f"No mood window {window!r} (have {', '.join(self.sizes)})")
+        now = self.clock() if now is None else now
+        names: List[str] = [window] if window else list(self.sizes)
+        with self._lock:
+            return {
+                'timestamp': now,
+                'total': self.total,
+                'windows': {
+                    name: {
+                        'sliding': self.sliding[name].snapshot(now),
+                        'tumbling': self.tumbling[name].snapshot(now)
+                    } for name in names
+                }
+            }
@@ -0,0 +1,171 @@
+"""
+Streaming batch pipeline
+Reads texts lazily, scores them through a bounded in-flight window and writes
+each result as soon as it is ready, so memory stays flat for any input size
+"""
+
+import sys
+import csv
+import json
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, IO, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+CSV_FIELDNAMES = ['index', 'text', 'sentiment_score', 'mood_category', 'mood_emoji', 'sass_quote', 'error']
+
+def iter_texts(source: str) -> Iterator[str]:
+    """Lazily yield texts from a file path, or stdin when source is '-'
+
+    .jsonl inputs yield each record's 'text' field (malformed records, including ones
+    without a non-empty string 'text', are logged and skipped); anything else yields
+    one text per line.
+    """
+    is_jsonl = source.endswith('.jsonl')
+    handle = sys.stdin if source == '-' else open(source, 'r', encoding='utf-8')
+    try:
+        for line_number, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if is_jsonl:
+                try:
+                    text = json.loads(line).get('text')
+                    if not isinstance(text, str) or not text.strip():
+                        raise ValueError("'text' must be a non-empty string")
+                except (ValueError, AttributeError) as e:
+                    logger.warning(f"Skipping malformed record on line {line_number} of {source}: {e}")
+                    continue
+                yield text
+            else:
+                yield line
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+def process_one(analyzer, generator, index: int, text: str, use_gpt: bool,
+                deadline: Optional[float] = None, fused: bool = False) -> Dict[str, Any]:
+    """Analyze one text into the same record shape batch_process_texts produces
+
+    A deadline (seconds) is shared by the sentiment and sass stages.
+    """
+    try:
+        if use_gpt:
+            from utils.deadline import Deadline
+            deadline = Deadline.coerce(deadline)
+            sentiment_result = analyzer.analyze_comprehensive(text, fused=fused, deadline=deadline)
+        else:
+            sentiment_result = analyzer.analyze_local_only(text)
+        return {
+            'index': index,
+            'text': text,
+            'sentiment': sentiment_result,
+            'sass_quote': generator.generate_sass_quote(sentiment_result, use_gpt=use_gpt, deadline=deadline)
+        }
+    except Exception as e:
+        logger.error(f"Error processing text {index}: {e}")
+        return {'index': index, 'text': text, 'error': str(e)}
+
+def stream_process_texts(texts: Iterable[str], analyzer=None, generator=None,
+                         window: Optional[int] = None, use_gpt: bool = True) -> Iterator[Dict[str, Any]]:
+    """Score texts with at most `window` in flight, yielding results in input order"""
+    from config import Config
+
+    if analyzer is None:
+        from sentiment.analyzer import SentimentAnalyzer
+        analyzer = SentimentAnalyzer()
+    if generator is None:
+        from sass_quotes.sass_gen import SassQuoteGenerator
+        generator = SassQuoteGenerator()
+    window = window or Config.STREAM_WINDOW
+
+    in_flight = deque()
+    with ThreadPoolExecutor(max_workers=window, thread_name_prefix='sentiment-stream') as executor:
+        for index, text in enumerate(texts, 1):
+            if len(in_flight) >= window:
+                yield in_flight.popleft().result()
+            in_flight.append(executor.submit(process_one, analyzer, generator, index, text, use_gpt))
+
+        while in_flight:
+            yield in_flight.popleft().result()
+
+class JSONLResultWriter:
+    """Write one JSON result per line"""
+
+    def __init__(self, handle: IO[str]):
+        self.handle = handle
+
+    def write(self, result: Dict[str, Any]) -> None:
+        self.handle.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self.handle.flush()
+
+class CSVResultWriter:
+    """Write flattened results as CSV rows (same columns as export_to_csv plus index/error)"""
+
+    def __init__(self, handle: IO[str]):
+        self.handle = handle
+        self.writer = csv.DictWriter(handle, fieldnames=CSV_FIELDNAMES)
+        self.writer.writeheader()
+
+    def write(self, result: Dict[str, Any]) -> None:
+        sentiment = result.get('sentiment', {})
+        self.writer.writerow({
+            'index': result['index'],
+            'text': result['text'],
+            'sentiment_score': sentiment.get('combined_score', ''),
+            'mood_category': sentiment.get('mood_category', ''),
+            'mood_emoji': sentiment.get('mood_emoji', ''),
+            'sass_quote': result['sass_quote'].get('sass_quote', '') if 'sass_quote' in result else '',
+            'error': result.get('error', '')
+        })
+        self.handle.flush()
+
+RESULT_WRITERS = {
+    'jsonl': JSONLResultWriter,
+    'csv': CSVResultWriter
+}
+
+def _output_format(out: str) -> str:
+    if out.endswith('.csv'):
+        return 'csv'
+    if out.endswith('.moodcol'):
+        return 'columnar'
+    return 'jsonl'
+
+def run_batch_pipeline(source: str, out: str = '-', fmt: Optional[str] = None,
+                       window: Optional[int] = None, use_gpt: bool = True) -> int:
+    """Stream texts from source into out ('-' for stdin/stdout), returning the number processed
+
+    The columnar format writes a store directory (see utils/columnar.py) and needs a path.
+    """
+    fmt = fmt or _output_format(out)
+    if fmt != 'columnar' and fmt not in RESULT_WRITERS:
+        raise ValueError(f"Unsupported output format: {fmt}")
+    if fmt == 'columnar' and out == '-':
+        raise ValueError("The columnar format needs an output directory, not stdout")
+
+    results = stream_process_texts(iter_texts(source), window=window, use_gpt=use_gpt)
+    count = 0
+    if fmt == 'columnar':
+        from utils.columnar import ColumnarResultWriter
+        with ColumnarResultWriter(out) as writer:
+            for result in results:
+                writer.write(result)
+                count += 1
+        logger.info(f"Batch pipeline processed {count} texts into {out}")
+        return count
+
+    handle = sys.stdout if out == '-' else open(out, 'w', newline='', encoding='utf-8')
+    try:
+        writer = RESULT_WRITERS[fmt](handle)
+        for result in results:
+            writer.write(result)
+            count += 1
+    finally:
+        if handle is not sys.stdout:
+            handle.close()
+
+    logger.info(f"Batch pipeline processed {count} texts into {out}")
+    return count
@@ -0,0 +1,188 @@
+"""
+Versioned GPT prompt templates
+Each stage (single / batched / fused sentiment scoring, single / multi sass quotes)
+has numbered prompt versions. A template carries the completion budget its answer
+needs, so every call asks for a max_tokens sized to the expected output instead of
+one global allowance. The version is part of the cache key, so changing a prompt
+never serves answers produced by an older one.
+
+v1 is the original verbose wording; v2 is the compact default. Pin a stage to an
+older version with Config.GPT_PROMPT_VERSIONS, e.g. {'sass': 'v1'}.
+"""
+
+from typing import Dict, Optional, Tuple
+from config import Config
+
+class PromptTemplate:
+    """One version of a stage's prompt and the completion budget for its answer"""
+
+    def __init__(self, stage: str, version: str, template: str, max_tokens: int, temperature: float,
+                 tokens_per_item: int = 0):
+        self.stage = stage
+        self.version = version
+        self.template = template
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        # Extra completion tokens per item for prompts answering several items at once
+        self.tokens_per_item = tokens_per_item
+
+    def render(self, **fields) -> str:
+        return self.template.format(**fields)
+
+    def budget(self, items: int = 1) -> int:
+        """max_tokens for a call answering `items` items"""
+        return self.max_tokens + self.tokens_per_item * items
+
+    def __repr__(self) -> str:
+        return f"PromptTemplate({self.stage!r}, {self.version!r})"
+
+PROMPTS: Dict[Tuple[str, str], PromptTemplate] = {}
+LATEST_VERSIONS: Dict[str, str] = {}
+
+def register(template: PromptTemplate, latest: bool = False) -> PromptTemplate:
+    PROMPTS[(template.stage, template.version)] = template
+    if latest:
+        LATEST_VERSIONS[template.stage] = template.version
+    return template
+
+def get_prompt(stage: str, version: Optional[str] = None) -> PromptTemplate:
+    """Template for a stage: the given version, else the pinned one, else the latest"""
+    version = version or Config.GPT_PROMPT_VERSIONS.get(stage) or LATEST_VERSIONS[stage]
+    try:
+        return PROMPTS[(stage, version)]
+    except KeyError:
+        raise KeyError(f"No prompt version {version!r} for stage {stage!r}") from None
+
+def mood_lines() -> str:
+    """'- mood: Vibe (description)' line per mood, used by the fused prompt"""
+    return "\n".join(
+        f"- {mood}: {label['vibe']} ({label['description']})" for mood, label in Config.MOOD_LABELS.items()
+    )
+
+# v1: original prompts, kept so old cache entries stay addressable and for benchmarks
+
+register(PromptTemplate('sentiment', 'v1', """
+            Analyze the sentiment of this text on a scale from -1 to 1, where:
+            -1 = Very Negative
+            0 = Neutral
+            1 = Very Positive
+
+            Also provide a brief emotional context (1-3 words).
+
+            Text: "{text}"
+
+            Respond in this exact format:
+            Score: [number]
+            Emotion: [emotion words]
+            """, max_tokens=Config.GPT_MAX_TOKENS, temperature=0.3))
+
+register(PromptTemplate('sentiment_batch', 'v1', """
+        Analyze the sentiment of each numbered text on a scale from -1 to 1, where:
+        -1 = Very Negative
+        0 = Neutral
+        1 = Very Positive
+
+        Also provide a brief emotional context (1-3 words) for each.
+
+        Texts:
+        {numbered}
+
+        Respond with exactly one line per text, in order, in this exact format:
+        [text number] | Score: [number] | Emotion: [emotion words]
+        """, max_tokens=0, temperature=0.3, tokens_per_item=Config.GPT_BATCH_TOKENS_PER_TEXT))
+
+register(PromptTemplate('sentiment_fused', 'v1', """
+            Analyze the sentiment of this text on a scale from -1 to 1, where:
+            -1 = Very Negative
+            0 = Neutral
+            1 = Very Positive
+
+            Also provide a brief emotional context (1-3 words), and for each mood below a SHORT
+            (under 15 words), sassy, modern quote for someone in that mood. Use Gen Z/millennial
+            language, include 1-2 relevant emojis, be supportive but sassy and match the mood's energy.
+{moods}
+
+            Text: "{text}"
+
+            Respond with only this JSON object:
+            {{"score": [number], "emotion": "[emotion words]", "quotes": {{"[mood]": "[quote]"}}}}
+            """, max_tokens=Config.GPT_FUSED_MAX_TOKENS, temperature=Config.GPT_FUSED_TEMPERATURE))
+
+register(PromptTemplate('sass', 'v1', """
+            You're a sassy, witty friend giving quotes based on someone's mood.
+
+            Their current vibe: {mood_vibe} ({mood_description})
+            Sentiment score: {sentiment_score} (where -1 is very negative, +1 is very positive)
+
+            Generate a SHORT (under 15 words), sassy, modern quote that matches their energy.
+
+            Style guidelines:
+            - Use Gen Z/millennial language
+            - Include 1-2 relevant emojis
+            - Be supportive but sassy
+            - Match the energy level (don't be too upbeat for negative moods)
+
+            Examples for reference:
+            Very positive: "You're literally the main character today ✨🔥"
+            Positive: "Someone's radiating good energy and I'm here for it 🌟"
+            Neutral: "Giving off strong 'existing peacefully' vibes 😌"
+            Negative: "Life really tested you today, huh? 💔"
+            Very negative: "Bestie, we're surviving this together 💀🖤"
+
+            Generate ONE quote:
+            """, max_tokens=Config.GPT_MAX_TOKENS, temperature=Config.GPT_TEMPERATURE))
+
+register(PromptTemplate('sass_multi', 'v1', """
+            You're a sassy, witty friend giving quotes based on someone's mood.
+
+            Their current vibe: {mood_vibe} ({mood_description})
+            Sentiment score: {sentiment_score} (where -1 is very negative, +1 is very positive)
+
+            Generate {count} DIFFERENT, SHORT (under 15 words), sassy, modern quotes that match their energy.
+
+            Style guidelines:
+            - Use Gen Z/millennial language
+            - Include 1-2 relevant emojis
+            - Be supportive but sassy
+            - Match the energy level (don't be too upbeat for negative moods)
+            - Don't repeat jokes or phrasing between quotes
+
+            Respond with exactly {count} lines, one quote per line, in this format:
+            1. [quote]
+            """, max_tokens=0, temperature=Config.GPT_TEMPERATURE, tokens_per_item=Config.GPT_TOKENS_PER_QUOTE))
+
+# v2: compact wording, completion budgets sized to the expected answer
+
+register(PromptTemplate('sentiment', 'v2', (
+    'Rate the sentiment of the text from -1 (very negative) to 1 (very positive) and name the emotion in 1-3 words.\n'
+    'Text: "{text}"\n'
+    'Reply exactly:\nScore: <number>\nEmotion: <words>'
+), max_tokens=Config.GPT_SENTIMENT_MAX_TOKENS, temperature=0.3), latest=True)
+
+register(PromptTemplate('sentiment_batch', 'v2', (
+    'Rate the sentiment of each numbered text from -1 (very negative) to 1 (very positive) '
+    'and name the emotion in 1-3 words.\n'
+    '{numbered}\n'
+    'Reply with one line per text, in order:\n<text number> | Score: <number> | Emotion: <words>'
+), max_tokens=0, temperature=0.3, tokens_per_item=Config.GPT_BATCH_TOKENS_PER_TEXT), latest=True)
+
+register(PromptTemplate('sentiment_fused', 'v2', (
+    'Rate the sentiment of the text from -1 (very negative) to 1 (very positive), name the emotion in 1-3 words, '
+    'and write one short (under 15 words) Gen Z quote with 1-2 emojis, supportive but sassy, for each mood:\n'
+    '{moods}\n'
+    'Text: "{text}"\n'
+    'Reply with only JSON: {{"score": <number>, "emotion": "<words>", "quotes": {{"<mood>": "<quote>"}}}}'
+), max_tokens=Config.GPT_FUSED_MAX_TOKENS, temperature=Config.GPT_FUSED_TEMPERATURE), latest=True)
+
+register(PromptTemplate('sass', 'v2', (
+    "You're a sassy, witty friend. Write ONE short (under 15 words) Gen Z quote with 1-2 emojis for someone "
+    "whose vibe is {mood_vibe} ({mood_description}), sentiment {sentiment_score} on a -1 to 1 scale. "
+    "Supportive but sassy; match their energy. Reply with the quote only."
+), max_tokens=Config.GPT_SASS_MAX_TOKENS, temperature=Config.GPT_TEMPERATURE), latest=True)
+
+register(PromptTemplate('sass_multi', 'v2', (
+    "You're a sassy, witty friend. Generate {count} DIFFERENT short (under 15 words) Gen Z quotes with 1-2 emojis "
+    "for someone whose vibe is {mood_vibe} ({mood_description}), sentiment {sentiment_score} on a -1 to 1 scale. "
+    "Supportive but sassy; match their energy; no repeated jokes.\n"
+    "Reply with {count} numbered lines:\n1. <quote>"
+), max_tokens=0, temperature=Config.GPT_TEMPERATURE, tokens_per_item=Config.GPT_TOKENS_PER_QUOTE), latest=True)
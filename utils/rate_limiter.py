@@ -0,0 +1,324 @@
+"""
+Adaptive rate limiting for OpenAI calls
+Token buckets keep us under the requests/tokens-per-minute quota, an AIMD limit
+adapts concurrency to what the API actually accepts, and retryable failures
+(429, 5xx, timeouts) are retried with jittered backoff that honours Retry-After
+"""
+
+import time
+import random
+import threading
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from config import Config
+from utils.deadline import Deadline, DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+class TokenBucket:
+    """Continuously refilling bucket of `per_minute` units
+
+    reserve() takes units immediately (the level may go negative) and returns how
+    long the caller must wait before using them, so sync and async callers share it.
+    With max_wait, a reservation that would wait longer is refused and takes nothing.
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, max_wait: Optional[float] = None) -> Optional[float]:
+        """Take amount units, returning the seconds to wait until they are covered
+
+        Returns None without taking anything if that wait would reach max_wait.
+        """
+        with self._lock:
+            self._refill()
+            level = self.level - min(amount, self.capacity)
+            wait = 0.0 if level >= 0 else -level / self.rate
+            if max_wait is not None and wait > 0 and wait >= max_wait:
+                return None
+            self.level = level
+            return wait
+
+    def adjust(self, amount: float) -> None:
+        """Charge (or refund, if negative) units after the fact, e.g. actual vs estimated tokens"""
+        with self._lock:
+            self._refill()
+            self.level = min(self.capacity, self.level - amount)
+
+class AIMDLimiter:
+    """In-flight request limit with additive increase / multiplicative decrease"""
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1,
+                 decrease_factor: float = 0.5, cooldown: float = 1.0):
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.minimum = minimum
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        # (loop, future) pairs for async waiters, woken by release() from any thread
+        self._async_waiters: List[Tuple[Any, Any]] = []
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """Take a slot, waiting at most timeout seconds (DeadlineExceeded after that)"""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.in_flight < int(self.limit), timeout):
+                raise DeadlineExceeded(f"No concurrency slot freed up within {timeout:.2f}s")
+            self.in_flight += 1
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> None:
+        """Async variant of acquire()"""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                # Park on a future rather than block the event loop on the threading condition
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+            try:
+                remaining = None if give_up_at is None else max(0.0, give_up_at - time.monotonic())
+                await asyncio.wait_for(waiter[1], remaining)
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"No concurrency slot freed up within {timeout:.2f}s") from None
+            finally:
+                with self._condition:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+
+    def release(self, success: bool, throttled: bool = False) -> None:
+        """Free a slot; successes grow the limit by ~1 per window, throttling halves it"""
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                now = time.monotonic()
+                # One decrease per cooldown so a burst of 429s doesn't collapse the limit to 1
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    logger.warning(f"GPT rate limited, concurrency limit lowered to {int(self.limit)}")
+            elif success:
+                self.limit = min(self.maximum, self.limit + 1.0 / max(self.limit, 1.0))
+            self._condition.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass  # The waiter's loop has already closed
+
+def _wake(future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Server-requested delay from a Retry-After / retry-after-ms header, if any"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms') is not None:
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after') is not None:
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+def is_rate_limited(error: Exception) -> bool:
+    return getattr(error, 'status_code', None) == 429
+
+def is_retryable(error: Exception) -> bool:
+    """429s, server errors, connection failures and timeouts are worth retrying"""
+    status = getattr(error, 'status_code', None)
+    if status is not None:
+        return status == 429 or status == 408 or status >= 500
+    import openai
+    return isinstance(error, (openai.APIConnectionError, openai.APITimeoutError))
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough token cost of a request (~4 characters per prompt token plus the completion allowance)"""
+    return len(prompt) // 4 + max_tokens
+
+class AdaptiveRateLimiter:
+    """Shared RPM/TPM token buckets, AIMD concurrency and retry scheduling"""
+
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None,
+                 initial_concurrency: Optional[int] = None, max_concurrency: Optional[int] = None,
+                 max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None):
+        self.requests = TokenBucket(rpm or Config.GPT_RPM_LIMIT)
+        self.tokens = TokenBucket(tpm or Config.GPT_TPM_LIMIT)
+        self.concurrency = AIMDLimiter(
+            initial_concurrency or Config.GPT_CONCURRENCY_INITIAL,
+            max_concurrency or Config.GPT_CONCURRENCY_MAX
+        )
+        self.max_attempts = max_attempts or Config.GPT_RETRY_ATTEMPTS
+        self.base_delay = Config.GPT_RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = max_delay or Config.GPT_RETRY_MAX_DELAY
+
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+
+    def backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _admission_delay(self, estimated_tokens: int, deadline: Optional[Deadline]) -> float:
+        """Reserve one request and the estimated tokens, returning how long to wait for them
+
+        Raises DeadlineExceeded, leaving both buckets untouched, if the wait would
+        outlast the deadline.
+        """
+        max_wait = None if deadline is None else deadline.remaining()
+        request_wait = self.requests.reserve(1, max_wait)
+        if request_wait is not None:
+            token_wait = self.tokens.reserve(estimated_tokens, max_wait)
+            if token_wait is not None:
+                return max(request_wait, token_wait)
+            self.requests.adjust(-1)
+        raise DeadlineExceeded("Rate limit wait exceeds the remaining deadline")
+
+    def _refund(self, estimated_tokens: int) -> None:
+        """Give back an admission that never turned into a request"""
+        self.requests.adjust(-1)
+        self.tokens.adjust(-estimated_tokens)
+
+    def _acquire_slot(self, estimated_tokens: int, deadline: Optional[Deadline]) -> None:
+        try:
+            self.concurrency.acquire(None if deadline is None else deadline.remaining())
+        except DeadlineExceeded:
+            self._refund(estimated_tokens)
+            raise
+
+    async def _acquire_slot_async(self, estimated_tokens: int, deadline: Optional[Deadline]) -> None:
+        try:
+            await self.concurrency.acquire_async(None if deadline is None else deadline.remaining())
+        except DeadlineExceeded:
+            self._refund(estimated_tokens)
+            raise
+
+    def _count(self, field: str) -> None:
+        with self._stats_lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def _after_failure(self, attempt: int, error: Exception) -> Optional[float]:
+        """Record a failed attempt, returning the retry delay or None to give up"""
+        if is_rate_limited(error):
+            self._count('rate_limited')
+        if attempt + 1 >= self.max_attempts or not is_retryable(error):
+            self._count('failures')
+            return None
+        self._count('retries')
+        delay = self.backoff_delay(attempt, error)
+        logger.warning(f"GPT request failed ({error}), retry {attempt + 1} in {delay:.2f}s")
+        return delay
+
+    def call(self, fn: Callable[[], T], estimated_tokens: int, deadline: Optional[Deadline] = None) -> T:
+        """Run fn under the quota and concurrency limits, retrying retryable errors
+
+        With a deadline, waits and retries that would outlast it are given up on.
+        """
+        self._count('calls')
+        for attempt in range(self.max_attempts):
+            wait = self._admission_delay(estimated_tokens, deadline)
+            if wait > 0:
+                time.sleep(wait)
+            self._acquire_slot(estimated_tokens, deadline)
+            self._count('attempts')
+            try:
+                result = fn()
+            except Exception as e:
+                self.concurrency.release(success=False, throttled=is_rate_limited(e))
+                delay = self._after_failure(attempt, e)
+                if delay is None or (deadline is not None and delay >= deadline.remaining()):
+                    raise
+                time.sleep(delay)
+            else:
+                self.concurrency.release(success=True)
+                return result
+
+    async def acall(self, fn: Callable[[], Awaitable[T]], estimated_tokens: int,
+                    deadline: Optional[Deadline] = None) -> T:
+        """Async variant of call() for coroutine factories"""
+        import asyncio
+        self._count('calls')
+        for attempt in range(self.max_attempts):
+            wait = self._admission_delay(estimated_tokens, deadline)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await self._acquire_slot_async(estimated_tokens, deadline)
+            self._count('attempts')
+            try:
+                result = await fn()
+            except Exception as e:
+                self.concurrency.release(success=False, throttled=is_rate_limited(e))
+                delay = self._after_failure(attempt, e)
+                if delay is None or (deadline is not None and delay >= deadline.remaining()):
+                    raise
+                await asyncio.sleep(delay)
+            else:
+                self.concurrency.release(success=True)
+                return result
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Correct the TPM bucket once the real token usage is known"""
+        if actual_tokens is not None:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                'calls': self.calls,
+                'attempts': self.attempts,
+                'retries': self.retries,
+                'rate_limited': self.rate_limited,
+                'failures': self.failures,
+                'concurrency_limit': int(self.concurrency.limit),
+                'in_flight': self.concurrency.in_flight
+            }
+
+_default_limiter: Optional[AdaptiveRateLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+def get_default_rate_limiter() -> AdaptiveRateLimiter:
+    """Process-wide limiter, so every client shares one quota"""
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = AdaptiveRateLimiter()
+        return _default_limiter